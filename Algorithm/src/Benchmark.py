@@ -0,0 +1,242 @@
+"""The performance benchmark of ImageProcessing, EdgeDetectors and Morphology.
+
+Usage:
+    python Benchmark.py --output results.json
+    python Benchmark.py --output results.json --baseline baseline.json --tolerance 0.2
+    python Benchmark.py --kernels
+    python Benchmark.py --morphology
+
+The first command records the results as the baseline.
+The second command also compares the results with the baseline and exits with 1 if any benchmark regressed.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+try:
+    from . import ImageProcessing as ip
+    from . import EdgeDetectors as ed
+    from . import Morphology as mo
+except ImportError:
+    import ImageProcessing as ip
+    import EdgeDetectors as ed
+    import Morphology as mo
+
+SIDBA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../SIDBA')
+SYNTHETIC_SIZES = [256, 1024, 2048, 4096]
+EDGE_DETECTORS = [ed.DifferenceEdgeDetector, ed.RobertsEdgeDetector, ed.SobelEdgeDetector, ed.PrewittEdgeDetector, ed.CannyEdgeDetector]
+KERNEL_SIZES = [3, 5, 7, 9, 11, 15]
+ELEMENT_SIZES = [3, 7, 15, 25, 31, 61, 121]
+
+def synthetic_image(size):
+    """Creates the grayscale image with edges of various strength and noise.
+
+    Args:
+        size (int): The height and the width of the image.
+
+    Returns:
+        ImageProcessing.Image: Returns the image.
+    """
+    y, x = np.mgrid[0:size, 0:size]
+    rng = np.random.default_rng(size)
+    pattern = 128 + 64 * np.sin(x / 7.0) * np.cos(y / 11.0) + rng.normal(0, 8, (size, size))
+
+    return ip.Image.from_array(np.clip(pattern, 0, 255).astype(np.uint8))
+
+def measure(function, pixels, repeat=3):
+    """Measures the time and the peak memory of the function.
+
+    Args:
+        function (function): The function to measure.
+        pixels (int): The number of the pixels processed by a call of the function.
+        repeat (int, optional): The number of the calls. The fastest one is recorded.
+
+    Returns:
+        dict: Returns the seconds, the megapixels per second and the peak bytes allocated by a call.
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'seconds': seconds,
+            'megapixels_per_second': pixels / seconds / 1e6 if 0 < seconds else float('inf'),
+            'peak_bytes': peak_bytes}
+
+def run(sizes=SYNTHETIC_SIZES, repeat=3, sidba_dir=SIDBA_DIR):
+    """Runs all the benchmarks.
+
+    Args:
+        sizes (list[int], optional): The sizes of the synthetic images.
+        repeat (int, optional): The number of the calls of each benchmark.
+        sidba_dir (string, optional): The path to the SIDBA directory. The SIDBA images are skipped if None.
+
+    Returns:
+        dict: Returns the results of the benchmarks by name. The name is "operation/input".
+    """
+    inputs = []
+    if sidba_dir is not None:
+        for name, grayscale in [('Mono', True), ('Color', False)]:
+            directory = os.path.join(sidba_dir, name)
+            paths = [os.path.join(directory, file_name) for file_name in sorted(os.listdir(directory))]
+            inputs.append(('SIDBA/' + name, paths, grayscale))
+
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        for size in sizes:
+            path = os.path.join(temporary_dir, 'synthetic{}.bmp'.format(size))
+            synthetic_image(size).save(path)
+            inputs.append(('synthetic{}x{}'.format(size, size), [path], True))
+
+        results = {}
+        for input_name, paths, grayscale in inputs:
+            images = [ip.Image(path, grayscale=grayscale) for path in paths]
+            gray_images = images if grayscale else [ip.Image(path, grayscale=True) for path in paths]
+            pixels = sum(image.height * image.width for image in images)
+
+            results['open/' + input_name] = measure(lambda: [ip.Image(path, grayscale=grayscale) for path in paths], pixels, repeat)
+            results['copy/' + input_name] = measure(lambda: [image.copy() for image in images], pixels, repeat)
+            results['threshold/' + input_name] = measure(lambda: [image.threshold(100) for image in gray_images], pixels, repeat)
+            for edge_detector_class in EDGE_DETECTORS:
+                edge_detector = edge_detector_class()
+                results['{}/{}'.format(edge_detector_class.__name__, input_name)] = measure(
+                    lambda: [edge_detector.detect(image) for image in gray_images], pixels, repeat)
+
+    return results
+
+def run_kernels(size=1024, kernel_sizes=KERNEL_SIZES, repeat=3):
+    """Runs the benchmarks of the correlation by kernel size.
+
+    The shift-and-add correlation and the FFT correlation are measured with the dense NxN kernels,
+    which shows the crossover EdgeDetectors.FFT_MIN_TAPS is tuned to.
+    The Sobel edge detection is also measured, which runs the separable kernels as two 1D passes.
+
+    Args:
+        size (int, optional): The size of the synthetic image.
+        kernel_sizes (list[int], optional): The sizes of the kernels. Odd numbers.
+        repeat (int, optional): The number of the calls of each benchmark.
+
+    Returns:
+        dict: Returns the results of the benchmarks by name. The name is "operation/NxN".
+    """
+    image = synthetic_image(size)
+    array = image[:, :]
+    pixels = image.height * image.width
+    rng = np.random.default_rng(size)
+
+    results = {}
+    for kernel_size in kernel_sizes:
+        kernels = rng.integers(1, 4, (1, kernel_size, kernel_size)) * rng.choice([-1, 1], (1, kernel_size, kernel_size))
+        name = '{}x{}'.format(kernel_size, kernel_size)
+        results['correlate/' + name] = measure(lambda: ed._correlate(array, kernels), pixels, repeat)
+        results['correlate_fft/' + name] = measure(lambda: ed._correlate_fft(array, kernels), pixels, repeat)
+        edge_detector = ed.SobelEdgeDetector(size=kernel_size)
+        results['SobelEdgeDetector/' + name] = measure(lambda: edge_detector.detect(image), pixels, repeat)
+
+    return results
+
+def run_morphology(size=1024, element_sizes=ELEMENT_SIZES, repeat=3):
+    """Runs the benchmarks of the morphology by structuring element size.
+
+    The vertical segments are measured by comparing the shifted rows and by the van Herk/Gil-Werman algorithm,
+    which shows the crossover Morphology.VAN_HERK_MIN_SIZE is tuned to.
+    The erosion by the square and the octagon is also measured on the grayscale and the binary images.
+
+    Args:
+        size (int, optional): The size of the synthetic image.
+        element_sizes (list[int], optional): The sizes of the structuring elements. Odd numbers.
+        repeat (int, optional): The number of the calls of each benchmark.
+
+    Returns:
+        dict: Returns the results of the benchmarks by name. The name is "operation/NxN".
+    """
+    image = synthetic_image(size)
+    binary_image = image.threshold('otsu', binary=True)
+    array = image[:, :]
+    pixels = image.height * image.width
+
+    results = {}
+    for element_size in element_sizes:
+        name = '{}x{}'.format(element_size, element_size)
+        results['columns_shifted/' + name] = measure(lambda: mo._columns_shifted(array, element_size, np.minimum), pixels, repeat)
+        results['columns_van_herk/' + name] = measure(lambda: mo._columns_van_herk(array, element_size, np.minimum, 255), pixels, repeat)
+        for element in [mo.Rectangle(element_size), mo.Octagon(element_size)]:
+            results['{}.erode/{}'.format(type(element).__name__, name)] = measure(lambda: element.erode(image), pixels, repeat)
+            results['{}.erode/binary/{}'.format(type(element).__name__, name)] = measure(lambda: element.erode(binary_image), pixels, repeat)
+
+    return results
+
+def compare(baseline, results, tolerance=0.2):
+    """Compares the results with the baseline.
+
+    Args:
+        baseline (dict): The results of the baseline.
+        results (dict): The results to compare.
+        tolerance (float, optional): The allowed ratio of the slowdown and the increase of the peak memory.
+
+    Returns:
+        list[string]: Returns the descriptions of the regressions. Empty if nothing regressed.
+    """
+    regressions = []
+    for name in sorted(set(baseline) & set(results)):
+        base = baseline[name]
+        result = results[name]
+        if result['megapixels_per_second'] < base['megapixels_per_second'] / (1.0 + tolerance):
+            regressions.append('{}: {:.1f} -> {:.1f} megapixels/s'.format(name, base['megapixels_per_second'], result['megapixels_per_second']))
+        if base['peak_bytes'] * (1.0 + tolerance) < result['peak_bytes']:
+            regressions.append('{}: {} -> {} peak bytes'.format(name, base['peak_bytes'], result['peak_bytes']))
+
+    return regressions
+
+def main(argv=None):
+    """Runs the benchmarks from the command line.
+
+    Args:
+        argv (list[string], optional): The command line arguments. sys.argv[1:] if None.
+
+    Returns:
+        int: Returns 1 if any benchmark regressed, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks ImageProcessing, EdgeDetectors and Morphology.')
+    parser.add_argument('--output', help='the JSON file to write the results to')
+    parser.add_argument('--baseline', help='the JSON file of the results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='the allowed ratio of the regression')
+    parser.add_argument('--sizes', type=int, nargs='*', default=SYNTHETIC_SIZES, help='the sizes of the synthetic images')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of the calls of each benchmark')
+    parser.add_argument('--kernels', action='store_true', help='also benchmarks the correlation by kernel size')
+    parser.add_argument('--morphology', action='store_true', help='also benchmarks the morphology by structuring element size')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    if args.kernels:
+        results.update(run_kernels(repeat=args.repeat))
+    if args.morphology:
+        results.update(run_morphology(repeat=args.repeat))
+    for name, result in sorted(results.items()):
+        print('{:48} {:10.1f} megapixels/s {:12d} peak bytes'.format(name, result['megapixels_per_second'], result['peak_bytes']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), results, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
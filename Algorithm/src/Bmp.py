@@ -0,0 +1,139 @@
+"""The reader and the writer of uncompressed 8-bit grayscale and 24-bit BMP files.
+
+The reader reads the pixel array of the file into memory as it is instead of decoding it.
+The padding at the end of each row, the bottom-up order of the rows and the BGR order of the channels
+are all handled by the strides of the view, so the pixels are never copied or converted after the single read.
+The file is closed after the read. Optionally the pixel array is mapped into memory copy-on-write instead,
+which reads the pixels from the page cache on the first access, but keeps the file open as long as the image data.
+
+The other BMP variants, such as the compressed or the palette color ones, raise ValueError so that the caller can fall back to PIL.
+"""
+import os
+import struct
+import threading
+import numpy as np
+
+FILE_HEADER_SIZE = 14
+"""int: The size of BITMAPFILEHEADER."""
+
+INFO_HEADER_SIZE = 40
+"""int: The size of BITMAPINFOHEADER, which is written by write."""
+
+GRAYSCALE_PALETTE = np.repeat(np.arange(256, dtype=np.uint8), 4).reshape(256, 4) * np.array([1, 1, 1, 0], np.uint8)
+"""numpy.ndarray: The palette of the 8-bit grayscale BMP files. 256x4 matrix of BGR0."""
+
+def read_header(path):
+    """Reads the header of the BMP file.
+
+    Args:
+        path (string): The path to the BMP file.
+
+    Returns:
+        dict: Returns the 'offset' of the pixel array, the 'width', the 'height', the 'bits' per pixel,
+              whether the rows are 'top_down', and the 'palette' as Nx4 matrix of BGR0 or None.
+
+    Raises:
+        ValueError: If the file is not an uncompressed 8-bit or 24-bit BMP file.
+    """
+    with open(path, 'rb') as f:
+        file_header = f.read(FILE_HEADER_SIZE)
+        if len(file_header) < FILE_HEADER_SIZE or file_header[:2] != b'BM':
+            raise ValueError('not a BMP file: {}'.format(path))
+        offset, = struct.unpack('<I', file_header[10:14])
+        info_header = f.read(INFO_HEADER_SIZE)
+        if len(info_header) < INFO_HEADER_SIZE:
+            raise ValueError('truncated BMP header: {}'.format(path))
+        header_size, width, height, planes, bits, compression = struct.unpack('<IiiHHI', info_header[:20])
+        colors, = struct.unpack('<I', info_header[32:36])
+        if header_size < INFO_HEADER_SIZE or compression != 0 or bits not in (8, 24) or width <= 0 or height == 0:
+            raise ValueError('unsupported BMP file: {} bits, compression {}: {}'.format(bits, compression, path))
+
+        palette = None
+        if bits == 8:
+            f.seek(FILE_HEADER_SIZE + header_size)
+            colors = colors or 256
+            palette = np.frombuffer(f.read(4 * colors), np.uint8).reshape(-1, 4)
+
+    return {'offset': offset, 'width': width, 'height': abs(height), 'bits': bits, 'top_down': height < 0, 'palette': palette}
+
+def read(path, mmap=False):
+    """Reads the pixel array of the BMP file into memory.
+
+    Args:
+        path (string): The path to the BMP file.
+        mmap (bool, optional): Maps the pixel array into memory copy-on-write instead of reading it.
+                               Writing to the image data never changes the file,
+                               but the file stays open until the image data is freed, which limits the number of the images.
+
+    Returns:
+        numpy.ndarray: Returns the view of the pixel array. HxW matrix for grayscale files, HxWx3 matrix of RGB for 24-bit files.
+
+    Raises:
+        ValueError: If the file is not an uncompressed 8-bit grayscale or 24-bit BMP file.
+    """
+    header = read_header(path)
+    palette = header['palette']
+    if palette is not None and not np.array_equal(palette[:, :3], GRAYSCALE_PALETTE[:len(palette), :3]):
+        raise ValueError('unsupported BMP file: palette color: {}'.format(path))
+
+    channels = header['bits'] // 8
+    height = header['height']
+    width = header['width']
+    stride = (width * channels + 3) // 4 * 4
+    if os.path.getsize(path) < header['offset'] + stride * height:
+        raise ValueError('truncated BMP file: {}'.format(path))
+
+    if mmap:
+        rows = np.asarray(np.memmap(path, np.uint8, 'c', header['offset'], (height, stride)))
+    else:
+        rows = np.fromfile(path, np.uint8, stride * height, offset=header['offset']).reshape(height, stride)
+    if not header['top_down']:
+        rows = rows[::-1]
+    if channels == 1:
+        return rows[:, :width]
+
+    return rows[:, :width * 3].reshape(height, width, 3)[:, :, ::-1]
+
+def write(path, array):
+    """Writes the image data to the BMP file.
+
+    The file is written to a temporary file and renamed to the path,
+    so the images mapped from the file before keep their pixels.
+
+    Args:
+        path (string): The path to the BMP file.
+        array (numpy.ndarray): The image data. HxW matrix of uint8 for grayscale images, HxWx3 matrix of uint8 for RGB images.
+
+    Raises:
+        ValueError: If the image data is not uint8 grayscale or RGB.
+    """
+    if array.dtype != np.uint8 or not (array.ndim == 2 or (array.ndim == 3 and array.shape[2] == 3)):
+        raise ValueError('unsupported image data for BMP: {} {}'.format(array.dtype, array.shape))
+
+    height, width = array.shape[:2]
+    channels = 1 if array.ndim == 2 else 3
+    stride = (width * channels + 3) // 4 * 4
+    palette = GRAYSCALE_PALETTE if channels == 1 else np.empty((0, 4), np.uint8)
+    offset = FILE_HEADER_SIZE + INFO_HEADER_SIZE + palette.nbytes
+
+    rows = np.zeros((height, stride), np.uint8)
+    if channels == 1:
+        rows[:, :width] = array[::-1]
+    else:
+        rows[:, :width * 3].reshape(height, width, 3)[...] = array[::-1, :, ::-1]
+
+    file_header = struct.pack('<2sIHHI', b'BM', offset + rows.nbytes, 0, 0, offset)
+    info_header = struct.pack('<IiiHHIIiiII', INFO_HEADER_SIZE, width, height, 1, channels * 8, 0, rows.nbytes, 2835, 2835,
+                              len(palette), 0)
+
+    temporary_path = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+    try:
+        with open(temporary_path, 'wb') as f:
+            f.write(file_header)
+            f.write(info_header)
+            f.write(palette.tobytes())
+            f.write(rows)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
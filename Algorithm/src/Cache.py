@@ -0,0 +1,203 @@
+from collections import OrderedDict
+import hashlib
+import os
+import numpy as np
+try:
+    from . import ImageProcessing as ip
+except ImportError:
+    import ImageProcessing as ip
+
+def _describe(value):
+    """Describes the value as a string that identifies the computation with it.
+
+    The objects such as the edge detectors are described by their classes and attributes,
+    so the description changes when an attribute such as the amplifier is changed.
+
+    Args:
+        value (object): The value.
+
+    Returns:
+        string: Returns the description.
+    """
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(_describe(item) for item in value) + ']'
+    if isinstance(value, np.ndarray):
+        return 'array({},{},{})'.format(value.dtype, value.shape, _hash(value))
+    if hasattr(value, '__dict__'):
+        attributes = ','.join('{}={}'.format(name, _describe(attribute)) for name, attribute in sorted(vars(value).items()))
+        return '{}.{}({})'.format(type(value).__module__, type(value).__qualname__, attributes)
+    return repr(value)
+
+def _hash(array):
+    """Hashes the image data.
+
+    Args:
+        array (numpy.ndarray): The image data.
+
+    Returns:
+        string: Returns the hex digest of the shape, the data type and the pixels.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update('{}{}'.format(array.dtype, array.shape).encode())
+    digest.update(np.ascontiguousarray(array))
+
+    return digest.hexdigest()
+
+class ResultCache:
+    """The cache of the outputs of the edge detection and the threshold processing.
+
+    The outputs are addressed by the hash of the input pixels and the description of the computation,
+    which includes the class, the operators and the parameters of the edge detector.
+    Changing a parameter such as the amplifier changes the address, so the outputs computed before are never returned.
+    The outputs are kept in memory up to max_bytes, evicting the least recently used ones,
+    and also saved to the directory as .npy files if it is given.
+    The images returned are copy-on-write copies, so writing to them does not change the cached outputs.
+
+    Attributes:
+        _max_bytes (int): The maximum number of the bytes of the outputs kept in memory.
+        _directory (string): The directory to save the outputs to. None if the outputs are kept only in memory.
+        _entries (collections.OrderedDict): The outputs kept in memory, from the least recently used.
+        _bytes (int): The number of the bytes of the outputs kept in memory.
+        _hits (int): The number of the requests returned from the cache.
+        _misses (int): The number of the requests computed.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, directory=None):
+        """Initializes ResultCache class: The ResultCache class constructor.
+
+        Args:
+            max_bytes (int, optional): The maximum number of the bytes of the outputs kept in memory.
+            directory (string, optional): The directory to save the outputs to as memory-mapped .npy files.
+        """
+        self._max_bytes = max_bytes
+        self._directory = directory
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+        if directory is not None and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    @property
+    def hits(self):
+        """Gets the number of the requests returned from the cache.
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """Gets the number of the requests computed.
+        """
+        return self._misses
+
+    @property
+    def nbytes(self):
+        """Gets the number of the bytes of the outputs kept in memory.
+        """
+        return self._bytes
+
+    def detect(self, edge_detector, image):
+        """Detects the edge of the object in the image, or returns the cached output.
+
+        Args:
+            edge_detector (EdgeDetectors.EdgeDetector): The edge detector.
+            image (ImageProcessing.Image): The input image.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image with the edge detected.
+        """
+        key = self._key(image, 'detect', edge_detector)
+
+        return self._get(key, lambda: edge_detector.detect(image))
+
+    def threshold(self, image, threshold, high=None, low=0):
+        """Executes threshold processing, or returns the cached output.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            threshold (int): The threshold. See ImageProcessing.Image.threshold.
+            high (int, optional): This is set if the pixcel value is greater than the threshold.
+            low (int, optional): This is set if the pixcel value is less than or equal to the threshold.
+
+        Returns:
+            ImageProcessing.Image: Returns the image executed threshold processing.
+        """
+        key = self._key(image, 'threshold', (threshold, high, low))
+
+        return self._get(key, lambda: image.threshold(threshold, high, low))
+
+    def clear(self):
+        """Removes all the outputs kept in memory and saved to the directory.
+        """
+        self._entries.clear()
+        self._bytes = 0
+        if self._directory is not None:
+            for name in os.listdir(self._directory):
+                if name.endswith('.npy'):
+                    os.remove(os.path.join(self._directory, name))
+
+    def _key(self, image, operation, parameters):
+        """Creates the address of the output.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            operation (string): The name of the operation.
+            parameters (object): The parameters of the operation.
+
+        Returns:
+            string: Returns the hex digest addressing the output.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(_hash(image[:, :]).encode())
+        digest.update(operation.encode())
+        digest.update(_describe(parameters).encode())
+
+        return digest.hexdigest()
+
+    def _get(self, key, compute):
+        """Gets the output from memory, the directory or the computation in this order.
+
+        Args:
+            key (string): The address of the output.
+            compute (function): The function that computes the output image.
+
+        Returns:
+            ImageProcessing.Image: Returns the copy-on-write copy of the output image.
+        """
+        output_image = self._entries.get(key)
+        if output_image is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return output_image.copy(copy_on_write=True)
+
+        path = None if self._directory is None else os.path.join(self._directory, key + '.npy')
+        if path is not None and os.path.exists(path):
+            output_image = ip.Image(path, mmap=True)
+            self._hits += 1
+        else:
+            output_image = compute()
+            self._misses += 1
+            if path is not None:
+                output_image.save(path)
+
+        self._put(key, output_image)
+
+        return output_image.copy(copy_on_write=True)
+
+    def _put(self, key, output_image):
+        """Keeps the output in memory, evicting the least recently used outputs beyond max_bytes.
+
+        Args:
+            key (string): The address of the output.
+            output_image (ImageProcessing.Image): The output image.
+        """
+        size = output_image[:, :].nbytes
+        if self._max_bytes < size:
+            return
+
+        self._entries[key] = output_image
+        self._bytes += size
+        while self._max_bytes < self._bytes:
+            _, evicted_image = self._entries.popitem(last=False)
+            self._bytes -= evicted_image[:, :].nbytes
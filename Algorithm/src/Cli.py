@@ -0,0 +1,204 @@
+"""The command line tool that detects the edge of many image files in parallel.
+
+Usage:
+    python -m Algorithm.src ../../SIDBA/Mono --detector sobel --amplifier 2 --threshold 100 --output-dir edges
+    python Cli.py "frames/*.bmp" --detector canny --output-dir edges --workers 4
+
+The decoding, the detection and the encoding of each image run on a thread pool driven by asyncio,
+so the file I/O of some images overlaps with the computation of the others.
+The number of the images in flight is bounded, so the memory stays constant regardless of the number of the images.
+The output files are named after the input files, and the input files that would be saved to the same name are rejected.
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import glob
+import os
+import sys
+import time
+try:
+    from . import ImageProcessing as ip
+    from . import EdgeDetectors as ed
+    from . import Pipeline as pl
+    from .Profiler import Profiler
+except ImportError:
+    import ImageProcessing as ip
+    import EdgeDetectors as ed
+    import Pipeline as pl
+    from Profiler import Profiler
+
+EDGE_DETECTORS = {'difference': ed.DifferenceEdgeDetector,
+                  'roberts': ed.RobertsEdgeDetector,
+                  'sobel': ed.SobelEdgeDetector,
+                  'prewitt': ed.PrewittEdgeDetector,
+                  'canny': ed.CannyEdgeDetector}
+"""dict[string, type]: The edge detector classes by name."""
+
+def find_images(inputs):
+    """Finds the image files.
+
+    Args:
+        inputs (list[string]): The paths to the image files or the directories, or the glob patterns.
+
+    Returns:
+        list[string]: Returns the paths to the image files. The files in a directory or matched by a pattern are sorted by name.
+
+    Raises:
+        FileNotFoundError: If any input matches no file.
+    """
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            matches = [os.path.join(path, name) for name in sorted(os.listdir(path)) if os.path.isfile(os.path.join(path, name))]
+        elif os.path.isfile(path):
+            matches = [path]
+        else:
+            matches = sorted(match for match in glob.glob(path) if os.path.isfile(match))
+        if not matches:
+            raise FileNotFoundError('no image file matches: {}'.format(path))
+        paths.extend(matches)
+
+    return paths
+
+def output_paths(paths, output_dir, extension='.bmp'):
+    """Names the output files after the input files.
+
+    Args:
+        paths (list[string]): The paths to the image files.
+        output_dir (string): The directory to save the output images to.
+        extension (string, optional): The extension of the output files.
+
+    Returns:
+        list[string]: Returns the paths to the output files in the order of the input files.
+
+    Raises:
+        ValueError: If any output files have the same name, which would overwrite each other.
+                    The names are compared ignoring case, since some file systems do.
+    """
+    names = [os.path.splitext(os.path.basename(path))[0] + extension for path in paths]
+    inputs = {}
+    for path, name in zip(paths, names):
+        if name.casefold() in inputs:
+            raise ValueError('{} and {} are both saved as {}'.format(inputs[name.casefold()], path, name))
+        inputs[name.casefold()] = path
+
+    return [os.path.join(output_dir, name) for name in names]
+
+def create_pipeline(detector, amplifier=None, threshold=None):
+    """Creates the pipeline of the edge detection and the threshold processing.
+
+    Args:
+        detector (string): The name of the edge detector. One of EDGE_DETECTORS.
+        amplifier (double, optional): The amplifier of the edge detector. The default of the edge detector if None.
+        threshold (int, optional): The threshold. The threshold processing is skipped if None.
+
+    Returns:
+        Pipeline.Pipeline: Returns the pipeline.
+    """
+    edge_detector = EDGE_DETECTORS[detector]() if amplifier is None else EDGE_DETECTORS[detector](amplifier=amplifier)
+    pipeline = pl.Pipeline().add_detector(edge_detector)
+    if threshold is not None:
+        pipeline.add_threshold(threshold)
+
+    return pipeline
+
+async def process_async(paths, pipeline, output_paths, workers=1, threshold_method=None):
+    """Processes the image files on the thread pool.
+
+    Each image is decoded, processed and encoded as separate jobs of the thread pool,
+    so the thread waiting for the file I/O does not keep the others from computing.
+    Twice the workers coroutines take the image files one by one, so at most that many images are in flight at once
+    and the memory does not grow with the number of the image files.
+
+    Args:
+        paths (list[string]): The paths to the image files.
+        pipeline (Pipeline.Pipeline): The pipeline executed on each image.
+        output_paths (list[string]): The paths to save the output images to in the order of the image files.
+        workers (int, optional): The number of the threads. 0 < workers.
+        threshold_method (string, optional): The method to select the threshold of each output image. See ImageProcessing.Image.auto_threshold.
+
+    Returns:
+        list[tuple(string, Exception)]: Returns the paths to the image files that failed and the exceptions.
+    """
+    loop = asyncio.get_running_loop()
+    failures = []
+
+    def detect(image):
+        output_image = pipeline.detect(image)
+        if threshold_method is not None:
+            output_image.threshold(threshold_method, inplace=True)
+        return output_image
+
+    async def process(executor, jobs):
+        for path, output_path in jobs:
+            try:
+                image = await loop.run_in_executor(executor, lambda: ip.Image(path, grayscale=True))
+                output_image = await loop.run_in_executor(executor, detect, image)
+                await loop.run_in_executor(executor, output_image.save, output_path)
+            except Exception as exception:
+                failures.append((path, exception))
+
+    with ThreadPoolExecutor(workers) as executor:
+        jobs = zip(paths, output_paths)
+        await asyncio.gather(*[process(executor, jobs) for _ in range(min(2 * workers, len(paths)))])
+
+    return failures
+
+def main(argv=None):
+    """Runs the edge detection from the command line.
+
+    Args:
+        argv (list[string], optional): The command line arguments. sys.argv[1:] if None.
+
+    Returns:
+        int: Returns 1 if any image failed, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description='Detects the edge of the image files in parallel.')
+    parser.add_argument('inputs', nargs='+', help='the image files, the directories of the image files or the glob patterns')
+    parser.add_argument('--detector', choices=sorted(EDGE_DETECTORS), default='sobel', help='the edge detector')
+    parser.add_argument('--amplifier', type=float, help='the amplifier of the edge detector')
+    parser.add_argument('--threshold', help='the threshold, or one of {} to select it for each image'.format(', '.join(ip.Image.THRESHOLD_METHODS)))
+    parser.add_argument('--output-dir', required=True, help='the directory to save the output images to')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='the number of the threads')
+    parser.add_argument('--extension', default='.bmp', help='the extension of the output files')
+    parser.add_argument('--profile', help='the JSON file to write the profile of the stages to')
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error('workers must be 1 or more: {}'.format(args.workers))
+
+    threshold = args.threshold
+    threshold_method = None
+    if threshold is not None and threshold in ip.Image.THRESHOLD_METHODS:
+        threshold, threshold_method = None, threshold
+    elif threshold is not None:
+        if not threshold.isdigit():
+            parser.error('invalid threshold: {}'.format(threshold))
+        threshold = int(threshold)
+
+    try:
+        paths = find_images(args.inputs)
+        output_image_paths = output_paths(paths, args.output_dir, args.extension)
+    except (FileNotFoundError, ValueError) as exception:
+        parser.error(str(exception))
+    pipeline = create_pipeline(args.detector, args.amplifier, threshold)
+    if not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    profiler = Profiler() if args.profile else contextlib.nullcontext()
+    with profiler:
+        start = time.perf_counter()
+        failures = asyncio.run(process_async(paths, pipeline, output_image_paths, args.workers, threshold_method))
+        seconds = time.perf_counter() - start
+
+    for path, exception in failures:
+        print('error: {}: {}'.format(path, exception), file=sys.stderr)
+    succeeded = len(paths) - len(failures)
+    print('{} images in {:.2f} seconds ({:.1f} images/s)'.format(succeeded, seconds, succeeded / seconds if 0 < seconds else float('inf')))
+    if args.profile:
+        profiler.save(args.profile)
+
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,291 @@
 from abc import ABCMeta, abstractmethod
-import math
+from concurrent.futures import ThreadPoolExecutor
+import os
+import numpy as np
+try:
+    from . import ImageProcessing as ip
+    from .Profiler import profile
+except ImportError:
+    import ImageProcessing as ip
+    from Profiler import profile
+
+FFT_MIN_TAPS = 64
+"""int: The number of the multiply-adds per pixel above which the kernels are correlated by FFT.
+
+Tuned by Benchmark.run_kernels: the shift-and-add correlation costs a pass over the image per nonzero tap,
+while the FFT costs about the same for any kernel size.
+"""
+
+BATCH_PIXELS = 1 << 20
+"""int: The number of the input pixels detected in a single pass by detect_batch.
+
+The intermediate arrays of the pass grow with the number of the stacked images,
+so the images of the same shape are detected in chunks of about this many pixels.
+"""
+
+def _accumulator_dtype(array, kernels):
+    """Gets the data type in which the responses are accumulated.
+
+    Args:
+        array (numpy.ndarray): The image data.
+        kernels (numpy.ndarray): The kernels.
+
+    Returns:
+        numpy.dtype: Returns float32 if either the image data or the kernels are not integer.
+                     Returns int32 if the responses fit in it, int64 otherwise.
+    """
+    if array.dtype.kind == 'f' or not np.array_equal(kernels, np.rint(kernels)):
+        return np.float32
+    bound = int(np.iinfo(array.dtype).max) * int(np.abs(kernels).sum(axis=(-2, -1)).max())
+    return np.int32 if bound <= np.iinfo(np.int32).max else np.int64
+
+def _correlate(array, kernels, accumulator_dtype=None):
+    """Correlates the array with the kernels.
+
+    Each response is accumulated from the shifted slices of the array, one per nonzero coefficient,
+    so no Python loop runs over the pixels.
+    Only the inner region, where the kernel fits in the array, is computed.
+    The last two axes of the array are the image, and the leading axes are processed in the same pass.
+    The responses are accumulated in integer if both the image and the kernels are integer, and in float32 otherwise.
+
+    Args:
+        array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are at least the size of the kernels.
+        kernels (list[list[list[int]]]): The kernels. KxMxN matrix.
+        accumulator_dtype (numpy.dtype, optional): The data type of the responses. See _accumulator_dtype if None.
+
+    Returns:
+        numpy.ndarray: Returns the responses. Kx...x(H - M + 1)x(W - N + 1) matrix of int32, int64 or float32.
+    """
+    kernels = np.asarray(kernels)
+    if accumulator_dtype is None:
+        accumulator_dtype = _accumulator_dtype(array, kernels)
+    kernels = kernels.astype(accumulator_dtype)
+    height = array.shape[-2] - kernels.shape[1] + 1
+    width = array.shape[-1] - kernels.shape[2] + 1
+    responses = np.zeros((kernels.shape[0],) + array.shape[:-2] + (height, width), accumulator_dtype)
+
+    for i in range(0, kernels.shape[1]):
+        for j in range(0, kernels.shape[2]):
+            window = array[..., i:i + height, j:j + width]
+            for k in np.flatnonzero(kernels[:, i, j]):
+                coefficient = kernels[k, i, j]
+                if coefficient == 1:
+                    responses[k] += window
+                elif coefficient == -1:
+                    responses[k] -= window
+                else:
+                    responses[k] += coefficient * window.astype(accumulator_dtype)
+
+    return responses
+
+def _factorize(kernel):
+    """Factorizes the kernel into the outer product of a column and a row if its rank is 1.
+
+    The factors of integer kernels are integer, so the separable correlation is exact.
+
+    Args:
+        kernel (numpy.ndarray): The kernel. MxN matrix.
+
+    Returns:
+        tuple(numpy.ndarray, numpy.ndarray): Returns the column and the row. None if the rank of the kernel is not 1.
+    """
+    i, j = np.unravel_index(np.argmax(np.abs(kernel)), kernel.shape)
+    if kernel[i, j] == 0:
+        return None
+
+    row = kernel[i]
+    if np.array_equal(kernel, np.rint(kernel)):
+        row = row // np.gcd.reduce(row.astype(np.int64))
+    column = kernel[:, j] / row[j]
+    if np.array_equal(kernel, np.rint(kernel)) and not np.array_equal(column, np.rint(column)):
+        return None
+    if not np.allclose(np.outer(column, row), kernel, rtol=0, atol=1e-9 * np.abs(kernel).max()):
+        return None
+
+    return column, row
+
+def _binomial(n):
+    """Gets the binomial coefficients.
+
+    Args:
+        n (int): The exponent. 0 <= n.
+
+    Returns:
+        numpy.ndarray: Returns the coefficients of (1 + x) ** n. n + 1 integers.
+    """
+    coefficients = np.array([1])
+    for _ in range(n):
+        coefficients = np.convolve(coefficients, [1, 1])
+
+    return coefficients
+
+def _correlate_fft(array, kernels):
+    """Correlates the array with the kernels by FFT.
+
+    The cost per pixel grows with the logarithm of the image size instead of the size of the kernels.
+    The responses of the integer images and kernels are rounded to the nearest integer, so they are exact.
+
+    Args:
+        array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are at least the size of the kernels.
+        kernels (numpy.ndarray): The kernels. KxMxN matrix.
+
+    Returns:
+        numpy.ndarray: Returns the responses. Kx...x(H - M + 1)x(W - N + 1) matrix of int32, int64 or float32.
+    """
+    accumulator_dtype = _accumulator_dtype(array, kernels)
+    height, width = array.shape[-2:]
+    size_y, size_x = kernels.shape[1:]
+    spectrum = np.fft.rfft2(array, axes=(-2, -1))
+    responses = np.empty((len(kernels),) + array.shape[:-2] + (height - size_y + 1, width - size_x + 1), accumulator_dtype)
+
+    for k, kernel in enumerate(kernels):
+        kernel_spectrum = np.fft.rfft2(kernel[::-1, ::-1], s=(height, width))
+        response = np.fft.irfft2(spectrum * kernel_spectrum, s=(height, width), axes=(-2, -1))[..., size_y - 1:, size_x - 1:]
+        responses[k] = response if accumulator_dtype == np.float32 else np.rint(response)
+
+    return responses
+
+def _filter(array, kernels):
+    """Correlates the array with the kernels by the fastest way for each kernel.
+
+    The rank-1 kernels, such as Sobel, are correlated as a row and then a column, which costs O(M + N) per pixel.
+    The other kernels are correlated by the shifted slices, which costs O(MN) per pixel,
+    or by FFT if the cost exceeds FFT_MIN_TAPS.
+
+    Args:
+        array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are at least the size of the kernels.
+        kernels (list[list[list[int]]]): The kernels. KxMxN matrix.
+
+    Returns:
+        numpy.ndarray: Returns the responses. Kx...x(H - M + 1)x(W - N + 1) matrix of int32, int64 or float32.
+    """
+    kernels = np.asarray(kernels)
+    responses = [None] * len(kernels)
+    direct = []
+    fft = []
+    for k, kernel in enumerate(kernels):
+        factors = _factorize(kernel)
+        taps = np.count_nonzero(kernel)
+        if factors is not None and np.count_nonzero(factors[0]) + np.count_nonzero(factors[1]) < min(taps, FFT_MIN_TAPS):
+            column, row = factors
+            accumulator_dtype = _accumulator_dtype(array, kernel)
+            rows = _correlate(array, row[np.newaxis, np.newaxis, :], accumulator_dtype)[0]
+            responses[k] = _correlate(rows, column[np.newaxis, :, np.newaxis], accumulator_dtype)[0]
+        elif taps <= FFT_MIN_TAPS:
+            direct.append(k)
+        else:
+            fft.append(k)
+
+    for indices, correlate in [(direct, _correlate), (fft, _correlate_fft)]:
+        if indices:
+            for k, response in zip(indices, correlate(array, kernels[indices])):
+                responses[k] = response
+
+    return np.stack(responses)
+
+def _fill_border(array, value, halo=1):
+    """Sets the pixels on the border of the image to the value.
+
+    Only the border is written, so the output image needs no full-frame initialization.
+
+    Args:
+        array (numpy.ndarray): The image data. ...xHxW matrix.
+        value (int): The value of the pixels on the border.
+        halo (int, optional): The width of the border. 0 < halo.
+    """
+    if array.shape[-2] <= 2 * halo or array.shape[-1] <= 2 * halo:
+        array[...] = value
+        return
+
+    array[..., :halo, :] = value
+    array[..., -halo:, :] = value
+    array[..., halo:-halo, :halo] = value
+    array[..., halo:-halo, -halo:] = value
+
+def _store(values, output, lut=None):
+    """Saturates the values to the range of the output and stores them.
+
+    Args:
+        values (numpy.ndarray): The values to store.
+        output (numpy.ndarray): The array to store the values to. It has the same shape as the values.
+        lut (numpy.ndarray, optional): The lookup table applied to the saturated values in the same pass.
+                                       The output is integer in this case.
+    """
+    max_value = ip.max_pixel_value(output.dtype)
+    if lut is None:
+        output[...] = np.clip(values, 0, max_value)
+    else:
+        ip.apply_lut(lut, np.clip(values, 0, max_value).astype(output.dtype), output)
+
+def _hysteresis(strong, weak):
+    """Keeps the weak pixels connected to the strong pixels.
+
+    The connected components of the weak pixels in the 8-neighborhood are labeled by the vectorized union-find:
+    each pass hooks the root of every pair of the neighboring pixels to the smaller root and then compresses the paths,
+    so each pass is linear in the number of the weak pixels and no Python loop runs over the pixels.
+    The last two axes of the arrays are the image, and the leading axes are processed in the same pass.
+
+    Args:
+        strong (numpy.ndarray): The strong pixels. ...xHxW matrix of bool. They are also weak pixels.
+        weak (numpy.ndarray): The weak pixels. ...xHxW matrix of bool.
+
+    Returns:
+        numpy.ndarray: Returns the weak pixels connected to any strong pixel. ...xHxW matrix of bool.
+    """
+    ids = np.full(weak.shape, -1, np.int64)
+    count = np.count_nonzero(weak)
+    ids[weak] = np.arange(count)
+    neighbors = [(ids[..., :, :-1], ids[..., :, 1:]),
+                 (ids[..., :-1, :], ids[..., 1:, :]),
+                 (ids[..., :-1, :-1], ids[..., 1:, 1:]),
+                 (ids[..., :-1, 1:], ids[..., 1:, :-1])]
+    connected = [(a >= 0) & (b >= 0) for a, b in neighbors]
+    a = np.concatenate([a[mask] for (a, b), mask in zip(neighbors, connected)])
+    b = np.concatenate([b[mask] for (a, b), mask in zip(neighbors, connected)])
+
+    parent = np.arange(count)
+    while True:
+        root_a = parent[a]
+        root_b = parent[b]
+        different = root_a != root_b
+        if not different.any():
+            break
+        a = a[different]
+        b = b[different]
+        root_a = root_a[different]
+        root_b = root_b[different]
+        parent[np.maximum(root_a, root_b)] = np.minimum(root_a, root_b)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    has_strong = np.zeros(len(parent), bool)
+    has_strong[parent[ids[strong]]] = True
+    output = np.zeros(weak.shape, bool)
+    output[weak] = has_strong[parent]
+
+    return output
 
 class EdgeDetector(metaclass=ABCMeta):
     """The edge detection class.
 
     This class is implemented with the Strategy pattern.
+
+    Attributes:
+        HALO (int): The number of the neighboring pixels on each side that the operators refer to.
+        WHOLE_IMAGE (bool): The detection refers to the whole image beyond the halo,
+                            so detect_tiled and detect_parallel detect the whole image at once instead of strip by strip.
+        CHANNEL_COMBINATIONS (tuple(string)): The ways to combine the channels of RGB images.
+        _channel_combination (string): The way to combine the channels of RGB images. See channel_combination.
     """
 
+    HALO = 1
+    WHOLE_IMAGE = False
+    CHANNEL_COMBINATIONS = ('luminance', 'max', 'l2')
+    _channel_combination = 'luminance'
+
     @abstractmethod
     def detect(self, image):
         """Detects the edge of the object in the image.
@@ -19,12 +298,275 @@ class EdgeDetector(metaclass=ABCMeta):
         """
         pass
 
+    @profile
+    def detect_batch(self, images):
+        """Detects the edge of the object in many images at once.
+
+        The images of the same shape are stacked into NxHxW arrays of about BATCH_PIXELS pixels and each array is detected in a single pass,
+        so the Python overhead is paid once per chunk instead of once per image and the intermediate arrays stay bounded.
+        The output of each chunk is written to the output array allocated once per shape.
+        The subclasses not overriding _strength detect each image by detect instead.
+
+        Args:
+            images (list[ImageProcessing.Image] or string): The input images, or the path to the directory of the image files.
+                                                            The image files are opened in grayscale.
+
+        Returns:
+            list[ImageProcessing.Image]: Returns the output images in the order of the input images.
+                                         The output images of the same shape are views of one array.
+        """
+        if isinstance(images, str):
+            images = ip.Image.open_directory(images, grayscale=True)
+        if type(self)._strength is EdgeDetector._strength:
+            return [self.detect(image) for image in images]
+
+        output_images = [None] * len(images)
+        for indices in ip.Image.group(images):
+            shape = images[indices[0]]._image.shape
+            output = np.empty((len(indices),) + shape[:2], images[indices[0]]._image.dtype)
+            count = max(1, BATCH_PIXELS // int(np.prod(shape)))
+            for start in range(0, len(indices), count):
+                array = np.stack([images[index]._image for index in indices[start:start + count]])
+                self._detect_fused(array, rgb=array.ndim == 4, output=output[start:start + count])
+            for index, output_array in zip(indices, output):
+                output_images[index] = type(images[index]).from_array(output_array)
+
+        return output_images
+
+    @property
+    def channel_combination(self):
+        """Gets the way to combine the channels of RGB images.
+
+        Returns:
+            string: Returns one of CHANNEL_COMBINATIONS.
+                    'luminance' detects the edge of the luminance, which is the same as opening the image file in grayscale.
+                    'max' and 'l2' detect the edge of each channel and take the maximum or the L2 norm of the edge strengths.
+        """
+        return self._channel_combination
+
+    @channel_combination.setter
+    def channel_combination(self, value):
+        """Sets the way to combine the channels of RGB images.
+
+        Args:
+            value (string): One of CHANNEL_COMBINATIONS.
+
+        Raises:
+            ValueError: If the value is not one of CHANNEL_COMBINATIONS.
+        """
+        if value not in self.CHANNEL_COMBINATIONS:
+            raise ValueError('channel_combination must be one of {}: {}'.format(self.CHANNEL_COMBINATIONS, value))
+        self._channel_combination = value
+
+    def _detect_fused(self, array, lut=None, rgb=False, output=None):
+        """Detects the edge of the object in the image data and applies the lookup table in the same pass.
+
+        The channels of RGB images are detected in a single batched pass and combined by channel_combination.
+
+        Args:
+            array (numpy.ndarray): The image data. ...xHxW matrix for grayscale images, ...xHxWx3 matrix for RGB images.
+            lut (numpy.ndarray, optional): The lookup table applied to the output pixels. The image data is integer in this case.
+            rgb (bool, optional): The image data is RGB.
+            output (numpy.ndarray, optional): The array to write the output image data to. ...xHxW matrix of the data type of the image data.
+                                              A new array is allocated if None.
+
+        Returns:
+            numpy.ndarray: Returns the output image data. ...xHxW matrix.
+        """
+        if rgb and self._channel_combination == 'luminance':
+            array = ip.luminance(array)
+            rgb = False
+
+        halo = self.HALO
+        if output is None:
+            output = np.empty(array.shape[:-1] if rgb else array.shape, array.dtype)
+        border = self._border(array.dtype)
+        _fill_border(output, border if lut is None else lut[border], halo)
+        if output.shape[-2] <= 2 * halo or output.shape[-1] <= 2 * halo:
+            return output
+
+        if not rgb:
+            strength = self._strength(array)
+        elif self._channel_combination == 'max':
+            strength = self._strength(np.moveaxis(array, -1, 0)).max(axis=0)
+        else:
+            strengths = np.maximum(self._strength(np.moveaxis(array, -1, 0)), 0)
+            strength = np.sqrt(np.square(strengths).sum(axis=0))
+        _store(strength, output[..., halo:-halo, halo:-halo], lut)
+
+        return output
+
+    def _border(self, dtype):
+        """Gets the value of the pixels on the border of the output image, where the operators cannot be applied.
+
+        Args:
+            dtype (numpy.dtype): The data type of the output image.
+
+        Returns:
+            int: Returns the maximum pixel value of the data type, which makes the border white.
+        """
+        return ip.max_pixel_value(dtype)
+
+    def _strength(self, array):
+        """Computes the edge strength inside the border of the image data.
+
+        Subclasses override this to support the batched pass of detect_batch, RGB images and the fusion in Pipeline.
+
+        Args:
+            array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are greater than 2 * HALO.
+
+        Returns:
+            numpy.ndarray: Returns the edge strength before it is saturated. ...x(H - 2 * HALO)x(W - 2 * HALO) matrix of float32.
+        """
+        raise NotImplementedError('{} does not support the batch processing'.format(type(self).__name__))
+
+    @profile
+    def detect_tiled(self, image, path, strip_height=256, workers=1):
+        """Detects the edge of the object in the image strip by strip.
+
+        Each strip is read with the halo rows that the operators need, detected and written to the .npy file.
+        The peak memory is bounded by the size of the strip times the workers, so the image can be larger than memory
+        if it is opened with mmap=True. The output is the same as detect.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            path (string): The path to the .npy file to write the output image to.
+            strip_height (int, optional): The number of the rows processed at once. 0 < strip_height.
+            workers (int, optional): The number of the threads detecting the strips. 0 < workers.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image mapped to the file.
+        """
+        output_image = type(image).memmap(path, image.height, image.width, image.dtype)
+        self._detect_strips(image, output_image, strip_height, workers)
+        output_image[:, :].flush()
+
+        return output_image
+
+    @profile
+    def detect_parallel(self, image, workers=None):
+        """Detects the edge of the object in the image on multiple threads.
+
+        The image is split into row bands with the halo rows that the operators need,
+        and the bands are detected on a thread pool. The detection of a band runs in NumPy,
+        which releases the GIL, so the bands are processed in parallel. The output is the same as detect.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            workers (int, optional): The number of the threads. The number of the CPUs if None.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image with the edge detected.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        output_image = type(image).from_array(np.empty((image.height, image.width), image.dtype))
+        strip_height = max(1, -(-image.height // workers))
+        self._detect_strips(image, output_image, strip_height, workers)
+
+        return output_image
+
+    @profile
+    def detect_level(self, image, level):
+        """Detects the edge of the object in the level of the image pyramid.
+
+        The level k has 1/4^k of the pixels, so this costs about 1/4^k of detect, which suits previews.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            level (int): The level of the image pyramid. See ImageProcessing.Image.pyramid_level.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image with the edge detected, which has the size of the level.
+        """
+        return self.detect(image.pyramid_level(level))
+
+    @profile
+    def detect_coarse_to_fine(self, image, level=1, threshold=None, tile=32):
+        """Detects the edge of the object in the image only where the coarse level of the image pyramid has the edge.
+
+        The image is detected at the level first. The tiles that contain or neighbor the coarse pixels above the threshold,
+        except for the coarse border, are detected at full resolution with the halo pixels, and the output of the other tiles is 0.
+        The output of the detected tiles is the same as detect, except for the edge detectors that refer to the whole image such as Canny.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            level (int, optional): The level of the image pyramid detected first. 0 < level.
+            threshold (int, optional): The edge strength of the coarse pixels that the tiles are detected around.
+                                       A quarter of the maximum pixel value if None.
+            tile (int, optional): The height and the width of the tiles. It is rounded up to a multiple of 2^level.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image with the edge detected.
+        """
+        scale = 2 ** level
+        tile = -(-tile // scale) * scale
+        halo = self.HALO
+        max_value = ip.max_pixel_value(image.dtype)
+        if threshold is None:
+            threshold = max_value / 4
+
+        coarse = self.detect_level(image, level)[:, :]
+        coarse_halo = halo if halo < min(coarse.shape) // 2 else 0
+        edge = coarse[coarse_halo:coarse.shape[0] - coarse_halo, coarse_halo:coarse.shape[1] - coarse_halo] > threshold
+        tiles_y = -(-image.height // tile)
+        tiles_x = -(-image.width // tile)
+        selected = np.zeros((tiles_y + 2, tiles_x + 2), bool)
+        y, x = np.nonzero(edge)
+        selected[(y + coarse_halo) * scale // tile + 1, (x + coarse_halo) * scale // tile + 1] = True
+        selected = selected[:-2] | selected[1:-1] | selected[2:]
+        selected = selected[:, :-2] | selected[:, 1:-1] | selected[:, 2:]
+
+        array = image[:, :]
+        output = np.zeros((image.height, image.width), image.dtype)
+        _fill_border(output, self._border(image.dtype), halo)
+        for tile_y in np.flatnonzero(selected.any(axis=1)):
+            runs = np.flatnonzero(np.diff(np.concatenate([[0], selected[tile_y].astype(np.int8), [0]])))
+            for start, stop in zip(runs[0::2], runs[1::2]):
+                top, bottom = tile_y * tile, min(image.height, (tile_y + 1) * tile)
+                left, right = start * tile, min(image.width, stop * tile)
+                crop_top, crop_left = max(0, top - halo), max(0, left - halo)
+                crop = type(image).from_array(array[crop_top:min(image.height, bottom + halo), crop_left:min(image.width, right + halo)])
+                output[top:bottom, left:right] = self.detect(crop)[top - crop_top:bottom - crop_top, left - crop_left:right - crop_left]
+
+        return type(image).from_array(output)
+
+    def _detect_strips(self, image, output_image, strip_height, workers=1):
+        """Detects the edge of the object in the image strip by strip and writes it to the output image.
+
+        The whole image is detected at once if WHOLE_IMAGE is True.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            output_image (ImageProcessing.Image): The image to write the output to. It has the same size as the input image.
+            strip_height (int): The number of the rows processed at once. 0 < strip_height.
+            workers (int, optional): The number of the threads detecting the strips. 0 < workers.
+        """
+        if self.WHOLE_IMAGE:
+            output_image[:, :] = self.detect(image)[:, :]
+            return
+
+        def detect_strip(strip):
+            top, bottom, strip_image = strip
+            margin = top - max(0, top - self.HALO)
+            output_image[top:bottom] = self.detect(strip_image)[margin:margin + bottom - top]
+
+        if workers == 1:
+            for strip in image.strips(strip_height, self.HALO):
+                detect_strip(strip)
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                for _ in executor.map(detect_strip, image.strips(strip_height, self.HALO)):
+                    pass
+
 class GradientEdgeDetector(EdgeDetector):
     """The gradient edge detection class.
 
+    The operators are NxN matrices of any odd N. See _filter for how they are correlated.
+
     Attributes:
-        _ope_x (list[list[int]]): The derivative operator in the x direction. 3x3 matrix.
-        _ope_y (list[list[int]]): The derivative operator in the y direction. 3x3 matrix.
+        _ope_x (list[list[int]]): The derivative operator in the x direction. NxN matrix.
+        _ope_y (list[list[int]]): The derivative operator in the y direction. NxN matrix.
         _amplifier (double):　The tone adjustment factor.
     """
 
@@ -35,11 +577,26 @@ class GradientEdgeDetector(EdgeDetector):
             ope_x (list[list[int]]): The derivative operator in the x direction.
             ope_y (list[list[int]]): The derivative operator in the y direction.
             amplifier (double, optional):　The tone adjustment factor. 0.0 < amplifier.
+
+        Raises:
+            ValueError: If the operators are not NxN matrices of the same odd N.
         """
+        shape = np.shape(ope_x)
+        if len(shape) != 2 or shape[0] != shape[1] or shape[0] % 2 == 0 or np.shape(ope_y) != shape:
+            raise ValueError('the operators must be NxN matrices of the same odd N: {}, {}'.format(shape, np.shape(ope_y)))
         self._ope_x = ope_x
         self._ope_y = ope_y
         self._amplifier = amplifier
 
+    @property
+    def HALO(self):
+        """Gets the number of the neighboring pixels on each side that the operators refer to.
+
+        Returns:
+            int: Returns N // 2 for the NxN operators.
+        """
+        return len(self._ope_x) // 2
+
     @property
     def amplifier(self):
         """Gets the amplifier.
@@ -58,34 +615,83 @@ class GradientEdgeDetector(EdgeDetector):
         """
         self._amplifier = value
 
-    def detect(self, image):
+    @profile
+    def detect(self, image, reference=False):
         """Detects the edge of the object in the image.
 
-        TODO: グレースケール画像だけでなくRGB画像にも対応したい
-        This process can only be done with grayscale images.
+        The edge strength is computed over the whole image at once from shifted slices of the image.
+        The channels of RGB images are combined by channel_combination, and the output image is grayscale.
+        The pixels on the border of the image are white.
 
         Args:
             image (ImageProcessing.Image): The input image.
+            reference (bool, optional): Uses the pixel-by-pixel loop instead of the whole-image computation.
+                                        The loop is slow and is kept as the reference for equivalence testing.
+                                        The loop can only be done with grayscale images.
 
         Returns:
             ImageProcessing.Image: Returns the output image with the edge detected.
         """
-        MAX_PIXEL_VALUE = 255
-        output_image = image.copy()
-        output_image[:, :] = MAX_PIXEL_VALUE # TODO: 白画像の生成はImageクラスのコンストラクタでできるようにした方が良い
+        if reference:
+            return self._detect_reference(image)
 
-        for i in range(1, image.height - 1):
-            for j in range(1, image.width - 1):
-                fx = float(self._ope_x[0][0] * image[i - 1, j - 1] + self._ope_x[0][1] * image[i - 1, j] + self._ope_x[0][2] * image[i - 1, j + 1]
-                           + self._ope_x[1][0] * image[i, j - 1] + self._ope_x[1][1] * image[i, j] + self._ope_x[1][2] * image[i, j + 1]
-                           + self._ope_x[2][0] * image[i + 1, j - 1] + self._ope_x[2][1] * image[i + 1, j] + self._ope_x[2][2] * image[i + 1, j + 1])
-                fy = float(self._ope_y[0][0] * image[i - 1, j - 1] + self._ope_y[0][1] * image[i - 1, j] + self._ope_y[0][2] * image[i - 1, j + 1]
-                           + self._ope_y[1][0] * image[i, j - 1] + self._ope_y[1][1] * image[i, j] + self._ope_y[1][2] * image[i, j + 1]
-                           + self._ope_y[2][0] * image[i + 1, j - 1] + self._ope_y[2][1] * image[i + 1, j] + self._ope_y[2][2] * image[i + 1, j + 1])
-                strength = self._amplifier * math.sqrt(fx * fx + fy * fy)
+        return type(image).from_array(self._detect_fused(image[:, :], rgb=image[:, :].ndim == 3))
+
+    def _strength(self, array):
+        """Computes the edge strength inside the border of the image data.
+
+        Args:
+            array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are greater than 2 * HALO.
+
+        Returns:
+            numpy.ndarray: Returns the edge strength before it is saturated. ...x(H - 2 * HALO)x(W - 2 * HALO) matrix of float32.
+        """
+        fx, fy = self._gradient(array)
+
+        return np.float32(self._amplifier) * np.sqrt(fx * fx + fy * fy)
+
+    def _gradient(self, array):
+        """Computes the gradient inside the border of the image data.
+
+        Args:
+            array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are greater than 2 * HALO.
+
+        Returns:
+            tuple(numpy.ndarray, numpy.ndarray): Returns the derivatives in the x and the y directions.
+                                                 ...x(H - 2 * HALO)x(W - 2 * HALO) matrices of float32.
+        """
+        fx, fy = _filter(array, [self._ope_x, self._ope_y]).astype(np.float32, copy=False)
+
+        return fx, fy
 
-                pixel_value = int(strength)
-                output_image[i, j] = pixel_value if MAX_PIXEL_VALUE < pixel_value else MAX_PIXEL_VALUE
+    def _detect_reference(self, image):
+        """Detects the edge of the object in the image pixel by pixel.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image with the edge detected.
+        """
+        max_value = ip.max_pixel_value(image.dtype)
+        output_image = type(image).full_like(image, max_value)
+        halo = self.HALO
+
+        for i in range(halo, image.height - halo):
+            for j in range(halo, image.width - halo):
+                fx = 0.0
+                fy = 0.0
+                for k in range(0, 2 * halo + 1):
+                    for l in range(0, 2 * halo + 1):
+                        pixel = image[i + k - halo, j + l - halo].item()
+                        fx += self._ope_x[k][l] * pixel
+                        fy += self._ope_y[k][l] * pixel
+                fx = np.float32(fx)
+                fy = np.float32(fy)
+                strength = np.float32(self._amplifier) * np.sqrt(fx * fx + fy * fy)
+
+                pixel_value = strength if isinstance(max_value, float) else int(strength)
+                output_image[i, j] = pixel_value if pixel_value < max_value else max_value
 
         return output_image
 
@@ -136,25 +742,176 @@ class RobertsEdgeDetector(GradientEdgeDetector):
 class SobelEdgeDetector(GradientEdgeDetector):
     """The gradient Sobel edge detection class.
 
+    The NxN operators are the outer products of the binomial smoothing and the binomial derivative,
+    which approximate the derivative of Gaussian and suppress the noise more as N increases.
+    The 3x3 operators are the well-known Sobel operators. The operators are separable, so they run as two 1D passes.
+
     Attributes:
-        _sobel_ope_x (list[list[int]]): The derivative operator in the x direction. 3x3 matrix.
-        _sobel_ope_y (list[list[int]]): The derivative operator in the y direction. 3x3 matrix.
+        _sobel_ope_x (list[list[int]]): The derivative operator in the x direction. NxN matrix.
+        _sobel_ope_y (list[list[int]]): The derivative operator in the y direction. NxN matrix.
     """
 
-    def __init__(self, amplifier=4.0):
+    def __init__(self, amplifier=4.0, size=3):
         """Initializes SobelEdgeDetector class: The SobelEdgeDetector class constructor.
 
         Args:
             amplifier (double, optional):　The tone adjustment factor. 0.0 < amplifier.
+                                            The gain of the operators is 4 ** (size - 3) times that of the 3x3 operators,
+                                            so decrease the amplifier accordingly for the larger sizes.
+            size (int, optional): The size of the operators. Odd number. 3 <= size.
+
+        Raises:
+            ValueError: If the size is not an odd number of 3 or more.
         """
-        self._sobel_ope_x = [[-1, 0, 1],
-                             [-2, 0, 2],
-                             [-1, 0, 1]]
-        self._sobel_ope_y = [[-1, -2, -1],
-                             [0, 0, 0],
-                             [1, 2, 1]]
+        if size < 3 or size % 2 == 0:
+            raise ValueError('size must be an odd number of 3 or more: {}'.format(size))
+        smoothing = _binomial(size - 1)
+        derivative = np.convolve(_binomial(size - 3), [-1, 0, 1])
+        self._sobel_ope_x = np.outer(smoothing, derivative).tolist()
+        self._sobel_ope_y = np.outer(derivative, smoothing).tolist()
         super().__init__(self._sobel_ope_x, self._sobel_ope_y, amplifier)
 
+class CannyEdgeDetector(SobelEdgeDetector):
+    """The Canny edge detection class.
+
+    The edge strength and the direction of the gradient are computed by the Sobel operators.
+    The edge is thinned by the non-maximum suppression along the direction quantized to 4 directions,
+    and the pixels between the low and the high thresholds are kept only if they are connected to the pixels above the high threshold.
+    The edge is the maximum pixel value and the others are 0 in the output image.
+    The pixels on the border of the image have no neighbors to suppress the non-maximum with, so they are 0.
+
+    The hysteresis connects the pixels over the whole image, so detect_tiled and detect_parallel detect the whole image at once.
+    The channels of RGB images combined by 'max' or 'l2' result in the union of the edges of the channels.
+
+    Attributes:
+        WHOLE_IMAGE (bool): True, since the hysteresis connects the pixels beyond any strip.
+        DIRECTIONS (tuple(tuple(int, int))): The (y, x) step along the gradient of each quantized direction.
+                                              0 is horizontal, 1 is diagonal down to the right, 2 is vertical and 3 is diagonal down to the left.
+        _low (double): The low threshold as the ratio to the maximum pixel value.
+        _high (double): The high threshold as the ratio to the maximum pixel value.
+    """
+
+    WHOLE_IMAGE = True
+    DIRECTIONS = ((0, 1), (1, 1), (1, 0), (1, -1))
+
+    def __init__(self, amplifier=0.25, size=3, low=0.1, high=0.2):
+        """Initializes CannyEdgeDetector class: The CannyEdgeDetector class constructor.
+
+        Args:
+            amplifier (double, optional):　The tone adjustment factor of the edge strength compared with the thresholds. 0.0 < amplifier.
+                                            The default is a quarter, with which the strength is about twice the difference of the pixel values
+                                            across the edge for the 3x3 operators. Decrease it for the larger sizes. See SobelEdgeDetector.
+            size (int, optional): The size of the Sobel operators. See SobelEdgeDetector.
+            low (double, optional): The low threshold as the ratio to the maximum pixel value. 0.0 <= low <= high.
+            high (double, optional): The high threshold as the ratio to the maximum pixel value.
+
+        Raises:
+            ValueError: If low is greater than high.
+        """
+        if high < low:
+            raise ValueError('low must be less than or equal to high: {} > {}'.format(low, high))
+        super().__init__(amplifier, size)
+        self._low = low
+        self._high = high
+
+    @profile
+    def detect(self, image, direction=False):
+        """Detects the edge of the object in the image.
+
+        The channels of RGB images are combined by channel_combination, and the output image is grayscale.
+        The pixels on the border of the image are 0.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            direction (bool, optional): Also returns the direction image.
+                                        Each pixel is the index of the quantized direction of the gradient in DIRECTIONS, and 0 on the border.
+                                        The direction of RGB images is detected from the luminance, while the edge is combined by channel_combination.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image with the edge detected.
+            If direction is True, returns the tuple of the output image and the direction image.
+        """
+        array = image[:, :]
+        if not direction:
+            return type(image).from_array(self._detect_fused(array, rgb=array.ndim == 3))
+
+        combined_output = None
+        if array.ndim == 3:
+            if self._channel_combination != 'luminance':
+                combined_output = self._detect_fused(array, rgb=True)
+            array = ip.luminance(array)
+        halo = self.HALO
+        output = np.empty_like(array) if combined_output is None else combined_output
+        if combined_output is None:
+            _fill_border(output, self._border(array.dtype), halo)
+        direction_output = np.empty(array.shape, np.uint8)
+        _fill_border(direction_output, 0, halo)
+        if 2 * halo < image.height and 2 * halo < image.width:
+            edge, directions = self._edge(array)
+            if combined_output is None:
+                output[halo:-halo, halo:-halo] = np.where(edge, ip.max_pixel_value(array.dtype), 0)
+            direction_output[halo:-halo, halo:-halo] = directions
+
+        return type(image).from_array(output), type(image).from_array(direction_output)
+
+    def _border(self, dtype):
+        """Gets the value of the pixels on the border of the output image.
+
+        Args:
+            dtype (numpy.dtype): The data type of the output image.
+
+        Returns:
+            int: Returns 0, which means no edge.
+        """
+        return 0
+
+    def _strength(self, array):
+        """Computes the edge inside the border of the image data.
+
+        Args:
+            array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are greater than 2 * HALO.
+
+        Returns:
+            numpy.ndarray: Returns the maximum pixel value on the edge and 0 elsewhere. ...x(H - 2 * HALO)x(W - 2 * HALO) matrix of float32.
+        """
+        edge = self._edge(array)[0]
+
+        return edge.astype(np.float32) * np.float32(ip.max_pixel_value(array.dtype))
+
+    def _edge(self, array):
+        """Detects the thin and connected edge inside the border of the image data.
+
+        Args:
+            array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are greater than 2 * HALO.
+
+        Returns:
+            tuple(numpy.ndarray, numpy.ndarray): Returns the edge as bool and the quantized direction of the gradient as uint8.
+                                                 ...x(H - 2 * HALO)x(W - 2 * HALO) matrices.
+        """
+        fx, fy = self._gradient(array)
+        strength = np.float32(self._amplifier) * np.sqrt(fx * fx + fy * fy)
+
+        abs_fx = np.abs(fx)
+        abs_fy = np.abs(fy)
+        directions = np.where(fx * fy > 0, 1, 3).astype(np.uint8)
+        directions[abs_fy <= np.float32(0.41421356) * abs_fx] = 0
+        directions[abs_fy >= np.float32(2.41421356) * abs_fx] = 2
+        directions[(abs_fx == 0) & (abs_fy == 0)] = 0
+
+        padded = np.pad(strength, [(0, 0)] * (strength.ndim - 2) + [(1, 1), (1, 1)])
+        height, width = strength.shape[-2:]
+        maximum = np.zeros(strength.shape, bool)
+        for index, (dy, dx) in enumerate(self.DIRECTIONS):
+            forward = padded[..., 1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+            backward = padded[..., 1 - dy:1 - dy + height, 1 - dx:1 - dx + width]
+            maximum |= (directions == index) & (backward <= strength) & (forward < strength)
+
+        max_value = ip.max_pixel_value(array.dtype)
+        weak = maximum & (self._low * max_value < strength)
+        strong = weak & (self._high * max_value < strength)
+
+        return _hysteresis(strong, weak), directions
+
 class TemplateMatchingEdgeDetector(EdgeDetector):
     """The template matching edge detection class.
 
@@ -170,6 +927,24 @@ class TemplateMatchingEdgeDetector(EdgeDetector):
         """
         self._amplifier = amplifier
 
+    @property
+    def amplifier(self):
+        """Gets the amplifier.
+
+        Returns:
+            double: Returns the amplifier.
+        """
+        return self._amplifier
+
+    @amplifier.setter
+    def amplifier(self, value):
+        """Sets the amplifier.
+
+        Args:
+            value (double): The value of the amplifier.
+        """
+        self._amplifier = value
+
 class PrewittEdgeDetector(TemplateMatchingEdgeDetector):
     """The Prewitt edge detection class.
 
@@ -209,32 +984,95 @@ class PrewittEdgeDetector(TemplateMatchingEdgeDetector):
                        [-1, -2, 1],
                        [-1, -1, 1]]]
 
-    def detect(self, image):
+    @profile
+    def detect(self, image, reference=False, direction=False):
         """Detects the edge of the object in the image.
 
-        TODO: グレースケール画像だけでなくRGB画像にも対応したい
-        This process can only be done with grayscale images.
+        The 8 templates are stacked and matched over the whole image in a single batched pass.
+        The channels of RGB images are combined by channel_combination, and the output image is grayscale.
+        The pixels on the border of the image are white.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+            reference (bool, optional): Uses the pixel-by-pixel loop instead of the whole-image computation.
+                                        The loop is slow and is kept as the reference for equivalence testing.
+                                        The loop can only be done with grayscale images.
+            direction (bool, optional): Also returns the direction image.
+                                        Each pixel is the index of the best matching template in _opes, and 0 on the border.
+                                        The direction of RGB images is detected from the luminance, while the edge is combined by channel_combination.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image with the edge detected.
+            If direction is True, returns the tuple of the output image and the direction image.
+        """
+        if reference:
+            return self._detect_reference(image, direction)
+
+        array = image[:, :]
+        if not direction:
+            return type(image).from_array(self._detect_fused(array, rgb=array.ndim == 3))
+
+        combined_output = None
+        if array.ndim == 3:
+            if self._channel_combination != 'luminance':
+                combined_output = self._detect_fused(array, rgb=True)
+            array = ip.luminance(array)
+        output = np.empty_like(array) if combined_output is None else combined_output
+        if combined_output is None:
+            _fill_border(output, ip.max_pixel_value(array.dtype))
+        direction_output = np.empty(array.shape, np.uint8)
+        _fill_border(direction_output, 0)
+        if 3 <= image.height and 3 <= image.width:
+            matches = _correlate(array, self._opes)
+            if combined_output is None:
+                _store(np.float32(self._amplifier) * matches.max(axis=0).astype(np.float32, copy=False), output[1:-1, 1:-1])
+            direction_output[1:-1, 1:-1] = matches.argmax(axis=0)
+
+        return type(image).from_array(output), type(image).from_array(direction_output)
+
+    def _strength(self, array):
+        """Computes the edge strength inside the border of the image data.
+
+        Args:
+            array (numpy.ndarray): The grayscale image data. ...xHxW matrix. Both sides are 3 or more.
+
+        Returns:
+            numpy.ndarray: Returns the edge strength before it is saturated. ...x(H - 2)x(W - 2) matrix of float32.
+        """
+        matches = _correlate(array, self._opes)
+
+        return np.float32(self._amplifier) * matches.max(axis=0).astype(np.float32, copy=False)
+
+    def _detect_reference(self, image, direction=False):
+        """Detects the edge of the object in the image pixel by pixel.
 
         Args:
             image (ImageProcessing.Image): The input image.
+            direction (bool, optional): Also returns the direction image.
 
         Returns:
             ImageProcessing.Image: Returns the output image with the edge detected.
+            If direction is True, returns the tuple of the output image and the direction image.
         """
-        MAX_PIXEL_VALUE = 255
-        output_image = image.copy()
-        output_image[:, :] = MAX_PIXEL_VALUE # TODO: 白画像の生成はImageクラスのコンストラクタでできるようにした方が良い
+        max_value = ip.max_pixel_value(image.dtype)
+        output_image = type(image).full_like(image, max_value)
+        direction_image = type(image).full_like(image, 0, dtype=np.uint8)
 
         for i in range(1, image.height - 1):
             for j in range(1, image.width - 1):
                 match_list = []
                 for oi in range(0, len(self._opes)):
-                    match_list.append(self._opes[oi][0][0] * image[i - 1, j - 1] + self._opes[oi][0][1] * image[i - 1, j] + self._opes[oi][0][2] * image[i - 1, j + 1]
-                                      + self._opes[oi][1][0] * image[i, j - 1] + self._opes[oi][1][1] * image[i, j] + self._opes[oi][1][2] * image[i, j + 1]
-                                      + self._opes[oi][2][0] * image[i + 1, j - 1] + self._opes[oi][2][1] * image[i + 1, j] + self._opes[oi][2][2] * image[i + 1, j + 1])
-                mathc = float(self._amplifier * max(match_list))
+                    match = 0
+                    for k in range(0, 3):
+                        for l in range(0, 3):
+                            match += self._opes[oi][k][l] * image[i + k - 1, j + l - 1].item()
+                    match_list.append(match)
+                mathc = np.float32(self._amplifier) * np.float32(max(match_list))
 
-                pixel_value = int(mathc)
-                output_image[i, j] = pixel_value if MAX_PIXEL_VALUE < pixel_value else MAX_PIXEL_VALUE
+                pixel_value = mathc if isinstance(max_value, float) else int(mathc)
+                output_image[i, j] = min(max(pixel_value, 0), max_value)
+                direction_image[i, j] = match_list.index(max(match_list))
 
+        if direction:
+            return output_image, direction_image
         return output_image
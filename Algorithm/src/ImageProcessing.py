@@ -1,11 +1,390 @@
 from PIL import Image as im
 import numpy as np
+import os
+import weakref
+try:
+    from . import Bmp as bmp
+    from .Profiler import profile
+except ImportError:
+    import Bmp as bmp
+    from Profiler import profile
+
+DTYPES = (np.uint8, np.uint16, np.float32)
+"""tuple(numpy.dtype): The supported data types of the pixels.
+
+uint8 and uint16 images range from 0 to the maximum of the type. float32 images range from 0.0 to 1.0.
+"""
+
+def max_pixel_value(dtype):
+    """Gets the maximum pixel value of the data type.
+
+    Args:
+        dtype (numpy.dtype): The data type of the pixels.
+
+    Returns:
+        int or float: Returns 255 for uint8, 65535 for uint16 and 1.0 for float32.
+
+    Raises:
+        ValueError: If the data type is not supported.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in DTYPES:
+        raise ValueError('unsupported data type: {}'.format(dtype))
+    if dtype.kind == 'f':
+        return 1.0
+    return int(np.iinfo(dtype).max)
+
+def luminance(array):
+    """Converts the RGB image data to the luminance.
+
+    The luminance is ITU-R 601-2 luma: L = R * 299/1000 + G * 587/1000 + B * 114/1000.
+    The 8-bit image data is converted with the same integer arithmetic as PIL, so the result is the same as opening the image file in grayscale.
+    It is converted in blocks of rows, so the 32-bit intermediate values stay in the cache.
+
+    Args:
+        array (numpy.ndarray): The RGB image data. ...xHxWx3 matrix.
+
+    Returns:
+        numpy.ndarray: Returns the luminance. ...xHxW matrix of the same data type.
+    """
+    if array.dtype == np.uint8:
+        output = np.empty(array.shape[:-1], np.uint8)
+        if output.size == 0:
+            return output
+        rows = max(1, LUT_BLOCK_PIXELS // max(1, output[0].size))
+        value = np.empty((min(rows, len(output)),) + output.shape[1:], np.uint32)
+        term = np.empty_like(value)
+        for top in range(0, len(output), rows):
+            block = array[top:top + rows]
+            block_value = value[:len(block)]
+            block_term = term[:len(block)]
+            np.multiply(block[..., 0], np.uint32(19595), out=block_value)
+            np.multiply(block[..., 1], np.uint32(38470), out=block_term)
+            block_value += block_term
+            np.multiply(block[..., 2], np.uint32(7471), out=block_term)
+            block_value += block_term
+            block_value += np.uint32(0x8000)
+            block_value >>= 16
+            output[top:top + rows] = block_value
+        return output
+
+    value = array[..., 0] * np.float32(0.299)
+    value += array[..., 1] * np.float32(0.587)
+    value += array[..., 2] * np.float32(0.114)
+    if array.dtype.kind != 'f':
+        value = np.clip(np.rint(value), 0, max_pixel_value(array.dtype))
+    return value.astype(array.dtype)
+
+def threshold_lut(dtype, threshold, high=None, low=0):
+    """Creates the lookup table of threshold processing.
+
+    Args:
+        dtype (numpy.dtype): The data type of the pixels. uint8 or uint16.
+        threshold (int): The threshold.
+        high (int, optional): This is set if the pixcel value is greater than the threshold.
+                              The maximum pixel value of the data type if None.
+        low (int, optional): This is set if the pixcel value is less than or equal to the threshold.
+
+    Returns:
+        numpy.ndarray: Returns the lookup table indexed by the pixel value.
+    """
+    if high is None:
+        high = max_pixel_value(dtype)
+
+    return np.where(np.arange(max_pixel_value(dtype) + 1) <= threshold, low, high).astype(dtype)
+
+def gamma_lut(dtype, gamma):
+    """Creates the lookup table of gamma correction.
+
+    Args:
+        dtype (numpy.dtype): The data type of the pixels. uint8 or uint16.
+        gamma (float): The gamma. The pixel value v is converted to max * (v / max) ** (1 / gamma). 0.0 < gamma.
+
+    Returns:
+        numpy.ndarray: Returns the lookup table indexed by the pixel value.
+    """
+    return PointOperations().add_gamma(gamma).lut(dtype)
+
+def stretch_lut(dtype, low, high):
+    """Creates the lookup table of contrast stretching.
+
+    Args:
+        dtype (numpy.dtype): The data type of the pixels. uint8 or uint16.
+        low (int): The pixel value converted to 0. The pixel values less than this are also converted to 0.
+        high (int): The pixel value converted to the maximum. The pixel values greater than this are also converted to the maximum.
+
+    Returns:
+        numpy.ndarray: Returns the lookup table indexed by the pixel value.
+    """
+    return PointOperations().add_stretch(low, high).lut(dtype)
+
+def invert_lut(dtype):
+    """Creates the lookup table of inversion.
+
+    Args:
+        dtype (numpy.dtype): The data type of the pixels. uint8 or uint16.
+
+    Returns:
+        numpy.ndarray: Returns the lookup table indexed by the pixel value.
+    """
+    return PointOperations().add_invert().lut(dtype)
+
+class PointOperations:
+    """The chain of the point operations.
+
+    The operations are only recorded when they are added.
+    For uint8 and uint16 images, the chain is composed into one 256-entry or 65536-entry lookup table,
+    so any number of the operations costs a single pass over the image data.
+    Each operation is rounded to the data type before the next one, so the result is the same as applying them one by one.
+    For float32 images, the operations are applied one by one.
+
+    Attributes:
+        _operations (list[tuple(string, tuple)]): The operations. Each operation is (kind, arguments).
+    """
+
+    def __init__(self):
+        """Initializes PointOperations class: The PointOperations class constructor.
+        """
+        self._operations = []
+
+    def __len__(self):
+        """Gets the number of the operations.
+
+        Returns:
+            int: Returns the number of the operations.
+        """
+        return len(self._operations)
+
+    def _add(self, kind, *arguments):
+        """Adds the operation.
+
+        Args:
+            kind (string): The kind of the operation such as 'gamma'.
+            *arguments: The arguments of the operation.
+
+        Returns:
+            PointOperations: Returns this chain.
+        """
+        self._operations.append((kind, arguments))
+
+        return self
+
+    def add_gamma(self, gamma):
+        """Adds gamma correction.
+
+        Args:
+            gamma (float): The gamma. See gamma_lut.
+
+        Returns:
+            PointOperations: Returns this chain.
+
+        Raises:
+            ValueError: If the gamma is not positive.
+        """
+        if gamma <= 0:
+            raise ValueError('gamma must be positive: {}'.format(gamma))
+
+        return self._add('gamma', gamma)
+
+    def add_stretch(self, low, high):
+        """Adds contrast stretching.
+
+        Args:
+            low (int or float): The pixel value converted to 0. See stretch_lut.
+            high (int or float): The pixel value converted to the maximum.
+
+        Returns:
+            PointOperations: Returns this chain.
+
+        Raises:
+            ValueError: If high is not greater than low.
+        """
+        if high <= low:
+            raise ValueError('high must be greater than low: {} <= {}'.format(high, low))
+
+        return self._add('stretch', low, high)
+
+    def add_invert(self):
+        """Adds inversion.
+
+        Returns:
+            PointOperations: Returns this chain.
+        """
+        return self._add('invert')
+
+    def add_threshold(self, threshold, high=None, low=0):
+        """Adds threshold processing.
+
+        Args:
+            threshold (int or float): The threshold. See Image.threshold.
+            high (int or float, optional): This is set if the pixcel value is greater than the threshold.
+                                           The maximum pixel value of the data type if None.
+            low (int or float, optional): This is set if the pixcel value is less than or equal to the threshold.
+
+        Returns:
+            PointOperations: Returns this chain.
+        """
+        return self._add('threshold', threshold, high, low)
+
+    def add_operations(self, operations):
+        """Adds all the operations of another chain.
+
+        Args:
+            operations (PointOperations): The chain.
+
+        Returns:
+            PointOperations: Returns this chain.
+        """
+        for kind, arguments in operations._operations:
+            self._add(kind, *arguments)
+
+        return self
+
+    @staticmethod
+    def _evaluate(kind, arguments, values, dtype):
+        """Evaluates the operation.
+
+        Args:
+            kind (string): The kind of the operation.
+            arguments (tuple): The arguments of the operation.
+            values (numpy.ndarray): The pixel values.
+            dtype (numpy.dtype): The data type of the pixels.
+
+        Returns:
+            numpy.ndarray: Returns the converted pixel values in the data type.
+        """
+        max_value = max_pixel_value(dtype)
+        if kind == 'threshold':
+            threshold, high, low = arguments
+            if high is None:
+                high = max_value
+            return np.where(values <= threshold, low, high).astype(dtype)
+
+        values = values.astype(np.float64)
+        if kind == 'gamma':
+            values = max_value * np.power(values / max_value, 1.0 / arguments[0])
+        elif kind == 'stretch':
+            low, high = arguments
+            values = (values - low) * (max_value / (high - low))
+        else:
+            values = max_value - values
+
+        if np.dtype(dtype).kind != 'f':
+            values = np.rint(values)
+        return np.clip(values, 0, max_value).astype(dtype)
+
+    def lut(self, dtype):
+        """Gets the lookup table composed of the operations.
+
+        The lookup table is composed in O(the number of the operations * the number of the entries), which is independent of the image size.
+
+        Args:
+            dtype (numpy.dtype): The data type of the pixels. uint8 or uint16.
+
+        Returns:
+            numpy.ndarray: Returns the lookup table indexed by the pixel value.
+        """
+        lut = np.arange(max_pixel_value(dtype) + 1).astype(dtype)
+        for kind, arguments in self._operations:
+            lut = self._evaluate(kind, arguments, lut, dtype)
+
+        return lut
+
+    def apply(self, array, out=None):
+        """Applies the operations to the image data.
+
+        Args:
+            array (numpy.ndarray): The image data.
+            out (numpy.ndarray, optional): The array to write the result to. It has the same shape as the image data.
+
+        Returns:
+            numpy.ndarray: Returns the converted image data.
+        """
+        if array.dtype.kind != 'f':
+            lut = self.lut(array.dtype)
+            if out is not None and out.dtype != lut.dtype:
+                lut = lut.astype(out.dtype)
+            return apply_lut(lut, array, out)
+
+        for kind, arguments in self._operations:
+            array = self._evaluate(kind, arguments, array, array.dtype)
+        if out is None:
+            return array.copy() if len(self._operations) == 0 else array
+        out[...] = array
+
+        return out
+
+def downsample(array):
+    """Downsamples the image data to half by averaging each 2x2 area.
+
+    The last row and column of the image data of odd size are dropped.
+    The integer image data is averaged with rounding in integer arithmetic.
+
+    Args:
+        array (numpy.ndarray): The image data. HxW matrix, or HxWx3 for RGB images. Both sides are 2 or more.
+
+    Returns:
+        numpy.ndarray: Returns the downsampled image data. (H // 2)x(W // 2) matrix of the same data type.
+    """
+    height = array.shape[0] // 2 * 2
+    width = array.shape[1] // 2 * 2
+    if array.dtype.kind == 'f':
+        value = array[0:height:2, 0:width:2] + array[1:height:2, 0:width:2]
+        value += array[0:height:2, 1:width:2]
+        value += array[1:height:2, 1:width:2]
+        value *= array.dtype.type(0.25)
+        return value
+
+    value = array[0:height:2, 0:width:2].astype(np.uint32)
+    value += array[1:height:2, 0:width:2]
+    value += array[0:height:2, 1:width:2]
+    value += array[1:height:2, 1:width:2]
+    value += np.uint32(2)
+    value >>= 2
+    return value.astype(array.dtype)
+
+LUT_BLOCK_PIXELS = 1 << 16
+"""int: The number of the pixels processed at once by apply_lut and luminance."""
+
+def apply_lut(lut, array, out=None):
+    """Applies the lookup table to the image data.
+
+    np.take converts the whole index array to intp, which is 8 bytes per pixel,
+    so the image data is looked up in blocks of rows to keep the conversion buffer small.
+
+    Args:
+        lut (numpy.ndarray): The lookup table indexed by the pixel value.
+        array (numpy.ndarray): The integer image data.
+        out (numpy.ndarray, optional): The array to write the result to. It has the same shape as the image data and the data type of the lookup table.
+
+    Returns:
+        numpy.ndarray: Returns the looked up image data.
+    """
+    if out is None:
+        return lut[array]
+
+    rows = max(1, LUT_BLOCK_PIXELS // max(1, array[0].size))
+    for top in range(0, len(array), rows):
+        np.take(lut, array[top:top + rows], out=out[top:top + rows], mode='clip')
+
+    return out
 
 class Image:
     """Image class.
 
     Attributes:
-        _image (numpy.ndarray): The image data.
+        _pixels (numpy.ndarray): The image data. None until decoded if the image file is opened lazily.
+        _source (tuple(string, bool, bool)): The path, grayscale and mmap arguments of the image file opened lazily.
+                                             None if the image data is decoded.
+        _sharers (list[int]): The number of the copy-on-write copies sharing the image data, in a list shared among them.
+                              None if the image data is not shared.
+        _histogram (numpy.ndarray): The cached histogram. None until computed or after the pixels are changed.
+        _integrals (dict[bool, numpy.ndarray]): The cached summed-area tables by whether the pixel values are squared.
+                                                None until computed or after the pixels are changed.
+        _pyramid (list[numpy.ndarray]): The cached image data downsampled from level 1. None until computed or after the pixels are changed.
+        _parent (Image): The image this image is the view of, which is made by crop. None if this image is not a view.
+        _views (weakref.WeakSet[Image]): The live views of this image made by crop. None until the first view is made.
+                                         Writing to this image or any of its views discards the caches of all of them.
         _width (int): The width of the image.
         _height (int): The height of the image.
 
@@ -26,7 +405,11 @@ class Image:
         The side O-z is the RGB array of the pixel specifyed by x and y: [R, G, B]. In case grayscale images, the argument doesn't exist.
     """
 
-    def __init__(self, path='', height=0, width=0, grayscale=False):
+    __slots__ = ('_pixels', '_source', '_sharers', '_histogram', '_integrals', '_pyramid', '_parent', '_views', '_height', '_width', '__weakref__')
+
+    THRESHOLD_METHODS = ('otsu', 'mean', 'percentile')
+
+    def __init__(self, path='', height=0, width=0, grayscale=False, mmap=False, lazy=False, dtype=np.uint8):
         """Initializes Image class: The Image class constructor.
 
         # TODO: pathを指定した場合はheight, widthは無視されるなどの引数のパターンは要説明
@@ -36,22 +419,101 @@ class Image:
             height (int, optional): The height of the image.
             width (int, optional): The width of the image.
             grayscale (bool, optional): Opens the image file in grayscale.
+            mmap (bool, optional): Maps the image file into memory instead of reading it. See open.
+            lazy (bool, optional): Reads only the header of the image file and decodes the image data on the first access. See open.
+            dtype (numpy.dtype, optional): The data type of the pixels of the white image. One of DTYPES.
         """
-        self._image = None
+        self._pixels = None
+        self._source = None
+        self._sharers = None
+        self._histogram = None
+        self._integrals = None
+        self._pyramid = None
+        self._parent = None
+        self._views = None
         self._height = 0
         self._width = 0
 
         if path:
-            self.open(path, grayscale)
+            self.open(path, grayscale, mmap, lazy)
         else:
             if height != 0 and width != 0 and grayscale:
                 # TODO: RGB画像にも対応する
                 # TODO: 黒画像などにも対応する(最後の* 255の部分) → 黒画像の場合には np.zeros((256, 256), np.uint8)
                 # 白画像を作成する
-                self._image = np.ones((height, width), np.uint8) * 255
+                self._image = np.full((height, width), max_pixel_value(dtype), dtype)
                 self._height = self._image.shape[0]
                 self._width = self._image.shape[1]
 
+    @property
+    def _image(self):
+        """Gets the image data.
+
+        The image file opened lazily is decoded here on the first access.
+
+        Returns:
+            numpy.ndarray: Returns the image data.
+        """
+        if self._source is not None:
+            path, grayscale, mmap = self._source
+            self.open(path, grayscale, mmap)
+        return self._pixels
+
+    @_image.setter
+    def _image(self, value):
+        """Sets the image data.
+
+        Args:
+            value (numpy.ndarray): The image data.
+        """
+        self._pixels = value
+        self._source = None
+        self._sharers = None
+        self._histogram = None
+        self._integrals = None
+        self._pyramid = None
+        self._parent = None
+        self._views = None
+
+    def _detach(self):
+        """Prepares the image data for writing to it.
+
+        The copy-on-write copy makes the image data its own, and the cached histogram, summed-area tables and pyramid are discarded.
+        The views made by crop share the image data, so the caches of the image they are made from and all its views are discarded too.
+        """
+        root = self if self._parent is None else self._parent
+        root._clear_caches()
+        if root._views is not None:
+            for view in root._views:
+                view._clear_caches()
+        self._own()
+
+    def _own(self):
+        """Makes the image data its own if it is shared with the copy-on-write copies.
+
+        The caches are kept, since the pixels do not change.
+        """
+        if self._sharers is not None:
+            if 1 < self._sharers[0]:
+                self._sharers[0] -= 1
+                self._pixels = self._pixels.copy()
+            self._sharers = None
+
+    def _clear_caches(self):
+        """Discards the cached histogram, summed-area tables and pyramid.
+        """
+        self._histogram = None
+        self._integrals = None
+        self._pyramid = None
+
+    def _has_views(self):
+        """Checks whether the image data is shared with the views made by crop.
+
+        Returns:
+            bool: Returns True if this image is a view or has any live view.
+        """
+        return self._parent is not None or (self._views is not None and 0 < len(self._views))
+
     def __getitem__(self, index):
         """The reference operator getting image data.
 
@@ -78,6 +540,7 @@ class Image:
 
         TODO: return self._image[index] しなくていい？
         """
+        self._detach()
         self._image[index] = value
 
     @property
@@ -92,63 +555,1003 @@ class Image:
         """
         return self._height
 
-    def open(self, path, grayscale=False):
+    @property
+    def dtype(self):
+        """Gets the data type of the pixels.
+        """
+        return self._image.dtype
+
+    @profile
+    def astype(self, dtype):
+        """Converts the data type of the pixels.
+
+        The pixel values are scaled from the range of the current data type to the range of the new one,
+        and rounded and saturated in a single vectorized cast for the integer types.
+
+        Args:
+            dtype (numpy.dtype): The data type of the pixels. One of DTYPES.
+
+        Returns:
+            Image: Returns the converted image. A copy even if the data type is the same.
+        """
+        scale = np.float32(max_pixel_value(dtype)) / np.float32(max_pixel_value(self.dtype))
+        if scale == 1:
+            return Image.from_array(self._image.astype(dtype))
+
+        values = self._image * scale
+        if np.dtype(dtype).kind != 'f':
+            values = np.clip(np.rint(values), 0, max_pixel_value(dtype))
+
+        return Image.from_array(values.astype(dtype))
+
+    @profile
+    def open(self, path, grayscale=False, mmap=False, lazy=False):
         """Opens the image file specifyed by the argument of path.
 
+        The .npy file holds the image data as is.
+        The uncompressed 8-bit grayscale and 24-bit BMP files are read in a single read without decoding. See Bmp.
+        The other files are decoded by PIL.
+
         Args:
             path (string): The path to the image file.
-            grayscale (bool, optional): Opens the image file in grayscale.
+            grayscale (bool, optional): Opens the image file in grayscale. This is ignored for .npy files.
+                                        The 24-bit BMP files are converted to the luminance in a single pass.
+            mmap (bool, optional): Maps the .npy file into memory as read-only instead of reading it.
+                                   The pixels are read from the file only when they are accessed,
+                                   so images larger than memory can be processed strip by strip.
+                                   The BMP files read by Bmp are mapped copy-on-write. The file stays open while the image data is alive.
+                                   This is ignored for the other files.
+            lazy (bool, optional): Reads only the header of the image file to get the width and the height.
+                                   The image data is decoded on the first access to it.
         """
-        if grayscale:
+        if lazy:
+            if path.endswith('.npy'):
+                self._height, self._width = np.load(path, mmap_mode='r').shape[:2]
+            else:
+                with im.open(path) as header:
+                    self._width, self._height = header.size
+            self._image = None
+            self._source = (path, grayscale, mmap)
+            return
+
+        array = None
+        if path.lower().endswith('.bmp'):
+            try:
+                array = bmp.read(path, mmap)
+            except ValueError:
+                array = None
+
+        if path.endswith('.npy'):
+            self._image = np.load(path, mmap_mode='r' if mmap else None)
+        elif array is not None:
+            self._image = luminance(array) if grayscale and array.ndim == 3 else array
+        elif grayscale:
             self._image = np.array(im.open(path).convert('L'))
         else:
             self._image = np.array(im.open(path))
         self._height = self._image.shape[0]
         self._width = self._image.shape[1]
 
+    @classmethod
+    def from_array(cls, array):
+        """Creates the Image object from the image data.
+
+        The image data is not copied.
+
+        Args:
+            array (numpy.ndarray): The image data. HxW matrix for grayscale images, HxWx3 matrix for RGB images.
+
+        Returns:
+            Image: Returns the Image object that holds the image data.
+        """
+        image = cls()
+        image._image = array
+        image._height = array.shape[0]
+        image._width = array.shape[1]
+
+        return image
+
+    @classmethod
+    def open_directory(cls, path, grayscale=False):
+        """Opens all the image files in the directory.
+
+        Args:
+            path (string): The path to the directory.
+            grayscale (bool, optional): Opens the image files in grayscale.
+
+        Returns:
+            list[Image]: Returns the images in the order of the file names.
+        """
+        names = sorted(name for name in os.listdir(path) if os.path.isfile(os.path.join(path, name)))
+
+        return [cls(os.path.join(path, name), grayscale=grayscale) for name in names]
+
+    @staticmethod
+    def group(images):
+        """Groups the images by shape.
+
+        Args:
+            images (list[Image]): The images.
+
+        Returns:
+            list[list[int]]: Returns the indices of the images in each group. The images in each group have the same shape and data type.
+        """
+        groups = {}
+        for index, image in enumerate(images):
+            groups.setdefault((image._image.shape, image._image.dtype), []).append(index)
+
+        return list(groups.values())
+
+    @staticmethod
+    def stack(images):
+        """Groups the images by shape and stacks each group into one array.
+
+        Args:
+            images (list[Image]): The images.
+
+        Returns:
+            list[tuple(list[int], numpy.ndarray)]: Returns the indices of the images in each group and the stacked image data.
+                                                  The stacked image data is NxHxW matrix for grayscale images, NxHxWx3 matrix for RGB images.
+        """
+        return [(indices, np.stack([images[index]._image for index in indices])) for indices in Image.group(images)]
+
+    @classmethod
+    def threshold_batch(cls, images, threshold, high=None, low=0, percentile=50.0, binary=False):
+        """Executes threshold processing on many images at once.
+
+        The images of the same shape are stacked and converted in a single pass.
+        If the threshold is selected automatically, it is selected for each image from its histogram.
+
+        Args:
+            images (list[Image] or string): The images, or the path to the directory of the image files.
+                                            The image files are opened in grayscale.
+            threshold (int or string): The threshold. 0 <= threshold <= 255.
+                                       One of THRESHOLD_METHODS selects the threshold automatically. See auto_threshold.
+            high (int, optional): This is set if the pixcel value is greater than the threshold. 0 <= high <= 255.
+                                  The maximum pixel value of the data type if None.
+            low (int, optional): This is set if the pixcel value is less than or equal to the threshold. 0 <= low <= 255.
+            percentile (float, optional): The percentile if the threshold is 'percentile'.
+            binary (bool, optional): Returns BinaryImage for each image. See threshold.
+
+        Returns:
+            list[Image or BinaryImage]: Returns the images executed threshold processing in the order of the input images.
+                                        The output images of the same shape are views of one array.
+        """
+        if isinstance(images, str):
+            images = cls.open_directory(images, grayscale=True)
+        if binary:
+            return [image.threshold(threshold, high, low, percentile=percentile, binary=True) for image in images]
+
+        output_images = [None] * len(images)
+        for indices, array in cls.stack(images):
+            if isinstance(threshold, str):
+                for index, output_array in zip(indices, array):
+                    output_images[index] = cls.from_array(output_array)
+                    output_images[index].threshold(images[index].auto_threshold(threshold, percentile), high, low, inplace=True)
+                continue
+
+            stacked_image = cls.from_array(array)
+            stacked_image.threshold(threshold, high, low, inplace=True)
+            for index, output_array in zip(indices, array):
+                output_images[index] = cls.from_array(output_array)
+
+        return output_images
+
+    @classmethod
+    def memmap(cls, path, height, width, dtype=np.uint8):
+        """Creates the grayscale image mapped to the .npy file.
+
+        The pixels are written to the file incrementally, so the image can be larger than memory.
+
+        Args:
+            path (string): The path to the .npy file to create.
+            height (int): The height of the image.
+            width (int): The width of the image.
+            dtype (numpy.dtype, optional): The data type of the pixels.
+
+        Returns:
+            Image: Returns the Image object mapped to the file.
+        """
+        return cls.from_array(np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(height, width)))
+
+    def strips(self, strip_height, halo=0):
+        """Splits the image into horizontal strips.
+
+        The strips are views of this image, so no image data is copied or read in advance.
+
+        Args:
+            strip_height (int): The number of the rows of each strip, not including the halo. 0 < strip_height.
+            halo (int, optional): The number of the extra rows above and below each strip.
+                                  The neighborhood operators need them to process the rows on the edge of the strip.
+
+        Yields:
+            tuple(int, int, Image): The first row and the row after the last row of the strip, and the strip with the halo.
+                                    The strip starts at the row max(0, top - halo).
+        """
+        for top in range(0, self._height, strip_height):
+            bottom = min(top + strip_height, self._height)
+            yield top, bottom, Image.from_array(self._image[max(0, top - halo):min(bottom + halo, self._height)])
+
+    @profile
     def save(self, path):
         """Saves the image in the specified path.
 
+        The image data is saved as is if the extension is .npy.
+        The 8-bit grayscale and RGB images are written to the .bmp file directly without PIL. See Bmp.
+
         Args:
             path (string): The path to save the image.
         """
-        im.fromarray(self._image).save(path)
+        if path.endswith('.npy'):
+            np.save(path, self._image)
+        elif path.lower().endswith('.bmp') and self.dtype == np.uint8 and (self._image.ndim == 2 or self._image.shape[2] == 3):
+            bmp.write(path, self._image)
+        else:
+            im.fromarray(self._image).save(path)
 
-    def copy(self):
+    @profile
+    def copy(self, copy_on_write=False):
         """Copies the Image object.
 
         This copy is a deep copy.
 
+        Args:
+            copy_on_write (bool, optional): Shares the image data until either image is written through __setitem__ or threshold.
+                                            The image data is copied only then.
+                                            The image data is copied at once if this image is a view or has any live view made by crop,
+                                            since the views write to the image data without detaching it.
+
         Returns:
             Image: Returns a deep copy of this Image object.
         """
         copy = Image()
-        copy._image = self._image.copy()
+        if copy_on_write and not self._has_views():
+            copy._image = self._image
+            if self._sharers is None:
+                self._sharers = [1]
+            self._sharers[0] += 1
+            copy._sharers = self._sharers
+        else:
+            copy._image = self._image.copy()
         copy._height = self._height
         copy._width = self._width
 
         return copy
 
-    def threshold(self, threshold, high=255, low=0):
+    def crop(self, y, x, height, width):
+        """Gets the part of the image as a view.
+
+        The view shares the image data with this image, so writing to either image changes both.
+        The caches of both images are discarded when either image is written through __setitem__ or the methods of this class.
+
+        Args:
+            y (int): The y coordinate of the top-left corner.
+            x (int): The x coordinate of the top-left corner.
+            height (int): The height of the part.
+            width (int): The width of the part.
+
+        Returns:
+            Image: Returns the view of the part of the image.
+        """
+        self._own()
+        root = self if self._parent is None else self._parent
+        view = Image.from_array(self._image[y:y + height, x:x + width])
+        view._parent = root
+        if root._views is None:
+            root._views = weakref.WeakSet()
+        root._views.add(view)
+
+        return view
+
+    @classmethod
+    def empty_like(cls, image, dtype=None):
+        """Creates the image of the same shape as the image without initializing the pixels.
+
+        The image data of the argument is not copied or read.
+
+        Args:
+            image (Image): The image that gives the shape.
+            dtype (numpy.dtype, optional): The data type of the pixels. The same as the image if None.
+
+        Returns:
+            Image: Returns the image with uninitialized pixels.
+        """
+        return cls.from_array(np.empty_like(image._image, dtype=dtype))
+
+    @classmethod
+    def full_like(cls, image, value, dtype=None):
+        """Creates the image of the same shape as the image with all the pixels set to the value.
+
+        The image data of the argument is not copied or read.
+
+        Args:
+            image (Image): The image that gives the shape.
+            value (int): The value of the pixels.
+            dtype (numpy.dtype, optional): The data type of the pixels. The same as the image if None.
+
+        Returns:
+            Image: Returns the image filled with the value.
+        """
+        return cls.from_array(np.full_like(image._image, value, dtype=dtype))
+
+    @profile
+    def histogram(self):
+        """Gets the histogram of the pixel values.
+
+        The histogram is counted in a single pass and cached until the pixels are changed
+        through __setitem__ or the methods of this class.
+
+        Returns:
+            numpy.ndarray: Returns the number of the pixels by value. 256 entries for uint8, 65536 entries for uint16.
+
+        Raises:
+            ValueError: If the pixels are not integer.
+        """
+        if self._histogram is None:
+            if self.dtype not in (np.uint8, np.uint16):
+                raise ValueError('the histogram requires uint8 or uint16 pixels: {}'.format(self.dtype))
+            self._histogram = np.bincount(self._image.ravel(), minlength=max_pixel_value(self.dtype) + 1)
+
+        return self._histogram
+
+    def auto_threshold(self, method='otsu', percentile=50.0):
+        """Selects the threshold from the histogram.
+
+        The selection costs O(the number of the histogram entries) in addition to the histogram.
+
+        Args:
+            method (string, optional): One of THRESHOLD_METHODS.
+                                       'otsu' maximizes the between-class variance of the pixels below and above the threshold.
+                                       'mean' is the mean of the pixel values.
+                                       'percentile' is the value below which the percentile of the pixels fall.
+            percentile (float, optional): The percentile for 'percentile'. 0.0 <= percentile <= 100.0.
+
+        Returns:
+            int: Returns the threshold.
+
+        Raises:
+            ValueError: If the method is not one of THRESHOLD_METHODS.
+        """
+        histogram = self.histogram()
+        total = histogram.sum()
+        if total == 0:
+            return 0
+        values = np.arange(len(histogram), dtype=np.float64)
+
+        if method == 'otsu':
+            omega = np.cumsum(histogram) / total
+            mu = np.cumsum(histogram * values) / total
+            with np.errstate(divide='ignore', invalid='ignore'):
+                variance = np.square(mu[-1] * omega - mu) / (omega * (1.0 - omega))
+            return int(np.argmax(np.nan_to_num(variance, nan=0.0, posinf=0.0)))
+        if method == 'mean':
+            return int(np.dot(histogram, values) / total)
+        if method == 'percentile':
+            return int(np.searchsorted(np.cumsum(histogram), total * percentile / 100.0))
+        raise ValueError('method must be one of {}: {}'.format(self.THRESHOLD_METHODS, method))
+
+    @profile
+    def pyramid_level(self, level):
+        """Gets the level of the image pyramid.
+
+        Each level is downsampled from the previous level by averaging each 2x2 area, so the level k has 1/4^k of the pixels.
+        The levels are built lazily and cached until the pixels are changed through __setitem__ or the methods of this class.
+
+        Args:
+            level (int): The level. 0 is this image. 0 <= level.
+
+        Returns:
+            Image: Returns the copy-on-write copy of the level, or this image if the level is 0.
+
+        Raises:
+            ValueError: If the level is negative, or the image is too small for the level.
+        """
+        if level < 0:
+            raise ValueError('level must not be negative: {}'.format(level))
+        if level == 0:
+            return self
+
+        image = self._image
+        if self._pyramid is None:
+            self._pyramid = []
+        while len(self._pyramid) < level:
+            array = self._pyramid[-1] if self._pyramid else image
+            if array.shape[0] < 2 or array.shape[1] < 2:
+                raise ValueError('the image is too small for level {}: {}'.format(level, image.shape))
+            self._pyramid.append(downsample(array))
+
+        return Image.from_array(self._pyramid[level - 1]).copy(copy_on_write=True)
+
+    def integral(self, squared=False):
+        """Gets the summed-area table.
+
+        The entry (y, x) is the sum of the pixel values above and to the left of the pixel (y, x), excluding the pixel itself,
+        so the sum of any rectangle is obtained from the four entries at its corners.
+        The table is built in a single pass and cached until the pixels are changed through __setitem__ or the methods of this class.
+
+        Args:
+            squared (bool, optional): Sums the squared pixel values instead.
+
+        Returns:
+            numpy.ndarray: Returns the summed-area table. (H+1)x(W+1) matrix, or (H+1)x(W+1)x3 for RGB images.
+                           int64 for uint8 and uint16 images, float64 for float32 images.
+        """
+        if self._integrals is None or squared not in self._integrals:
+            dtype = np.float64 if self.dtype.kind == 'f' else np.int64
+            values = self._image.astype(dtype)
+            if squared:
+                values *= values
+            table = np.zeros((values.shape[0] + 1, values.shape[1] + 1) + values.shape[2:], dtype=dtype)
+            np.cumsum(values, axis=0, out=table[1:, 1:])
+            np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+            if self._integrals is None:
+                self._integrals = {}
+            self._integrals[squared] = table
+
+        return self._integrals[squared]
+
+    def _box_sums(self, size, squared=False):
+        """Sums the pixel values in the window around each pixel by the summed-area table.
+
+        The window is clipped at the borders of the image.
+
+        Args:
+            size (int or tuple(int, int)): The height and width of the window. Odd numbers.
+            squared (bool, optional): Sums the squared pixel values instead.
+
+        Returns:
+            tuple(numpy.ndarray, numpy.ndarray): Returns the sums in float64 and the numbers of the pixels in the windows.
+
+        Raises:
+            ValueError: If the size of the window is not a positive odd number.
+        """
+        size_y, size_x = (size, size) if np.isscalar(size) else size
+        if size_y < 1 or size_x < 1 or size_y % 2 == 0 or size_x % 2 == 0:
+            raise ValueError('size must be positive odd numbers: {}'.format(size))
+
+        table = self.integral(squared)
+        y = np.arange(self._image.shape[0])
+        x = np.arange(self._image.shape[1])
+        top = np.maximum(y - size_y // 2, 0)
+        bottom = np.minimum(y + size_y // 2 + 1, len(y))
+        left = np.maximum(x - size_x // 2, 0)
+        right = np.minimum(x + size_x // 2 + 1, len(x))
+
+        sums = table[bottom][:, right] - table[top][:, right] - table[bottom][:, left] + table[top][:, left]
+        counts = np.outer(bottom - top, right - left).reshape(sums.shape[:2] + (1,) * (sums.ndim - 2))
+
+        return sums.astype(np.float64), counts
+
+    def _box_statistics(self, size, variance=False):
+        """Computes the mean and the variance of the pixel values in the window around each pixel.
+
+        Args:
+            size (int or tuple(int, int)): The height and width of the window. See box_mean.
+            variance (bool, optional): Computes the variance too.
+
+        Returns:
+            tuple(numpy.ndarray, numpy.ndarray): Returns the means and the variances in float64. The variances are None unless computed.
+        """
+        sums, counts = self._box_sums(size)
+        mean = sums / counts
+        if not variance:
+            return mean, None
+
+        squared_sums, counts = self._box_sums(size, squared=True)
+        return mean, np.maximum(squared_sums / counts - mean * mean, 0.0)
+
+    def _from_statistics(self, values):
+        """Creates the image of the statistics in the data type of this image.
+
+        Args:
+            values (numpy.ndarray): The statistics in float64.
+
+        Returns:
+            Image: Returns the image.
+        """
+        if self.dtype.kind != 'f':
+            values = np.rint(values)
+        return Image.from_array(np.clip(values, 0, max_pixel_value(self.dtype)).astype(self.dtype))
+
+    @profile
+    def box_mean(self, size):
+        """Executes the box filter.
+
+        The cost per pixel is constant regardless of the size of the window, since the sums are taken from the summed-area table.
+
+        Args:
+            size (int or tuple(int, int)): The height and width of the window. Odd numbers.
+                                           The window is clipped at the borders of the image.
+
+        Returns:
+            Image: Returns the image of the means of the pixel values in the windows.
+        """
+        return self._from_statistics(self._box_statistics(size)[0])
+
+    @profile
+    def box_std(self, size):
+        """Executes the standard deviation filter.
+
+        The variance is the mean of the squared pixel values minus the squared mean,
+        both of which are taken from the summed-area tables at a constant cost per pixel.
+
+        Args:
+            size (int or tuple(int, int)): The height and width of the window. See box_mean.
+
+        Returns:
+            Image: Returns the image of the standard deviations of the pixel values in the windows.
+        """
+        return self._from_statistics(np.sqrt(self._box_statistics(size, variance=True)[1]))
+
+    @profile
+    def adaptive_threshold(self, size, method='mean', offset=0, k=0.2, r=None, high=None, low=0, inplace=False, out=None):
+        """Executes threshold processing by the threshold of the window around each pixel.
+
+        This works on unevenly lit images, for which any single threshold fails.
+        The cost per pixel is constant regardless of the size of the window, since the statistics are taken from the summed-area tables.
+
+        Args:
+            size (int or tuple(int, int)): The height and width of the window. See box_mean.
+            method (string, optional): 'mean' or 'sauvola'.
+                                       'mean' thresholds at the mean of the window minus the offset.
+                                       'sauvola' thresholds at mean * (1 + k * (std / r - 1)) of the window.
+            offset (int or float, optional): The offset subtracted from the mean for 'mean'.
+            k (float, optional): The sensitivity for 'sauvola'.
+            r (int or float, optional): The dynamic range of the standard deviation for 'sauvola'. Half the maximum pixel value if None.
+            high (int, optional): This is set if the pixcel value is greater than the threshold.
+                                  The maximum pixel value of the data type if None.
+            low (int, optional): This is set if the pixcel value is less than or equal to the threshold.
+            inplace (bool, optional): Overwrites this image instead of creating a new image.
+            out (Image, optional): The image to write the result to. It must have the same shape as this image.
+
+        Returns:
+            Image: Returns the image executed threshold processing.
+
+        Raises:
+            ValueError: If the method is neither 'mean' nor 'sauvola', or out does not have the same shape as this image.
+        """
+        if method == 'mean':
+            threshold = self._box_statistics(size)[0] - offset
+        elif method == 'sauvola':
+            if r is None:
+                r = max_pixel_value(self.dtype) / 2
+            mean, variance = self._box_statistics(size, variance=True)
+            threshold = mean * (1.0 + k * (np.sqrt(variance) / r - 1.0))
+        else:
+            raise ValueError("method must be 'mean' or 'sauvola': {}".format(method))
+
+        if inplace:
+            out = self
+        elif out is None:
+            out = Image.empty_like(self)
+        elif out._image.shape != self._image.shape:
+            raise ValueError('out must have the same shape as the image: {} != {}'.format(out._image.shape, self._image.shape))
+        if high is None:
+            high = max_pixel_value(out.dtype)
+
+        result = np.where(self._image <= threshold, low, high).astype(out.dtype)
+        out._detach()
+        out._image[...] = result
+
+        return out
+
+    @profile
+    def threshold(self, threshold, high=None, low=0, inplace=False, out=None, percentile=50.0, binary=False):
         """Executes threshold processing.
 
         This process can only be done with grayscale images.
+        The 8-bit and 16-bit images are converted by a 256-entry or 65536-entry lookup table in a single pass.
+        If binary is set, the result is packed 8 pixels per byte into BinaryImage instead.
 
         Args:
-            threshold (int): The threshold. 0 <= threshold <= 255.
+            threshold (int or string): The threshold. 0 <= threshold <= 255.
+                                       One of THRESHOLD_METHODS selects the threshold automatically. See auto_threshold.
             high (int, optional): This is set if the pixcel value is greater than the threshold. 0 <= high <= 255.
+                                  The maximum pixel value of the data type if None.
             low (int, optional): This is set if the pixcel value is less than or equal to the threshold. 0 <= low <= 255.
+            inplace (bool, optional): Overwrites this image instead of creating a new image.
+            out (Image, optional): The image to write the result to. It must have the same shape as this image.
+                                   Reusing it avoids allocating a new image on every call.
+            percentile (float, optional): The percentile if the threshold is 'percentile'.
+            binary (bool, optional): Returns BinaryImage, which takes 1/8 of the memory of the 8-bit image.
+                                     out must be BinaryImage then, and inplace is not supported.
 
         Returns:
-            Image: Returns the image executed threshold processing.
+            Image or BinaryImage: Returns the image executed threshold processing.
+
+        Raises:
+            ValueError: If out does not have the same shape as this image, or inplace is set with binary.
+        """
+        if isinstance(threshold, str):
+            threshold = self.auto_threshold(threshold, percentile)
+        if binary:
+            return self._threshold_binary(threshold, high, low, inplace, out)
+
+        return self.point(PointOperations().add_threshold(threshold, high, low), inplace, out)
+
+    def _threshold_binary(self, threshold, high, low, inplace, out):
+        """Executes threshold processing into the bit-packed binary image.
+
+        The image is compared and packed in blocks of rows, so the full-size boolean mask is never created.
+
+        Args:
+            threshold (int or float): The threshold.
+            high (int, optional): The pixel value of the set bits. The maximum pixel value of the data type if None.
+            low (int, optional): The pixel value of the cleared bits.
+            inplace (bool): Must be False.
+            out (BinaryImage): The binary image to write the result to. None creates a new one.
+
+        Returns:
+            BinaryImage: Returns the binary image. The bits are set where the pixel value is greater than the threshold.
+
+        Raises:
+            ValueError: If inplace is set, this image is not grayscale, or out does not have the same shape as this image.
+        """
+        if inplace:
+            raise ValueError('inplace is not supported for binary output')
+        if self._image.ndim != 2:
+            raise ValueError('binary output needs a grayscale image: {}'.format(self._image.shape))
+        if out is None:
+            out = BinaryImage(self._height, self._width, high, low, self.dtype)
+        elif (out.height, out.width) != self._image.shape:
+            raise ValueError('out must have the same shape as the image: {} != {}'.format((out.height, out.width), self._image.shape))
+        else:
+            out._set_values(high, low, self.dtype)
+
+        rows = max(1, LUT_BLOCK_PIXELS // max(1, self._width))
+        for top in range(0, self._height, rows):
+            out._bits[top:top + rows] = np.packbits(self._image[top:top + rows] > threshold, axis=1)
+
+        return out
+
+    def point(self, operations, inplace=False, out=None):
+        """Executes the point operations.
+
+        The 8-bit and 16-bit images are converted by the lookup table composed of all the operations in a single pass.
+
+        Args:
+            operations (PointOperations): The point operations.
+            inplace (bool, optional): Overwrites this image instead of creating a new image.
+            out (Image, optional): The image to write the result to. It must have the same shape as this image.
+                                   Reusing it avoids allocating a new image on every call.
+
+        Returns:
+            Image: Returns the image executed the point operations.
+
+        Raises:
+            ValueError: If out does not have the same shape as this image.
+        """
+        if inplace:
+            out = self
+        elif out is None:
+            out = Image.empty_like(self)
+        elif out._image.shape != self._image.shape:
+            raise ValueError('out must have the same shape as the image: {} != {}'.format(out._image.shape, self._image.shape))
+        out._detach()
+
+        operations.apply(self._image, out._image)
+
+        return out
+
+    @profile
+    def gamma(self, gamma, inplace=False, out=None):
+        """Executes gamma correction.
+
+        Args:
+            gamma (float): The gamma. See gamma_lut.
+            inplace (bool, optional): Overwrites this image instead of creating a new image.
+            out (Image, optional): The image to write the result to. See point.
+
+        Returns:
+            Image: Returns the image executed gamma correction.
+        """
+        return self.point(PointOperations().add_gamma(gamma), inplace, out)
+
+    @profile
+    def stretch(self, low=None, high=None, inplace=False, out=None):
+        """Executes contrast stretching.
+
+        Args:
+            low (int or float, optional): The pixel value converted to 0. The minimum pixel value of the image if None.
+            high (int or float, optional): The pixel value converted to the maximum. The maximum pixel value of the image if None.
+                                           The image is only copied if high is not greater than low.
+            inplace (bool, optional): Overwrites this image instead of creating a new image.
+            out (Image, optional): The image to write the result to. See point.
+
+        Returns:
+            Image: Returns the image executed contrast stretching.
+        """
+        if low is None or high is None:
+            if np.dtype(self.dtype).kind == 'f':
+                extent = (self._image.min(), self._image.max())
+            else:
+                values = np.flatnonzero(self.histogram())
+                extent = (values[0], values[-1])
+            low = extent[0] if low is None else low
+            high = extent[1] if high is None else high
+        operations = PointOperations()
+        if low < high:
+            operations.add_stretch(low, high)
+
+        return self.point(operations, inplace, out)
+
+    @profile
+    def invert(self, inplace=False, out=None):
+        """Executes inversion.
+
+        Args:
+            inplace (bool, optional): Overwrites this image instead of creating a new image.
+            out (Image, optional): The image to write the result to. See point.
+
+        Returns:
+            Image: Returns the inverted image.
         """
-        output_image = self.copy()
+        return self.point(PointOperations().add_invert(), inplace, out)
+
+BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1)
+"""numpy.ndarray: The bits of each byte from the most significant bit. 256x8 matrix of 0 and 1."""
+
+BYTE_POPCOUNT = BYTE_BITS.sum(axis=1)
+"""numpy.ndarray: The number of the set bits of each byte."""
+
+class BinaryImage:
+    """Binary image class.
 
-        for i in range(0, self._height):
-            for j in range(0, self._width):
-                if self._image[i, j] <= threshold:
-                    output_image[i, j] = low
-                else:
-                    output_image[i, j] = high
+    The pixels are packed 8 per byte, so the image takes 1/8 of the memory of the 8-bit image.
+    The bits of each row start from the most significant bit of the first byte as in the 1-bit BMP and PNG files,
+    and the unused bits at the end of each row are always 0, so the rows are processed byte by byte without masking.
+    Each bit stands for one of the two pixel values, high for 1 and low for 0, which the image is unpacked to.
 
-        return output_image
+    Attributes:
+        _bits (numpy.ndarray): The packed pixels. Hx((W + 7) // 8) matrix of uint8.
+        _values (numpy.ndarray): The pixel values of the cleared and the set bits: [low, high].
+        _width (int): The width of the image.
+        _height (int): The height of the image.
+    """
+
+    __slots__ = ('_bits', '_values', '_height', '_width')
+
+    def __init__(self, height=0, width=0, high=None, low=0, dtype=np.uint8, path=''):
+        """Initializes BinaryImage class: The BinaryImage class constructor.
+
+        Args:
+            height (int, optional): The height of the image. All the pixels are low.
+            width (int, optional): The width of the image.
+            high (int or float, optional): The pixel value of the set bits. The maximum pixel value of the data type if None.
+            low (int or float, optional): The pixel value of the cleared bits.
+            dtype (numpy.dtype, optional): The data type of the unpacked pixels. One of DTYPES.
+            path (string, optional): The path to the image file. See open. height and width are ignored if this is specified.
+        """
+        self._height = height
+        self._width = width
+        self._bits = np.zeros((height, (width + 7) // 8), np.uint8)
+        self._set_values(high, low, dtype)
+        if path:
+            self.open(path)
+
+    def _set_values(self, high, low, dtype):
+        """Sets the pixel values of the bits.
+
+        Args:
+            high (int or float): The pixel value of the set bits. The maximum pixel value of the data type if None.
+            low (int or float): The pixel value of the cleared bits.
+            dtype (numpy.dtype): The data type of the unpacked pixels.
+        """
+        if high is None:
+            high = max_pixel_value(dtype)
+        self._values = np.array([low, high], dtype)
+
+    @classmethod
+    def from_bits(cls, bits, width, high=None, low=0, dtype=np.uint8):
+        """Creates the BinaryImage object from the packed pixels.
+
+        The packed pixels are not copied.
+
+        Args:
+            bits (numpy.ndarray): The packed pixels. Hx((W + 7) // 8) matrix of uint8. The unused bits must be 0.
+            width (int): The width of the image.
+            high (int or float, optional): The pixel value of the set bits. See __init__.
+            low (int or float, optional): The pixel value of the cleared bits.
+            dtype (numpy.dtype, optional): The data type of the unpacked pixels.
+
+        Returns:
+            BinaryImage: Returns the BinaryImage object that holds the packed pixels.
+
+        Raises:
+            ValueError: If the packed pixels do not fit the width.
+        """
+        if bits.dtype != np.uint8 or bits.ndim != 2 or bits.shape[1] != (width + 7) // 8:
+            raise ValueError('bits must be Hx{} matrix of uint8: {} {}'.format((width + 7) // 8, bits.dtype, bits.shape))
+        image = cls(high=high, low=low, dtype=dtype)
+        image._bits = bits
+        image._height = bits.shape[0]
+        image._width = width
+
+        return image
+
+    @classmethod
+    def from_mask(cls, mask, high=None, low=0, dtype=np.uint8):
+        """Creates the BinaryImage object from the mask.
+
+        Args:
+            mask (numpy.ndarray): The mask. HxW matrix. The nonzero elements are set.
+            high (int or float, optional): The pixel value of the set bits. See __init__.
+            low (int or float, optional): The pixel value of the cleared bits.
+            dtype (numpy.dtype, optional): The data type of the unpacked pixels.
+
+        Returns:
+            BinaryImage: Returns the BinaryImage object.
+        """
+        return cls.from_bits(np.packbits(mask.astype(bool, copy=False), axis=1), mask.shape[1], high, low, dtype)
+
+    @property
+    def width(self):
+        """Gets the width of the image.
+        """
+        return self._width
+
+    @property
+    def height(self):
+        """Gets the height of the image.
+        """
+        return self._height
+
+    @property
+    def dtype(self):
+        """Gets the data type of the unpacked pixels.
+        """
+        return self._values.dtype
+
+    @property
+    def bits(self):
+        """Gets the packed pixels. See from_bits.
+        """
+        return self._bits
+
+    def __getitem__(self, index):
+        """The reference operator getting the unpacked image data.
+
+        Only the rows selected by the first index are unpacked.
+
+        Args:
+            index (tuple(y, x)): The image index. See Image.__getitem__.
+
+        Returns:
+            int or numpy.ndarray: Returns the pixel values, high or low.
+        """
+        if not isinstance(index, tuple):
+            index = (index,)
+        bits = np.unpackbits(self._bits[index[0]], axis=-1, count=self._width)
+
+        return self._values[bits[(slice(None),) * (bits.ndim - 1) + index[1:]]]
+
+    @profile
+    def count(self):
+        """Counts the set pixels.
+
+        The bits are counted by np.bitwise_count, which is the popcount instruction of the CPU.
+        Before NumPy 2.0, the bytes are counted by value in a single pass and weighted by the number of their set bits.
+
+        Returns:
+            int: Returns the number of the pixels set to high.
+        """
+        if hasattr(np, 'bitwise_count'):
+            return int(np.bitwise_count(self._bits).sum(dtype=np.int64))
+
+        return int(np.dot(np.bincount(self._bits.ravel(), minlength=256), BYTE_POPCOUNT))
+
+    def _combine(self, other, function):
+        """Combines the packed pixels of two images byte by byte.
+
+        Args:
+            other (BinaryImage): The other image of the same shape.
+            function (numpy.ufunc): The bitwise function.
+
+        Returns:
+            BinaryImage: Returns the combined image with the pixel values of this image.
+
+        Raises:
+            ValueError: If the images do not have the same shape.
+        """
+        if (other._height, other._width) != (self._height, self._width):
+            raise ValueError('the images must have the same shape: {} != {}'.format((other._height, other._width), (self._height, self._width)))
+
+        return BinaryImage.from_bits(function(self._bits, other._bits), self._width, self._values[1], self._values[0], self.dtype)
+
+    def __and__(self, other):
+        """Gets the pixels set in both images.
+        """
+        return self._combine(other, np.bitwise_and)
+
+    def __or__(self, other):
+        """Gets the pixels set in either image.
+        """
+        return self._combine(other, np.bitwise_or)
+
+    def __xor__(self, other):
+        """Gets the pixels set in only one of the images.
+        """
+        return self._combine(other, np.bitwise_xor)
+
+    def __invert__(self):
+        """Gets the pixels not set.
+
+        The unused bits at the end of each row are cleared again.
+        """
+        bits = np.invert(self._bits)
+        if self._width % 8:
+            bits[:, -1] &= np.uint8(0xff << (8 - self._width % 8) & 0xff)
+
+        return BinaryImage.from_bits(bits, self._width, self._values[1], self._values[0], self.dtype)
+
+    @profile
+    def unpack(self, out=None):
+        """Unpacks the pixels to the image data.
+
+        Each byte is looked up in the table of its 8 pixel values as one element, in blocks of rows,
+        so one lookup writes 8 pixels.
+
+        Args:
+            out (numpy.ndarray, optional): The array to write the result to. HxW matrix of the data type of the pixels.
+
+        Returns:
+            numpy.ndarray: Returns the image data. HxW matrix of high and low.
+        """
+        if out is None:
+            out = np.empty((self._height, self._width), self.dtype)
+        table = self._values[BYTE_BITS]
+        table = table.view(np.dtype((np.void, table.itemsize * 8))).ravel()
+        rows = max(1, LUT_BLOCK_PIXELS // max(1, self._width))
+        for top in range(0, self._height, rows):
+            block = self._bits[top:top + rows]
+            out[top:top + rows] = table[block].view(self.dtype).reshape(len(block), -1)[:, :self._width]
+
+        return out
+
+    def to_image(self):
+        """Unpacks the pixels to the Image object.
+
+        Returns:
+            Image: Returns the image of high and low.
+        """
+        return Image.from_array(self.unpack())
+
+    def copy(self):
+        """Copies the BinaryImage object.
+
+        Returns:
+            BinaryImage: Returns a deep copy of this BinaryImage object.
+        """
+        return BinaryImage.from_bits(self._bits.copy(), self._width, self._values[1], self._values[0], self.dtype)
+
+    @profile
+    def open(self, path):
+        """Opens the image file specifyed by the argument of path.
+
+        The 1-bit image files are read packed as they are.
+        The other image files are opened in grayscale and the pixels greater than the half of the maximum are set.
+
+        Args:
+            path (string): The path to the image file.
+        """
+        with im.open(path) as image:
+            if image.mode == '1':
+                self._width, self._height = image.size
+                self._bits = np.frombuffer(bytearray(image.tobytes()), np.uint8).reshape(self._height, -1)
+                return
+            mask = np.array(image.convert('L')) > 127
+
+        self._bits = np.packbits(mask, axis=1)
+        self._height, self._width = mask.shape
+
+    @profile
+    def save(self, path):
+        """Saves the image in the specified path as the 1-bit image file.
+
+        The packed pixels are passed to PIL as they are, so the 1-bit BMP or PNG file is written without unpacking.
+        The set pixels are white and the cleared pixels are black in the file.
+
+        Args:
+            path (string): The path to save the image.
+        """
+        im.frombytes('1', (self._width, self._height), self._bits.tobytes()).save(path)
@@ -0,0 +1,515 @@
+"""The mathematical morphology of grayscale and binary images.
+
+The structuring elements are decomposed into line segments in the horizontal, the vertical and the diagonal directions.
+The image is eroded or dilated by one segment after another, so the cost does not grow with the area of the element:
+
+    * The columns are processed by the van Herk/Gil-Werman algorithm, which takes about 3 comparisons per pixel for any length.
+      The diagonal segments are turned into columns by shearing the image.
+    * The rows are processed by doubling the segment, which takes 2 comparisons per pixel for each doubling,
+      because the van Herk/Gil-Werman algorithm along the rows reads a cache line per pixel.
+    * BinaryImage is processed 64 pixels at a time by the bitwise operations on the packed words, by doubling the segment in any direction.
+
+The pixels outside the image do not affect the result: they are treated as the maximum for erosion and the minimum for dilation.
+"""
+from abc import ABCMeta
+from functools import reduce
+import math
+import numpy as np
+try:
+    from . import ImageProcessing as ip
+    from .Profiler import profile
+except ImportError:
+    import ImageProcessing as ip
+    from Profiler import profile
+
+VAN_HERK_MIN_SIZE = 15
+"""int: The length of the line segments from which the columns are processed by the van Herk/Gil-Werman algorithm.
+
+Tuned by Benchmark.run_morphology: comparing the shifted rows costs a pass over the image per pixel of the segment,
+while the van Herk/Gil-Werman algorithm costs about the same for any length.
+"""
+
+HORIZONTAL = (0, 1)
+VERTICAL = (1, 0)
+DIAGONAL = (1, 1)
+ANTI_DIAGONAL = (1, -1)
+"""tuple(int, int): The directions (dy, dx) of the line segments."""
+
+ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+"""numpy.uint64: The word of the packed pixels all set."""
+
+def _identity(dtype, erosion):
+    """Gets the pixel value that does not affect erosion or dilation.
+
+    Args:
+        dtype (numpy.dtype): The data type of the pixels.
+        erosion (bool): Gets the value for erosion instead of dilation.
+
+    Returns:
+        int or float: Returns the maximum of the data type for erosion, the minimum for dilation.
+    """
+    if np.dtype(dtype).kind == 'f':
+        return np.inf if erosion else -np.inf
+    return np.iinfo(dtype).max if erosion else np.iinfo(dtype).min
+
+def _columns(array, size, function, identity):
+    """Takes the minimum or the maximum of the vertical line segment around each pixel.
+
+    Args:
+        array (numpy.ndarray): The image data. HxW matrix, or HxWx3 for RGB images.
+        size (int): The length of the segment. Odd number.
+        function (numpy.ufunc): np.minimum or np.maximum.
+        identity (int or float): The pixel value outside the image.
+
+    Returns:
+        numpy.ndarray: Returns the result of the same shape.
+    """
+    if size < VAN_HERK_MIN_SIZE:
+        return _columns_shifted(array, size, function)
+    return _columns_van_herk(array, size, function, identity)
+
+def _columns_shifted(array, size, function):
+    """Takes the minimum or the maximum of the vertical line segment around each pixel by comparing the shifted rows.
+
+    Args:
+        array (numpy.ndarray): The image data. See _columns.
+        size (int): The length of the segment. Odd number.
+        function (numpy.ufunc): np.minimum or np.maximum.
+
+    Returns:
+        numpy.ndarray: Returns the result of the same shape.
+    """
+    height = len(array)
+    output = array.copy()
+    for shift in range(1, min(size // 2 + 1, height)):
+        function(output[shift:], array[:height - shift], out=output[shift:])
+        function(output[:height - shift], array[shift:], out=output[:height - shift])
+
+    return output
+
+def _columns_van_herk(array, size, function, identity):
+    """Takes the minimum or the maximum of the vertical line segment around each pixel by the van Herk/Gil-Werman algorithm.
+
+    The padded columns are split into blocks of the length of the segment.
+    Each window of the segment spans the end of one block and the start of the next,
+    so it is the minimum or the maximum of the suffix of the former and the prefix of the latter.
+
+    Args:
+        array (numpy.ndarray): The image data. See _columns.
+        size (int): The length of the segment. Odd number.
+        function (numpy.ufunc): np.minimum or np.maximum.
+        identity (int or float): The pixel value outside the image.
+
+    Returns:
+        numpy.ndarray: Returns the result of the same shape.
+    """
+    radius = size // 2
+    height = len(array)
+    blocks = -(-(height + 2 * radius) // size)
+    prefix = np.full((blocks * size,) + array.shape[1:], identity, array.dtype)
+    prefix[radius:radius + height] = array
+    suffix = prefix.copy()
+    prefix_blocks = prefix.reshape((blocks, size) + array.shape[1:])
+    suffix_blocks = suffix.reshape((blocks, size) + array.shape[1:])
+    for index in range(1, size):
+        function(prefix_blocks[:, index - 1], prefix_blocks[:, index], out=prefix_blocks[:, index])
+        function(suffix_blocks[:, size - index], suffix_blocks[:, size - index - 1], out=suffix_blocks[:, size - index - 1])
+
+    return function(suffix[:height], prefix[size - 1:size - 1 + height])
+
+def _rows(array, size, function):
+    """Takes the minimum or the maximum of the horizontal line segment around each pixel.
+
+    The segment is doubled from a pixel, so the cost grows with the logarithm of the length.
+
+    Args:
+        array (numpy.ndarray): The image data. HxW matrix, or HxWx3 for RGB images.
+        size (int): The length of the segment. Odd number.
+        function (numpy.ufunc): np.minimum or np.maximum.
+
+    Returns:
+        numpy.ndarray: Returns the result of the same shape.
+    """
+    output = array.copy()
+    extended = np.empty_like(array)
+    width = array.shape[1]
+    radius = 0
+    while radius < size // 2:
+        shift = min(radius + 1, size // 2 - radius)
+        extended[...] = output
+        if shift < width:
+            function(extended[:, shift:], output[:, :width - shift], out=extended[:, shift:])
+            function(extended[:, :width - shift], output[:, shift:], out=extended[:, :width - shift])
+        output, extended = extended, output
+        radius += shift
+
+    return output
+
+def _sheared(array, direction):
+    """Gets the view of the sheared array at the pixels of the image.
+
+    The sheared array has H rows and W + H - 1 columns, and the pixels on each diagonal line of the image are in one of its columns.
+
+    Args:
+        array (numpy.ndarray): The sheared array. Hx(W + H - 1) matrix, or Hx(W + H - 1)x3 for RGB images.
+        direction (tuple(int, int)): DIAGONAL or ANTI_DIAGONAL.
+
+    Returns:
+        numpy.ndarray: Returns the view. HxW matrix, or HxWx3 for RGB images.
+    """
+    height = len(array)
+    width = array.shape[1] - height + 1
+    start = array[:, height - 1:] if direction == DIAGONAL else array
+    strides = (array.strides[0] - direction[1] * array.strides[1],) + array.strides[1:]
+
+    return np.lib.stride_tricks.as_strided(start, (height, width) + array.shape[2:], strides)
+
+def _line(array, size, direction, function, identity):
+    """Takes the minimum or the maximum of the line segment around each pixel.
+
+    Args:
+        array (numpy.ndarray): The image data. HxW matrix, or HxWx3 for RGB images.
+        size (int): The length of the segment. Odd number.
+        direction (tuple(int, int)): The direction of the segment. HORIZONTAL, VERTICAL, DIAGONAL or ANTI_DIAGONAL.
+        function (numpy.ufunc): np.minimum or np.maximum.
+        identity (int or float): The pixel value outside the image.
+
+    Returns:
+        numpy.ndarray: Returns the result of the same shape. The array itself if the length is 1.
+    """
+    if size == 1:
+        return array
+    if direction == HORIZONTAL:
+        return _rows(array, size, function)
+    if direction == VERTICAL:
+        return _columns(array, size, function, identity)
+
+    height, width = array.shape[:2]
+    sheared = np.full((height, width + height - 1) + array.shape[2:], identity, array.dtype)
+    _sheared(sheared, direction)[...] = array
+
+    return _sheared(_columns(sheared, size, function, identity), direction)
+
+def _shift_words(words, dy, dx, fill):
+    """Shifts the packed pixels.
+
+    Args:
+        words (numpy.ndarray): The packed pixels. HxN matrix of uint64. The first pixel of each word is the most significant bit.
+        dy (int): The number of the rows to shift down by.
+        dx (int): The number of the pixels to shift right by.
+        fill (numpy.uint64): The word of the pixels shifted in, 0 or ALL_BITS.
+
+    Returns:
+        numpy.ndarray: Returns the shifted pixels. The pixel (y, x) is the pixel (y - dy, x - dx) of the words.
+    """
+    height, count = words.shape
+    output = np.full_like(words, fill)
+    count_shift, bit_shift = divmod(abs(dx), 64)
+    if height <= abs(dy) or count <= count_shift:
+        return output
+
+    source = words[max(0, -dy):height - max(0, dy)]
+    target = output[max(0, dy):height - max(0, -dy)]
+    if 0 <= dx:
+        target[:, count_shift:] = source[:, :count - count_shift]
+    else:
+        target[:, :count - count_shift] = source[:, count_shift:]
+    if bit_shift:
+        carry = np.full_like(target, fill)
+        if 0 <= dx:
+            carry[:, 1:] = target[:, :-1]
+            target >>= np.uint64(bit_shift)
+            target |= carry << np.uint64(64 - bit_shift)
+        else:
+            carry[:, :-1] = target[:, 1:]
+            target <<= np.uint64(bit_shift)
+            target |= carry >> np.uint64(64 - bit_shift)
+
+    return output
+
+def _line_words(words, size, direction, function, fill):
+    """Erodes or dilates the packed pixels by the line segment.
+
+    The segment is doubled from a pixel, so the cost grows with the logarithm of the length.
+
+    Args:
+        words (numpy.ndarray): The packed pixels. See _shift_words.
+        size (int): The length of the segment. Odd number.
+        direction (tuple(int, int)): The direction of the segment.
+        function (numpy.ufunc): np.bitwise_and for erosion or np.bitwise_or for dilation.
+        fill (numpy.uint64): The word of the pixels outside the image. ALL_BITS for erosion, 0 for dilation.
+
+    Returns:
+        numpy.ndarray: Returns the result of the same shape.
+    """
+    dy, dx = direction
+    radius = 0
+    while radius < size // 2:
+        shift = min(radius + 1, size // 2 - radius)
+        extended = function(words, _shift_words(words, dy * shift, dx * shift, fill))
+        words = function(extended, _shift_words(words, -dy * shift, -dx * shift, fill), out=extended)
+        radius += shift
+
+    return words
+
+def _to_words(image, margin, fill):
+    """Converts the packed pixels of the binary image to the words.
+
+    Args:
+        image (ImageProcessing.BinaryImage): The binary image.
+        margin (int): The number of the pixels of the fill added on each side.
+        fill (numpy.uint64): The word of the pixels outside the image.
+
+    Returns:
+        numpy.ndarray: Returns the words. (H + 2 * margin)xN matrix of uint64 for N * 64 >= W + 2 * margin.
+    """
+    height, width = image.height, image.width
+    count = -(-(width + 2 * margin) // 64)
+    padded = np.zeros((height, count * 8), np.uint8)
+    padded[:, :image.bits.shape[1]] = image.bits
+    rows = padded.view('>u8').astype(np.uint64)
+    if fill and width % 64:
+        rows[:, width // 64] |= ALL_BITS >> np.uint64(width % 64)
+    rows[:, -(-width // 64):] = fill
+
+    words = np.full((height + 2 * margin, count), fill, np.uint64)
+    words[margin:margin + height] = _shift_words(rows, 0, margin, fill)
+
+    return words
+
+def _from_words(words, height, width, margin):
+    """Converts the words back to the packed pixels of the binary image.
+
+    Args:
+        words (numpy.ndarray): The words. See _to_words.
+        height (int): The height of the image.
+        width (int): The width of the image.
+        margin (int): The number of the pixels added on each side.
+
+    Returns:
+        numpy.ndarray: Returns the packed pixels. See ImageProcessing.BinaryImage.from_bits.
+    """
+    rows = _shift_words(words[margin:margin + height], 0, -margin, np.uint64(0))
+    bits = np.ascontiguousarray(rows.astype('>u8').view(np.uint8)[:, :(width + 7) // 8])
+    if width % 8:
+        bits[:, -1] &= np.uint8(0xff << (8 - width % 8) & 0xff)
+
+    return bits
+
+class StructuringElement(metaclass=ABCMeta):
+    """The structuring element class.
+
+    The element is the Minkowski sum of the factors, and each factor is the union of the line segments.
+    Eroding or dilating by the element is eroding or dilating by the factors in turn,
+    and eroding or dilating by each factor is taking the minimum or the maximum of eroding or dilating by its segments.
+
+    Attributes:
+        _size (int): The height and width of the bounding box of the element. Odd number.
+        _factors (list[list[tuple(tuple(int, int), int)]]): The factors. Each segment is the direction and the length.
+    """
+
+    def __init__(self, size, factors):
+        """Initializes StructuringElement class.
+
+        Args:
+            size (int): The height and width of the bounding box of the element.
+            factors (list[list[tuple(tuple(int, int), int)]]): The factors.
+        """
+        self._size = size
+        self._factors = factors
+
+    @staticmethod
+    def _check_size(size):
+        """Checks the size of the element.
+
+        Args:
+            size (int): The size.
+
+        Raises:
+            ValueError: If the size is not a positive odd number.
+        """
+        if size < 1 or size % 2 == 0:
+            raise ValueError('size must be a positive odd number: {}'.format(size))
+
+    def _margin(self):
+        """Gets the number of the pixels added on each side of the image.
+
+        Eroding or dilating by the diagonal segments in turn needs the pixels outside the image,
+        which the horizontal and the vertical ones do not.
+
+        Returns:
+            int: Returns the margin.
+        """
+        if all(direction in (HORIZONTAL, VERTICAL) for factor in self._factors for direction, size in factor):
+            return 0
+        return self._size // 2
+
+    def mask(self):
+        """Gets the pixels of the element.
+
+        Returns:
+            numpy.ndarray: Returns the mask. SxS matrix of bool for the size S.
+        """
+        point = np.zeros((self._size, self._size), np.uint8)
+        point[self._size // 2, self._size // 2] = 1
+
+        return self.dilate(ip.Image.from_array(point))._image != 0
+
+    def _apply(self, image, erosion):
+        """Erodes or dilates the image.
+
+        Args:
+            image (ImageProcessing.Image or ImageProcessing.BinaryImage): The input image.
+            erosion (bool): Erodes the image instead of dilating it.
+
+        Returns:
+            ImageProcessing.Image or ImageProcessing.BinaryImage: Returns the output image of the same type.
+        """
+        margin = self._margin()
+        if isinstance(image, ip.BinaryImage):
+            function = np.bitwise_and if erosion else np.bitwise_or
+            fill = ALL_BITS if erosion else np.uint64(0)
+            words = _to_words(image, margin, fill)
+            for factor in self._factors:
+                words = reduce(function, [_line_words(words, size, direction, function, fill) for direction, size in factor])
+            bits = _from_words(words, image.height, image.width, margin)
+            return ip.BinaryImage.from_bits(bits, image.width, image._values[1], image._values[0], image.dtype)
+
+        function = np.minimum if erosion else np.maximum
+        identity = _identity(image.dtype, erosion)
+        array = image._image
+        height, width = array.shape[:2]
+        if margin:
+            array = np.full((height + 2 * margin, width + 2 * margin) + array.shape[2:], identity, array.dtype)
+            array[margin:margin + height, margin:margin + width] = image._image
+        for factor in self._factors:
+            array = reduce(function, [_line(array, size, direction, function, identity) for direction, size in factor])
+        if array is image._image:
+            array = array.copy()
+
+        return ip.Image.from_array(np.ascontiguousarray(array[margin:margin + height, margin:margin + width]))
+
+    @profile
+    def erode(self, image):
+        """Erodes the image.
+
+        Each pixel is the minimum of the pixels under the element centered on it.
+
+        Args:
+            image (ImageProcessing.Image or ImageProcessing.BinaryImage): The input image.
+
+        Returns:
+            ImageProcessing.Image or ImageProcessing.BinaryImage: Returns the eroded image.
+        """
+        return self._apply(image, erosion=True)
+
+    @profile
+    def dilate(self, image):
+        """Dilates the image.
+
+        Each pixel is the maximum of the pixels under the element centered on it.
+
+        Args:
+            image (ImageProcessing.Image or ImageProcessing.BinaryImage): The input image.
+
+        Returns:
+            ImageProcessing.Image or ImageProcessing.BinaryImage: Returns the dilated image.
+        """
+        return self._apply(image, erosion=False)
+
+    @profile
+    def open(self, image):
+        """Executes opening, which is erosion followed by dilation.
+
+        This removes the bright spots and the thin bright lines smaller than the element.
+
+        Args:
+            image (ImageProcessing.Image or ImageProcessing.BinaryImage): The input image.
+
+        Returns:
+            ImageProcessing.Image or ImageProcessing.BinaryImage: Returns the opened image.
+        """
+        return self._apply(self._apply(image, erosion=True), erosion=False)
+
+    @profile
+    def close(self, image):
+        """Executes closing, which is dilation followed by erosion.
+
+        This fills the dark holes and the thin dark gaps smaller than the element.
+
+        Args:
+            image (ImageProcessing.Image or ImageProcessing.BinaryImage): The input image.
+
+        Returns:
+            ImageProcessing.Image or ImageProcessing.BinaryImage: Returns the closed image.
+        """
+        return self._apply(self._apply(image, erosion=False), erosion=True)
+
+class Rectangle(StructuringElement):
+    """The rectangular structuring element.
+
+    This is the sum of the horizontal and the vertical segments.
+    """
+
+    def __init__(self, height, width=None):
+        """Initializes Rectangle class.
+
+        Args:
+            height (int): The height of the rectangle. Odd number.
+            width (int, optional): The width of the rectangle. Odd number. The same as the height if None.
+
+        Raises:
+            ValueError: If the height or the width is not a positive odd number.
+        """
+        if width is None:
+            width = height
+        self._check_size(height)
+        self._check_size(width)
+        super().__init__(max(height, width), [[(HORIZONTAL, width)], [(VERTICAL, height)]])
+
+class Diamond(StructuringElement):
+    """The diamond structuring element, which is the pixels within the city block distance of the radius.
+
+    The sum of the diagonal and the anti-diagonal segments of length 2a + 1 is the pixels of even x + y within the distance 2a.
+    Adding the cross of 3 pixels fills the pixels of odd x + y and extends the distance by 1.
+    """
+
+    def __init__(self, size):
+        """Initializes Diamond class.
+
+        Args:
+            size (int): The width of the diamond, which is 2 * radius + 1.
+
+        Raises:
+            ValueError: If the size is not a positive odd number.
+        """
+        self._check_size(size)
+        radius = size // 2
+        factors = []
+        if 0 < radius:
+            length = (radius - 1) // 2 * 2 + 1
+            factors = [[(DIAGONAL, length)], [(ANTI_DIAGONAL, length)]]
+            factors += [[(HORIZONTAL, 3), (VERTICAL, 3)]] * (radius - length + 1)
+        super().__init__(size, factors)
+
+class Octagon(StructuringElement):
+    """The octagonal structuring element, which approximates the disk.
+
+    This is the sum of the square and the diagonal and the anti-diagonal segments,
+    whose lengths are chosen so that the straight sides and the slanted sides have about the same length.
+    """
+
+    def __init__(self, size):
+        """Initializes Octagon class.
+
+        Args:
+            size (int): The width of the octagon. Odd number.
+
+        Raises:
+            ValueError: If the size is not a positive odd number.
+        """
+        self._check_size(size)
+        radius = size // 2
+        slant = int(radius / (2 + math.sqrt(2)))
+        square = 2 * (radius - 2 * slant) + 1
+        super().__init__(size, [[(HORIZONTAL, square)], [(VERTICAL, square)], [(DIAGONAL, 2 * slant + 1)], [(ANTI_DIAGONAL, 2 * slant + 1)]])
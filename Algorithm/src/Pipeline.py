@@ -0,0 +1,164 @@
+try:
+    from . import ImageProcessing as ip
+    from . import EdgeDetectors as ed
+    from .Profiler import profile
+except ImportError:
+    import ImageProcessing as ip
+    import EdgeDetectors as ed
+    from Profiler import profile
+
+class Pipeline(ed.EdgeDetector):
+    """The pipeline class that chains the edge detection and the point operations.
+
+    The stages are only recorded when they are added, and executed when detect is called.
+    The edge detection followed by the point operations is fused into a single pass:
+    the point operations are composed into one lookup table applied to the edge strength as it is written,
+    so no intermediate image is created.
+    The edge detectors not overriding _strength are executed by detect, and the point operations are applied to its output.
+    This class is an EdgeDetector, so detect_tiled and detect_parallel can execute the pipeline.
+
+    Attributes:
+        _stages (list[tuple(string, object)]): The stages. Each stage is ('detect', EdgeDetector), ('threshold', (threshold, high, low))
+                                               or ('point', PointOperations).
+    """
+
+    def __init__(self):
+        """Initializes Pipeline class: The Pipeline class constructor.
+        """
+        self._stages = []
+
+    @property
+    def HALO(self):
+        """Gets the number of the neighboring pixels on each side that the stages refer to.
+
+        Returns:
+            int: Returns the sum of the halos of the edge detection stages.
+        """
+        return sum(edge_detector.HALO for kind, edge_detector in self._stages if kind == 'detect')
+
+    @property
+    def WHOLE_IMAGE(self):
+        """Gets whether the stages refer to the whole image, so detect_tiled and detect_parallel detect the whole image at once.
+
+        Returns:
+            bool: Returns True if any edge detection stage refers to the whole image.
+        """
+        return any(edge_detector.WHOLE_IMAGE for kind, edge_detector in self._stages if kind == 'detect')
+
+    def add_detector(self, edge_detector):
+        """Adds the edge detection stage.
+
+        Args:
+            edge_detector (EdgeDetectors.EdgeDetector): The edge detector.
+
+        Returns:
+            Pipeline: Returns this pipeline.
+        """
+        self._stages.append(('detect', edge_detector))
+
+        return self
+
+    def add_threshold(self, threshold, high=None, low=0):
+        """Adds the threshold processing stage.
+
+        Args:
+            threshold (int): The threshold. See ImageProcessing.Image.threshold.
+            high (int, optional): This is set if the pixcel value is greater than the threshold.
+                                  The maximum pixel value of the data type if None.
+            low (int, optional): This is set if the pixcel value is less than or equal to the threshold.
+
+        Returns:
+            Pipeline: Returns this pipeline.
+        """
+        self._stages.append(('threshold', (threshold, high, low)))
+
+        return self
+
+    def add_point(self, operations):
+        """Adds the point operations stage.
+
+        Args:
+            operations (ImageProcessing.PointOperations): The point operations.
+
+        Returns:
+            Pipeline: Returns this pipeline.
+        """
+        self._stages.append(('point', operations))
+
+        return self
+
+    @staticmethod
+    def _point_operations(kind, stage):
+        """Gets the point operations of the stage.
+
+        Args:
+            kind (string): 'threshold' or 'point'.
+            stage (object): The stage.
+
+        Returns:
+            ImageProcessing.PointOperations: Returns the point operations.
+        """
+        if kind == 'threshold':
+            return ip.PointOperations().add_threshold(*stage)
+        return stage
+
+    @profile
+    def detect(self, image):
+        """Executes the stages on the image.
+
+        Args:
+            image (ImageProcessing.Image): The input image.
+
+        Returns:
+            ImageProcessing.Image: Returns the output image of the last stage.
+        """
+        input_array = image[:, :]
+        array = input_array
+        i = 0
+        while i < len(self._stages):
+            kind, stage = self._stages[i]
+            i += 1
+            if kind != 'detect' and array.dtype.kind == 'f':
+                array = self._point_operations(kind, stage).apply(array)
+                continue
+
+            operations = ip.PointOperations()
+            if kind != 'detect':
+                operations.add_operations(self._point_operations(kind, stage))
+            if array.dtype.kind != 'f':
+                while i < len(self._stages) and self._stages[i][0] != 'detect':
+                    operations.add_operations(self._point_operations(*self._stages[i]))
+                    i += 1
+
+            if kind == 'detect' and type(stage)._strength is ed.EdgeDetector._strength:
+                array = stage.detect(ip.Image.from_array(array))[:, :]
+                if len(operations):
+                    array = operations.apply(array)
+            elif kind == 'detect':
+                lut = operations.lut(array.dtype) if len(operations) else None
+                array = stage._detect_fused(array, lut, rgb=array.ndim == 3)
+            else:
+                array = operations.apply(array)
+
+        if array is input_array:
+            array = array.copy()
+
+        return type(image).from_array(array)
+
+    @profile
+    def detect_batch(self, images):
+        """Executes the stages on many images.
+
+        The stages change the data type and the shape of the image data between them, so each image is executed by detect.
+
+        Args:
+            images (list[ImageProcessing.Image] or string): The input images, or the path to the directory of the image files.
+                                                            The image files are opened in grayscale.
+
+        Returns:
+            list[ImageProcessing.Image]: Returns the output images of the last stage in the order of the input images.
+        """
+        if isinstance(images, str):
+            images = ip.Image.open_directory(images, grayscale=True)
+
+        return [self.detect(image) for image in images]
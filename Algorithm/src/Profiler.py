@@ -0,0 +1,193 @@
+"""The stage-level profiling of ImageProcessing and EdgeDetectors.
+
+The stages such as Image.open and SobelEdgeDetector.detect are decorated with profile.
+They are recorded only while a Profiler is active:
+
+    with Profiler() as profiler:
+        image = Image(path, grayscale=True)
+        SobelEdgeDetector().detect(image).save(output_path)
+    profiler.save('profile.json')
+
+When no Profiler is active, the decorated stages only check a global variable before running.
+Profiler(memory=True) also traces the memory allocations with tracemalloc, which slows down the stages while it is active.
+"""
+from functools import wraps
+import json
+import threading
+import time
+import tracemalloc
+
+_active = None
+"""Profiler: The active profiler. None if profiling is disabled."""
+
+def profile(function):
+    """Decorates the method to record it as a stage.
+
+    The stage is named after the class of the instance and the method, such as "SobelEdgeDetector.detect".
+
+    Args:
+        function (function): The method to record.
+
+    Returns:
+        function: Returns the decorated method.
+    """
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return function(self, *args, **kwargs)
+
+        start = time.perf_counter()
+        profiler._begin()
+        try:
+            result = function(self, *args, **kwargs)
+        finally:
+            peak_bytes = profiler._end()
+        profiler.record('{}.{}'.format(type(self).__name__, function.__name__), time.perf_counter() - start, result if result is not None else self,
+                        peak_bytes)
+
+        return result
+
+    return wrapper
+
+class Profiler:
+    """The profiler that records the wall time, the calls, the pixels, the output bytes and the peak allocated bytes of each stage.
+
+    The times of the nested stages are included in the outer stages: for example, detect_tiled includes detect of each strip.
+    So are the allocations. The allocations are traced over the whole process,
+    so the peak of a stage includes the allocations of the other threads running at the same time.
+
+    Attributes:
+        _stages (dict): The statistics by stage name.
+        _lock (threading.Lock): The lock for the stages recorded on multiple threads.
+        _previous (Profiler): The profiler active before this profiler.
+        _memory (bool): Traces the memory allocations.
+        _tracing (bool): This profiler started tracemalloc, so it stops tracemalloc when deactivated.
+        _local (threading.local): The stack of the stages running on each thread.
+                                  Each entry is [the traced bytes at the start, the peak traced bytes so far].
+    """
+
+    def __init__(self, memory=False):
+        """Initializes Profiler class: The Profiler class constructor.
+
+        Args:
+            memory (bool, optional): Traces the memory allocations with tracemalloc to record the peak allocated bytes of each stage.
+                                     The tracing slows down the stages, so the seconds are longer than without it.
+        """
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._previous = None
+        self._memory = memory
+        self._tracing = False
+        self._local = threading.local()
+
+    def __enter__(self):
+        """Activates this profiler.
+
+        Returns:
+            Profiler: Returns this profiler.
+        """
+        global _active
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._previous = _active
+        _active = self
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Deactivates this profiler and activates the previous one.
+        """
+        global _active
+        _active = self._previous
+        self._previous = None
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def _begin(self):
+        """Starts tracing the allocations of a call of the stage.
+
+        The peak of tracemalloc is reset for the call, so the peak so far is kept for the outer stage.
+        """
+        if not self._memory or not tracemalloc.is_tracing():
+            return
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        stack.append([current, current])
+
+    def _end(self):
+        """Finishes tracing the allocations of a call of the stage.
+
+        Returns:
+            int: Returns the peak traced bytes during the call above the traced bytes at its start. 0 if the memory is not traced.
+        """
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            return 0
+
+        start, peak = stack.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+
+        return peak - start
+
+    @property
+    def stages(self):
+        """Gets the statistics of the stages.
+
+        Returns:
+            dict: Returns the calls, the seconds, the pixels, the output bytes and the peak bytes by stage name.
+                  The peak bytes are the maximum over the calls of the peak allocated bytes, and 0 if the memory is not traced.
+        """
+        with self._lock:
+            return {name: dict(stage) for name, stage in self._stages.items()}
+
+    def record(self, name, seconds, output, peak_bytes=0):
+        """Records a call of the stage.
+
+        Args:
+            name (string): The name of the stage.
+            seconds (float): The wall time of the call.
+            output (object): The output of the call. The pixels and the output bytes are counted if it is an image or a tuple of images.
+            peak_bytes (int, optional): The peak bytes allocated during the call.
+        """
+        pixels = 0
+        nbytes = 0
+        for image in output if isinstance(output, (tuple, list)) else [output]:
+            if hasattr(image, '_pixels'):
+                pixels += image.height * image.width
+                nbytes += 0 if image._pixels is None else image._pixels.nbytes
+
+        with self._lock:
+            stage = self._stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'pixels': 0, 'output_bytes': 0, 'peak_bytes': 0})
+            stage['calls'] += 1
+            stage['seconds'] += seconds
+            stage['pixels'] += pixels
+            stage['output_bytes'] += nbytes
+            stage['peak_bytes'] = max(stage['peak_bytes'], peak_bytes)
+
+    def to_json(self):
+        """Exports the statistics of the stages.
+
+        Returns:
+            string: Returns the statistics in JSON.
+        """
+        return json.dumps(self.stages, indent=2, sort_keys=True)
+
+    def save(self, path):
+        """Saves the statistics of the stages.
+
+        Args:
+            path (string): The path to the JSON file.
+        """
+        with open(path, 'w') as f:
+            f.write(self.to_json())
@@ -0,0 +1,220 @@
+"""The streaming of frame sequences through the edge detection and the threshold processing.
+
+The frames are decoded on a background thread ahead of the processing, and the results are encoded on another background thread,
+so the file I/O overlaps with the computation. Both are connected with bounded queues,
+so the memory stays constant regardless of the length of the sequence:
+
+    for output_image in process_frames('frames', SobelEdgeDetector(), threshold=100, output_dir='edges'):
+        pass
+"""
+from queue import Queue
+import os
+import re
+import threading
+from PIL import Image as im
+import numpy as np
+try:
+    from . import ImageProcessing as ip
+    from . import Pipeline as pl
+except ImportError:
+    import ImageProcessing as ip
+    import Pipeline as pl
+
+_END = object()
+"""object: The item that marks the end of the queue."""
+
+def _natural_key(name):
+    """Gets the key to sort the file names in the natural order, such as frame2 before frame10.
+
+    Args:
+        name (string): The file name.
+
+    Returns:
+        list: Returns the key.
+    """
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+def read_frames(source, grayscale=False):
+    """Reads the frames lazily.
+
+    Args:
+        source (string or list[string]): The path to the multi-frame image file such as TIFF or GIF,
+                                         the path to the directory of the numbered image files, or the list of the paths to the image files.
+        grayscale (bool, optional): Reads the frames in grayscale.
+
+    Yields:
+        ImageProcessing.Image: The frames in order. Each frame is decoded only when it is requested.
+    """
+    if isinstance(source, str) and os.path.isdir(source):
+        source = [os.path.join(source, name) for name in sorted(os.listdir(source), key=_natural_key)
+                  if os.path.isfile(os.path.join(source, name))]
+    elif isinstance(source, str):
+        source = [source]
+
+    for path in source:
+        with im.open(path) as frames:
+            for index in range(getattr(frames, 'n_frames', 1)):
+                frames.seek(index)
+                if grayscale:
+                    frame = frames.convert('L')
+                elif frames.mode in ('L', 'RGB', 'I;16'):
+                    frame = frames
+                else:
+                    frame = frames.convert('RGB')
+                yield ip.Image.from_array(np.array(frame))
+
+def prefetch(iterable, depth=2):
+    """Iterates the items produced on a background thread.
+
+    The background thread produces at most depth items ahead of the consumer.
+
+    Args:
+        iterable (iterable): The items to produce, such as read_frames.
+        depth (int, optional): The maximum number of the items produced ahead. 0 < depth.
+
+    Yields:
+        object: The items in order.
+
+    Raises:
+        Exception: The exception raised while producing the items is raised again here.
+    """
+    queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if stopped.is_set():
+                    return
+                queue.put((item, None))
+        except Exception as exception:
+            queue.put((_END, exception))
+            return
+        queue.put((_END, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exception = queue.get()
+            if exception is not None:
+                raise exception
+            if item is _END:
+                return
+            yield item
+    finally:
+        stopped.set()
+        while thread.is_alive():
+            while not queue.empty():
+                queue.get_nowait()
+            thread.join(0.01)
+
+class AsyncWriter:
+    """The writer that saves the images on a background thread.
+
+    Attributes:
+        _queue (queue.Queue): The images waiting to be saved.
+        _thread (threading.Thread): The background thread.
+        _exception (Exception): The exception raised while saving. None if nothing is raised.
+    """
+
+    def __init__(self, depth=2):
+        """Initializes AsyncWriter class: The AsyncWriter class constructor.
+
+        Args:
+            depth (int, optional): The maximum number of the images waiting to be saved. 0 < depth.
+        """
+        self._queue = Queue(maxsize=depth)
+        self._exception = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        """Returns this writer.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Waits for all the images to be saved.
+        """
+        self.close()
+
+    def write(self, image, path):
+        """Saves the image on the background thread.
+
+        This blocks while depth images are waiting to be saved.
+
+        Args:
+            image (ImageProcessing.Image): The image to save.
+            path (string): The path to save the image.
+
+        Raises:
+            Exception: The exception raised while saving the previous images.
+        """
+        if self._exception is not None:
+            raise self._exception
+        self._queue.put((image, path))
+
+    def close(self):
+        """Waits for all the images to be saved.
+
+        Raises:
+            Exception: The exception raised while saving the images.
+        """
+        if self._thread.is_alive():
+            self._queue.put((_END, None))
+            self._thread.join()
+        if self._exception is not None:
+            raise self._exception
+
+    def _run(self):
+        """Saves the images in the queue until the end.
+        """
+        while True:
+            image, path = self._queue.get()
+            if image is _END:
+                return
+            if self._exception is None:
+                try:
+                    image.save(path)
+                except Exception as exception:
+                    self._exception = exception
+
+def process_frames(source, edge_detector=None, threshold=None, output_dir=None, grayscale=True, depth=2, extension='.bmp'):
+    """Processes the frames as a stream.
+
+    The frames are decoded on a background thread, processed in order, and saved on another background thread.
+    The edge detection followed by the threshold processing is fused by Pipeline.
+
+    Args:
+        source (string or list[string]): The frames. See read_frames.
+        edge_detector (EdgeDetectors.EdgeDetector, optional): The edge detector. The edge detection is skipped if None.
+        threshold (int, optional): The threshold. The threshold processing is skipped if None.
+        output_dir (string, optional): The directory to save the output frames to, named frame000000 and so on.
+                                       The output frames are not saved if None.
+        grayscale (bool, optional): Reads the frames in grayscale.
+        depth (int, optional): The maximum number of the frames decoded ahead and waiting to be saved.
+        extension (string, optional): The extension of the output files.
+
+    Yields:
+        ImageProcessing.Image: The output frames in order.
+    """
+    pipeline = pl.Pipeline()
+    if edge_detector is not None:
+        pipeline.add_detector(edge_detector)
+    if threshold is not None:
+        pipeline.add_threshold(threshold)
+
+    if output_dir is not None and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    writer = AsyncWriter(depth) if output_dir is not None else None
+    try:
+        for index, frame in enumerate(prefetch(read_frames(source, grayscale), depth)):
+            output_frame = pipeline.detect(frame)
+            if writer is not None:
+                writer.write(output_frame, os.path.join(output_dir, 'frame{:06d}{}'.format(index, extension)))
+            yield output_frame
+    finally:
+        if writer is not None:
+            writer.close()
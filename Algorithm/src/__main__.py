@@ -0,0 +1,9 @@
+"""Runs the command line tool. See Cli.
+
+Usage:
+    python -m Algorithm.src ../../SIDBA/Mono --detector sobel --output-dir edges
+"""
+import sys
+from .Cli import main
+
+sys.exit(main())
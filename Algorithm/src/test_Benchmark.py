@@ -0,0 +1,55 @@
+import unittest
+import Benchmark as bm
+
+class TestBenchmark_run(unittest.TestCase):
+    """Tests Benchmark.run
+    """
+
+    def testNormal(self):
+        results = bm.run(sizes=[64], repeat=1)
+
+        self.assertIn('open/SIDBA/Mono', results)
+        self.assertIn('threshold/SIDBA/Color', results)
+        self.assertIn('PrewittEdgeDetector/synthetic64x64', results)
+        for result in results.values():
+            self.assertLess(0, result['megapixels_per_second'])
+            self.assertLessEqual(0, result['peak_bytes'])
+
+class TestBenchmark_run_kernels(unittest.TestCase):
+    """Tests Benchmark.run_kernels
+    """
+
+    def testNormal(self):
+        results = bm.run_kernels(size=64, kernel_sizes=[3, 9], repeat=1)
+
+        self.assertEqual({'correlate/3x3', 'correlate_fft/3x3', 'SobelEdgeDetector/3x3',
+                          'correlate/9x9', 'correlate_fft/9x9', 'SobelEdgeDetector/9x9'}, set(results))
+
+class TestBenchmark_run_morphology(unittest.TestCase):
+    """Tests Benchmark.run_morphology
+    """
+
+    def testNormal(self):
+        results = bm.run_morphology(size=64, element_sizes=[3], repeat=1)
+
+        self.assertEqual({'columns_shifted/3x3', 'columns_van_herk/3x3', 'Rectangle.erode/3x3', 'Rectangle.erode/binary/3x3',
+                          'Octagon.erode/3x3', 'Octagon.erode/binary/3x3'}, set(results))
+
+class TestBenchmark_compare(unittest.TestCase):
+    """Tests Benchmark.compare
+    """
+
+    def testNormal(self):
+        baseline = {'a': {'megapixels_per_second': 100.0, 'peak_bytes': 1000},
+                    'b': {'megapixels_per_second': 100.0, 'peak_bytes': 1000},
+                    'c': {'megapixels_per_second': 100.0, 'peak_bytes': 1000}}
+        results = {'a': {'megapixels_per_second': 90.0, 'peak_bytes': 1100},
+                   'b': {'megapixels_per_second': 50.0, 'peak_bytes': 1000},
+                   'c': {'megapixels_per_second': 100.0, 'peak_bytes': 5000},
+                   'd': {'megapixels_per_second': 1.0, 'peak_bytes': 1}}
+
+        regressions = bm.compare(baseline, results, tolerance=0.2)
+
+        self.assertEqual(2, len(regressions))
+        self.assertTrue(regressions[0].startswith('b:'))
+        self.assertTrue(regressions[1].startswith('c:'))
@@ -0,0 +1,104 @@
+import unittest
+import os
+import struct
+import numpy as np
+from PIL import Image as im
+import Bmp as bmp
+
+IMG_DIR = '../img'
+GRAYSCALE_IMAGE_DIR = '../../SIDBA/Mono'
+COLOR_IMAGE_DIR = '../../SIDBA/Color'
+
+class TestBmp_read(unittest.TestCase):
+    """Tests Bmp.read
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        for directory in [GRAYSCALE_IMAGE_DIR, COLOR_IMAGE_DIR]:
+            for name in os.listdir(directory):
+                array = bmp.read(directory + '/' + name)
+
+                self.assertTrue(np.array_equal(np.array(im.open(directory + '/' + name)), array))
+
+    def testZeroCopy(self):
+        array = bmp.read(COLOR_IMAGE_DIR + '/Lenna.bmp')
+
+        self.assertFalse(array.flags.owndata)
+        self.assertLess(array.strides[0], 0)
+        self.assertLess(array.strides[2], 0)
+
+    def testCopyOnWrite(self):
+        path = IMG_DIR + '/TestBmp_read_testCopyOnWrite.bmp'
+        im.open(GRAYSCALE_IMAGE_DIR + '/LENNA.bmp').save(path)
+
+        array = bmp.read(path, mmap=True)
+        array[...] = 0
+
+        self.assertTrue(np.array_equal(np.array(im.open(GRAYSCALE_IMAGE_DIR + '/LENNA.bmp')), bmp.read(path)))
+
+    def testClosesFile(self):
+        if not os.path.exists('/proc/self/fd'):
+            self.skipTest('needs /proc/self/fd')
+        count = len(os.listdir('/proc/self/fd'))
+
+        arrays = [bmp.read(COLOR_IMAGE_DIR + '/Lenna.bmp') for _ in range(50)]
+
+        self.assertEqual(count, len(os.listdir('/proc/self/fd')))
+        self.assertEqual(50, len(arrays))
+
+    def testTopDownPadding(self):
+        path = IMG_DIR + '/TestBmp_read_testTopDownPadding.bmp'
+        array = np.random.default_rng(0).integers(0, 256, (5, 7, 3)).astype(np.uint8)
+        bmp.write(path, array[::-1])
+        with open(path, 'r+b') as f:
+            f.seek(22)
+            f.write(struct.pack('<i', -5))
+
+        self.assertTrue(np.array_equal(array, bmp.read(path)))
+
+    def testUnsupported(self):
+        path = IMG_DIR + '/TestBmp_read_testUnsupported.bmp'
+        im.open(GRAYSCALE_IMAGE_DIR + '/LENNA.bmp').convert('P', palette=im.Palette.ADAPTIVE, colors=16).save(path)
+
+        with self.assertRaises(ValueError):
+            bmp.read(path)
+        im.open(GRAYSCALE_IMAGE_DIR + '/LENNA.bmp').save(IMG_DIR + '/TestBmp_read_testUnsupported.png')
+        with self.assertRaises(ValueError):
+            bmp.read(IMG_DIR + '/TestBmp_read_testUnsupported.png')
+
+class TestBmp_write(unittest.TestCase):
+    """Tests Bmp.write
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        path = IMG_DIR + '/TestBmp_write_testNormal.bmp'
+        rng = np.random.default_rng(0)
+        for shape in [(7, 5), (3, 6, 3), (10, 1), (1, 9, 3)]:
+            array = rng.integers(0, 256, shape).astype(np.uint8)
+
+            bmp.write(path, array)
+
+            self.assertTrue(np.array_equal(array, np.array(im.open(path))))
+            self.assertTrue(np.array_equal(array, bmp.read(path)))
+
+    def testOverwriteMapped(self):
+        path = IMG_DIR + '/TestBmp_write_testOverwriteMapped.bmp'
+        bmp.write(path, np.full((4, 4), 10, np.uint8))
+        array = bmp.read(path)
+
+        bmp.write(path, np.full((8, 8), 20, np.uint8))
+
+        self.assertTrue(np.all(array == 10))
+        self.assertTrue(np.all(bmp.read(path) == 20))
+
+    def testUnsupported(self):
+        with self.assertRaises(ValueError):
+            bmp.write(IMG_DIR + '/TestBmp_write_testUnsupported.bmp', np.zeros((4, 4), np.uint16))
@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+import ImageProcessing as ip
+import EdgeDetectors as ed
+import Cache as ca
+
+IMG_DIR = '../img'
+GRAYSCALE_IMAGE_PATH = '../../SIDBA/Mono/LENNA.bmp'
+CACHE_DIR = IMG_DIR + '/cache'
+
+class TestResultCache_detect(unittest.TestCase):
+    """Tests ResultCache.detect
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.SobelEdgeDetector()
+        cache = ca.ResultCache()
+
+        output_image = cache.detect(edge_detector, image)
+        cached_image = cache.detect(edge_detector, image.copy())
+
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertTrue(np.array_equal(edge_detector.detect(image)._image, cached_image._image))
+        self.assertIs(output_image._image, cached_image._image)
+
+    def testWriteToOutput(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.SobelEdgeDetector()
+        cache = ca.ResultCache()
+
+        output_image = cache.detect(edge_detector, image)
+        output_image[:, :] = 0
+        cached_image = cache.detect(edge_detector, image)
+
+        self.assertTrue(np.array_equal(edge_detector.detect(image)._image, cached_image._image))
+
+    def testAmplifier(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        cache = ca.ResultCache()
+
+        for edge_detector in [ed.SobelEdgeDetector(), ed.PrewittEdgeDetector()]:
+            cache.detect(edge_detector, image)
+            edge_detector.amplifier = 1.0
+            output_image = cache.detect(edge_detector, image)
+
+            self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+        self.assertEqual(0, cache.hits)
+
+    def testImage(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.SobelEdgeDetector()
+        cache = ca.ResultCache()
+
+        cache.detect(edge_detector, image)
+        image[0, 0] = 255 - image[0, 0]
+        output_image = cache.detect(edge_detector, image)
+
+        self.assertEqual(0, cache.hits)
+        self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+
+    def testMaxBytes(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        cache = ca.ResultCache(max_bytes=2 * image[:, :].nbytes)
+
+        for edge_detector in [ed.DifferenceEdgeDetector(), ed.RobertsEdgeDetector(), ed.SobelEdgeDetector()]:
+            cache.detect(edge_detector, image)
+        cache.detect(ed.SobelEdgeDetector(), image)
+        cache.detect(ed.DifferenceEdgeDetector(), image)
+
+        self.assertEqual(2 * image[:, :].nbytes, cache.nbytes)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(4, cache.misses)
+
+    def testDirectory(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.PrewittEdgeDetector()
+        ca.ResultCache(directory=CACHE_DIR).clear()
+
+        ca.ResultCache(directory=CACHE_DIR).detect(edge_detector, image)
+        cache = ca.ResultCache(directory=CACHE_DIR)
+        output_image = cache.detect(edge_detector, image)
+
+        self.assertEqual(1, cache.hits)
+        self.assertIsInstance(output_image._image, np.memmap)
+        self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+
+class TestResultCache_threshold(unittest.TestCase):
+    """Tests ResultCache.threshold
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        cache = ca.ResultCache()
+
+        cache.threshold(image, 100)
+        output_image = cache.threshold(image, 100)
+        other_image = cache.threshold(image, 100, low=10)
+
+        self.assertEqual(1, cache.hits)
+        self.assertTrue(np.array_equal(image.threshold(100)._image, output_image._image))
+        self.assertTrue(np.array_equal(image.threshold(100, low=10)._image, other_image._image))
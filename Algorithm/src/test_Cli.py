@@ -0,0 +1,96 @@
+import unittest
+import os
+import numpy as np
+import ImageProcessing as ip
+import EdgeDetectors as ed
+import Cli as cli
+
+IMG_DIR = '../img'
+GRAYSCALE_IMAGE_DIR = '../../SIDBA/Mono'
+COLOR_IMAGE_DIR = '../../SIDBA/Color'
+
+class TestCli_find_images(unittest.TestCase):
+    """Tests Cli.find_images
+    """
+
+    def testNormal(self):
+        paths = cli.find_images([GRAYSCALE_IMAGE_DIR, COLOR_IMAGE_DIR + '/L*.bmp', COLOR_IMAGE_DIR + '/Airplane.bmp'])
+
+        self.assertEqual(len(os.listdir(GRAYSCALE_IMAGE_DIR)) + 2, len(paths))
+        self.assertEqual(GRAYSCALE_IMAGE_DIR + '/Airplane.bmp', paths[0])
+        self.assertEqual([COLOR_IMAGE_DIR + '/Lenna.bmp', COLOR_IMAGE_DIR + '/Airplane.bmp'], paths[-2:])
+
+    def testNotFound(self):
+        with self.assertRaises(FileNotFoundError):
+            cli.find_images([COLOR_IMAGE_DIR + '/nothing*.bmp'])
+
+class TestCli_output_paths(unittest.TestCase):
+    """Tests Cli.output_paths
+    """
+
+    def testNormal(self):
+        paths = cli.output_paths([GRAYSCALE_IMAGE_DIR + '/BOAT.bmp', COLOR_IMAGE_DIR + '/Lenna.bmp'], IMG_DIR, '.png')
+
+        self.assertEqual([os.path.join(IMG_DIR, 'BOAT.png'), os.path.join(IMG_DIR, 'Lenna.png')], paths)
+
+    def testCollision(self):
+        with self.assertRaises(ValueError):
+            cli.output_paths([GRAYSCALE_IMAGE_DIR + '/Airplane.bmp', COLOR_IMAGE_DIR + '/Airplane.bmp'], IMG_DIR)
+        with self.assertRaises(ValueError):
+            cli.output_paths([GRAYSCALE_IMAGE_DIR + '/LENNA.bmp', COLOR_IMAGE_DIR + '/Lenna.bmp'], IMG_DIR)
+
+class TestCli_main(unittest.TestCase):
+    """Tests Cli.main
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        output_dir = IMG_DIR + '/TestCli_main_testNormal'
+
+        result = cli.main([GRAYSCALE_IMAGE_DIR, '--detector', 'prewitt', '--amplifier', '2', '--threshold', '100',
+                           '--output-dir', output_dir, '--workers', '3'])
+
+        self.assertEqual(0, result)
+        self.assertEqual(sorted(os.listdir(GRAYSCALE_IMAGE_DIR)), sorted(os.listdir(output_dir)))
+        image = ip.Image(GRAYSCALE_IMAGE_DIR + '/BOAT.bmp', grayscale=True)
+        expected_image = ed.PrewittEdgeDetector(amplifier=2).detect(image).threshold(100)
+        self.assertTrue(np.array_equal(expected_image._image, ip.Image(output_dir + '/BOAT.bmp', grayscale=True)._image))
+
+    def testThresholdMethod(self):
+        output_dir = IMG_DIR + '/TestCli_main_testThresholdMethod'
+
+        result = cli.main([COLOR_IMAGE_DIR + '/Lenna.bmp', '--threshold', 'otsu', '--output-dir', output_dir,
+                           '--extension', '.png', '--profile', output_dir + '/profile.json'])
+
+        self.assertEqual(0, result)
+        image = ip.Image(COLOR_IMAGE_DIR + '/Lenna.bmp', grayscale=True)
+        expected_image = ed.SobelEdgeDetector().detect(image).threshold('otsu')
+        self.assertTrue(np.array_equal(expected_image._image, ip.Image(output_dir + '/Lenna.png', grayscale=True)._image))
+        self.assertTrue(os.path.exists(output_dir + '/profile.json'))
+
+    def testCollision(self):
+        output_dir = IMG_DIR + '/TestCli_main_testCollision'
+
+        with self.assertRaises(SystemExit):
+            cli.main([GRAYSCALE_IMAGE_DIR, COLOR_IMAGE_DIR, '--output-dir', output_dir])
+        self.assertFalse(os.path.exists(output_dir))
+
+    def testInvalidWorkers(self):
+        for workers in ['0', '-2']:
+            with self.assertRaises(SystemExit):
+                cli.main([GRAYSCALE_IMAGE_DIR, '--output-dir', IMG_DIR + '/TestCli_main_testInvalidWorkers', '--workers', workers])
+
+    def testFailure(self):
+        input_dir = IMG_DIR + '/TestCli_main_testFailure'
+        if not os.path.exists(input_dir):
+            os.mkdir(input_dir)
+        with open(input_dir + '/broken.bmp', 'w') as f:
+            f.write('broken')
+
+        result = cli.main([input_dir + '/broken.bmp', GRAYSCALE_IMAGE_DIR + '/LENNA.bmp', '--output-dir', input_dir + '/output'])
+
+        self.assertEqual(1, result)
+        self.assertEqual(['LENNA.bmp'], os.listdir(input_dir + '/output'))
@@ -1,7 +1,8 @@
 import unittest
 import os
+import numpy as np
 import ImageProcessing as ip
-import ImageProcessingEdgeDetectors as ed
+import EdgeDetectors as ed
 
 IMG_DIR = '../img'
 COLOR_IMAGE_PATH = '../../SIDBA/Color/Lenna.bmp'
@@ -10,6 +11,229 @@ COLOR_IMAGE_WIDTH = 256
 GRAYSCALE_IMAGE_PATH = '../../SIDBA/Mono/LENNA.bmp'
 GRAYSCALE_IMAGE_HEIGHT = 256
 GRAYSCALE_IMAGE_WIDTH = 256
+GRAYSCALE_IMAGE_DIR = '../../SIDBA/Mono'
+REFERENCE_IMAGE_SIZE = 64
+
+def open_reference_image():
+    """Opens the top-left part of the grayscale image, which is small enough for the reference loops.
+    """
+    image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+    image._image = image._image[:REFERENCE_IMAGE_SIZE, :REFERENCE_IMAGE_SIZE].copy()
+    image._height = REFERENCE_IMAGE_SIZE
+    image._width = REFERENCE_IMAGE_SIZE
+
+    return image
+
+class TestEdgeDetector_channel_combination(unittest.TestCase):
+    """Tests EdgeDetector.channel_combination
+    """
+
+    def testLuminance(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+
+        for edge_detector in [ed.SobelEdgeDetector(), ed.PrewittEdgeDetector()]:
+            output_image = edge_detector.detect(image)
+
+            self.assertEqual('luminance', edge_detector.channel_combination)
+            self.assertEqual((COLOR_IMAGE_HEIGHT, COLOR_IMAGE_WIDTH), output_image._image.shape)
+            self.assertTrue(np.array_equal(edge_detector.detect(ip.Image(COLOR_IMAGE_PATH, grayscale=True))._image, output_image._image))
+
+    def testMax(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+        edge_detector = ed.SobelEdgeDetector()
+        edge_detector.channel_combination = 'max'
+
+        output_image = edge_detector.detect(image)
+
+        channel_images = [edge_detector.detect(ip.Image.from_array(image._image[:, :, c].copy())) for c in range(3)]
+        self.assertTrue(np.array_equal(np.maximum.reduce([channel_image._image for channel_image in channel_images]), output_image._image))
+
+    def testL2(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+        edge_detector = ed.RobertsEdgeDetector(amplifier=1.0)
+        edge_detector.channel_combination = 'l2'
+
+        output_image = edge_detector.detect(image)
+
+        strengths = [edge_detector._strength(image._image[:, :, c]) for c in range(3)]
+        expected = np.minimum(np.sqrt(sum(np.square(strength) for strength in strengths)), 255).astype(np.uint8)
+        self.assertTrue(np.array_equal(expected, output_image._image[1:-1, 1:-1]))
+        self.assertTrue(np.all(output_image._image[0, :] == 255))
+
+    def testInvalid(self):
+        edge_detector = ed.SobelEdgeDetector()
+
+        with self.assertRaises(ValueError):
+            edge_detector.channel_combination = 'sum'
+
+    def testBatch(self):
+        images = [ip.Image(COLOR_IMAGE_PATH), ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)]
+        edge_detector = ed.PrewittEdgeDetector()
+        edge_detector.channel_combination = 'l2'
+
+        output_images = edge_detector.detect_batch(images)
+
+        for image, output_image in zip(images, output_images):
+            self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+
+    def testDirection(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+
+        for edge_detector in [ed.PrewittEdgeDetector(), ed.CannyEdgeDetector()]:
+            for channel_combination in ['max', 'l2']:
+                edge_detector.channel_combination = channel_combination
+
+                output_image, direction_image = edge_detector.detect(image, direction=True)
+
+                self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+                self.assertEqual(image._image.shape[:2], direction_image._image.shape)
+
+class TestEdgeDetector_detect_batch(unittest.TestCase):
+    """Tests EdgeDetector.detect_batch
+    """
+
+    def testMixedSizes(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        images = [image, ip.Image.from_array(image._image[:100, :80].copy()), image.threshold(100), ip.Image.from_array(image._image[:2, :9].copy())]
+
+        for edge_detector in [ed.SobelEdgeDetector(), ed.PrewittEdgeDetector()]:
+            output_images = edge_detector.detect_batch(images)
+
+            self.assertEqual(len(images), len(output_images))
+            for image, output_image in zip(images, output_images):
+                self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+            self.assertIs(output_images[0]._image.base, output_images[2]._image.base)
+
+    def testChunks(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        images = [image, image.threshold(100), ip.Image(COLOR_IMAGE_PATH), image.crop(0, 0, 50, 50)] * 3
+        batch_pixels = ed.BATCH_PIXELS
+        ed.BATCH_PIXELS = 2 * image.height * image.width
+        try:
+            output_images = ed.SobelEdgeDetector().detect_batch(images)
+        finally:
+            ed.BATCH_PIXELS = batch_pixels
+
+        for image, output_image in zip(images, output_images):
+            self.assertTrue(np.array_equal(ed.SobelEdgeDetector().detect(image)._image, output_image._image))
+        self.assertIs(output_images[0]._image.base, output_images[9]._image.base)
+
+    def testDetectOnly(self):
+        class InvertingEdgeDetector(ed.EdgeDetector):
+            def detect(self, image):
+                return ip.Image.from_array(255 - image._image)
+
+        images = [ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True), ip.Image.from_array(np.zeros((2, 3), np.uint8))]
+
+        output_images = InvertingEdgeDetector().detect_batch(images)
+
+        self.assertEqual(len(images), len(output_images))
+        for image, output_image in zip(images, output_images):
+            self.assertTrue(np.array_equal(255 - image._image, output_image._image))
+
+    def testDirectory(self):
+        edge_detector = ed.RobertsEdgeDetector()
+
+        output_images = edge_detector.detect_batch(GRAYSCALE_IMAGE_DIR)
+
+        self.assertEqual(len(os.listdir(GRAYSCALE_IMAGE_DIR)), len(output_images))
+        self.assertTrue(np.array_equal(edge_detector.detect(ip.Image(GRAYSCALE_IMAGE_DIR + '/Airplane.bmp', grayscale=True))._image,
+                                       output_images[0]._image))
+
+class TestEdgeDetector_detect_tiled(unittest.TestCase):
+    """Tests EdgeDetector.detect_tiled
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).save(IMG_DIR + '/TestEdgeDetector_detect_tiled_input.npy')
+        image = ip.Image(IMG_DIR + '/TestEdgeDetector_detect_tiled_input.npy', mmap=True)
+
+        for edge_detector in [ed.SobelEdgeDetector(), ed.PrewittEdgeDetector()]:
+            for strip_height in [1, 50, 256, 1000]:
+                output_image = edge_detector.detect_tiled(image, IMG_DIR + '/TestEdgeDetector_detect_tiled_testNormal.npy', strip_height)
+
+                self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+
+    def testWorkers(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.SobelEdgeDetector()
+
+        output_image = edge_detector.detect_tiled(image, IMG_DIR + '/TestEdgeDetector_detect_tiled_testWorkers.npy', 30, workers=4)
+
+        self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+
+class TestEdgeDetector_detect_parallel(unittest.TestCase):
+    """Tests EdgeDetector.detect_parallel
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        for edge_detector in [ed.DifferenceEdgeDetector(), ed.RobertsEdgeDetector(), ed.SobelEdgeDetector(), ed.PrewittEdgeDetector()]:
+            for workers in [None, 1, 3, 8, 300]:
+                output_image = edge_detector.detect_parallel(image, workers)
+
+                self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
+
+class TestEdgeDetector_detect_level(unittest.TestCase):
+    """Tests EdgeDetector.detect_level
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        for edge_detector in [ed.SobelEdgeDetector(), ed.PrewittEdgeDetector()]:
+            output_image = edge_detector.detect_level(image, 2)
+
+            self.assertEqual((GRAYSCALE_IMAGE_HEIGHT // 4, GRAYSCALE_IMAGE_WIDTH // 4), output_image._image.shape)
+            self.assertTrue(np.array_equal(edge_detector.detect(image.pyramid_level(2))._image, output_image._image))
+
+class TestEdgeDetector_detect_coarse_to_fine(unittest.TestCase):
+    """Tests EdgeDetector.detect_coarse_to_fine
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.SobelEdgeDetector(amplifier=1.0)
+
+        output_image = edge_detector.detect_coarse_to_fine(image, level=2, threshold=128, tile=16)
+
+        expected = edge_detector.detect(image)._image
+        detected = output_image._image != 0
+        self.assertTrue(np.array_equal(expected[detected], output_image._image[detected]))
+        self.assertTrue(np.all(detected[expected == 255]))
+        self.assertTrue(np.any(~detected))
+        output_image.save(IMG_DIR + '/TestEdgeDetector_detect_coarse_to_fine_testNormal.bmp')
+
+    def testKeepsPyramid(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        copy = image.copy(copy_on_write=True)
+
+        copy_output_image = ed.SobelEdgeDetector().detect_coarse_to_fine(copy, level=2)
+        level_image = image.pyramid_level(2)
+        ed.SobelEdgeDetector().detect_coarse_to_fine(image, level=2)
+
+        self.assertIs(level_image._image, image.pyramid_level(2)._image)
+        self.assertIs(image._image, copy._image)
+        self.assertEqual(image.height, copy_output_image.height)
+
+    def testSparse(self):
+        array = np.full((300, 200), 60, np.uint8)
+        array[100:140, 50:90] = 200
+        image = ip.Image.from_array(array)
+
+        for edge_detector in [ed.SobelEdgeDetector(size=5), ed.PrewittEdgeDetector()]:
+            output_image = edge_detector.detect_coarse_to_fine(image, level=2)
+
+            self.assertTrue(np.array_equal(edge_detector.detect(image)._image, output_image._image))
 
 class TestDifferenceEdgeDetector_init(unittest.TestCase):
     """Tests DifferenceEdgeDetector.__init__
@@ -38,6 +262,15 @@ class TestDifferenceEdgeDetector_detect(unittest.TestCase):
 
         output_image.save(IMG_DIR + '/TestDifferenceEdgeDetector_detect_testNormal.bmp')
 
+    def testReference(self):
+        image = open_reference_image()
+        edge_detector = ed.DifferenceEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+        reference_image = edge_detector.detect(image, reference=True)
+
+        self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+
 class TestRobertsEdgeDetector_init(unittest.TestCase):
     """Tests RobertsEdgeDetector.__init__
     """
@@ -65,6 +298,88 @@ class TestRobertsEdgeDetector_detect(unittest.TestCase):
 
         output_image.save(IMG_DIR + '/TestRobertsEdgeDetector_detect_testNormal.bmp')
 
+    def testReference(self):
+        image = open_reference_image()
+        edge_detector = ed.RobertsEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+        reference_image = edge_detector.detect(image, reference=True)
+
+        self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+
+class TestGradientEdgeDetector_detect(unittest.TestCase):
+    """Tests GradientEdgeDetector.detect
+    """
+
+    def testUserOperator(self):
+        image = open_reference_image()
+        edge_detector = ed.GradientEdgeDetector([[3, 0, -3], [10, 0, -10], [3, 0, -3]],
+                                                [[3, 10, 3], [0, 0, 0], [-3, -10, -3]],
+                                                amplifier=0.5)
+
+        output_image = edge_detector.detect(image)
+        reference_image = edge_detector.detect(image, reference=True)
+
+        self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+
+    def testUint16(self):
+        image = open_reference_image().astype(np.uint16)
+        edge_detector = ed.SobelEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+        reference_image = edge_detector.detect(image, reference=True)
+
+        self.assertEqual(np.uint16, output_image.dtype)
+        self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+        self.assertTrue(np.all(output_image._image[0, :] == 65535))
+
+    def testFloat32(self):
+        image = open_reference_image()
+        edge_detector = ed.SobelEdgeDetector()
+
+        output_image = edge_detector.detect(image.astype(np.float32))
+
+        self.assertEqual(np.float32, output_image.dtype)
+        self.assertTrue(np.all(output_image._image <= 1.0))
+        self.assertLessEqual(np.abs(output_image.astype(np.uint8)._image.astype(int) - edge_detector.detect(image)._image).max(), 1)
+
+    def testSmallImage(self):
+        image = ip.Image(height=2, width=5, grayscale=True)
+        edge_detector = ed.SobelEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+
+        self.assertTrue(np.all(output_image._image == 255))
+
+    def testLazy(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True, lazy=True)
+        edge_detector = ed.SobelEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+
+        self.assertTrue(np.array_equal(edge_detector.detect(ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True))._image, output_image._image))
+
+    def testLargeOperator(self):
+        image = open_reference_image()
+        rng = np.random.default_rng(0)
+        for size in [5, 11]:
+            edge_detector = ed.GradientEdgeDetector(rng.integers(-3, 4, (size, size)).tolist(),
+                                                    rng.integers(-3, 4, (size, size)).tolist(),
+                                                    amplifier=0.05)
+
+            output_image = edge_detector.detect(image)
+            reference_image = edge_detector.detect(image, reference=True)
+
+            self.assertEqual(size // 2, edge_detector.HALO)
+            self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+            self.assertTrue(np.all(output_image._image[:size // 2, :] == 255))
+
+    def testInvalidOperator(self):
+        with self.assertRaises(ValueError):
+            ed.GradientEdgeDetector([[1, -1], [1, -1]], [[1, 1], [-1, -1]])
+        with self.assertRaises(ValueError):
+            ed.GradientEdgeDetector([[0, 0, 0], [0, -1, 1], [0, 0, 0]], [[1]])
+
 class TestSobelEdgeDetector_init(unittest.TestCase):
     """Tests SobelEdgeDetector.__init__
     """
@@ -75,6 +390,17 @@ class TestSobelEdgeDetector_init(unittest.TestCase):
         self.assertEqual(edge_detector._sobel_ope_x, edge_detector._ope_x)
         self.assertEqual(edge_detector._sobel_ope_y, edge_detector._ope_y)
         self.assertEqual(4.0, edge_detector._amplifier)
+        self.assertEqual([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], edge_detector._ope_x)
+
+    def testSize(self):
+        edge_detector = ed.SobelEdgeDetector(size=5)
+
+        self.assertEqual([-1, -2, 0, 2, 1], edge_detector._ope_x[0])
+        self.assertEqual([-6, -12, 0, 12, 6], edge_detector._ope_x[2])
+        self.assertEqual(np.array(edge_detector._ope_x).T.tolist(), edge_detector._ope_y)
+        self.assertEqual(2, edge_detector.HALO)
+        with self.assertRaises(ValueError):
+            ed.SobelEdgeDetector(size=4)
 
 class TestSobelEdgeDetector_detect(unittest.TestCase):
     """Tests SobelEdgeDetector.detect
@@ -92,6 +418,105 @@ class TestSobelEdgeDetector_detect(unittest.TestCase):
 
         output_image.save(IMG_DIR + '/TestSobelEdgeDetector_detect_testNormal.bmp')
 
+    def testReference(self):
+        image = open_reference_image()
+        edge_detector = ed.SobelEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+        reference_image = edge_detector.detect(image, reference=True)
+
+        self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+        self.assertTrue(np.all(output_image._image[0, :] == 255))
+        self.assertTrue(np.all(output_image._image[:, -1] == 255))
+
+    def testSize(self):
+        image = open_reference_image()
+        for size in [5, 7]:
+            edge_detector = ed.SobelEdgeDetector(amplifier=4.0 / 4 ** (size - 3), size=size)
+
+            output_image = edge_detector.detect(image)
+            reference_image = edge_detector.detect(image, reference=True)
+
+            self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+            self.assertTrue(np.all(output_image._image[:, -(size // 2):] == 255))
+
+    def testSizeStrips(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.SobelEdgeDetector(amplifier=0.02, size=7)
+
+        output_image = edge_detector.detect(image)
+
+        self.assertTrue(np.array_equal(output_image._image, edge_detector.detect_parallel(image, 5)._image))
+        self.assertTrue(np.array_equal(output_image._image, edge_detector.detect_batch([image, image])[1]._image))
+        output_image.save(IMG_DIR + '/TestSobelEdgeDetector_detect_testSizeStrips.bmp')
+
+class TestCannyEdgeDetector_detect(unittest.TestCase):
+    """Tests CannyEdgeDetector.detect
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.CannyEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+
+        self.assertEqual({0, 255}, set(np.unique(output_image._image)))
+        self.assertTrue(np.all(output_image._image[0, :] == 0))
+        output_image.save(IMG_DIR + '/TestCannyEdgeDetector_detect_testNormal.bmp')
+
+    def testFlat(self):
+        image = ip.Image.from_array(np.full((50, 50), 100, np.uint8))
+        edge_detector = ed.CannyEdgeDetector()
+
+        output_image, direction_image = edge_detector.detect(image, direction=True)
+
+        self.assertEqual(0, np.count_nonzero(edge_detector.detect(image)._image))
+        self.assertEqual(0, np.count_nonzero(output_image._image))
+        self.assertEqual(0, np.count_nonzero(edge_detector.detect_coarse_to_fine(image)._image))
+
+    def testThin(self):
+        array = np.full((32, 32), 50, np.uint8)
+        array[:, 16:] = 200
+        image = ip.Image.from_array(array)
+
+        output_image, direction_image = ed.CannyEdgeDetector().detect(image, direction=True)
+        transposed_image, transposed_direction_image = ed.CannyEdgeDetector().detect(ip.Image.from_array(array.T.copy()), direction=True)
+
+        self.assertTrue(np.all(np.count_nonzero(output_image._image[1:-1, 1:-1], axis=1) == 1))
+        self.assertTrue(np.all(direction_image._image[1:-1, 1:-1][output_image._image[1:-1, 1:-1] == 255] == 0))
+        self.assertTrue(np.array_equal(output_image._image.T, transposed_image._image))
+        self.assertTrue(np.all(transposed_direction_image._image[1:-1, 1:-1][transposed_image._image[1:-1, 1:-1] == 255] == 2))
+
+    def testHysteresis(self):
+        array = np.full((40, 40), 100, np.uint8)
+        array[:, 10:] += 20
+        array[:20, 30:] += 60
+        array[20:, 30:] += 20
+        image = ip.Image.from_array(array)
+
+        output_image = ed.CannyEdgeDetector(low=0.05, high=0.2).detect(image)
+
+        self.assertFalse(np.any(output_image._image[1:-1, 5:15]))
+        self.assertTrue(np.all(np.count_nonzero(output_image._image[1:18, 25:35], axis=1) == 1))
+        self.assertTrue(np.all(np.count_nonzero(output_image._image[22:-1, 25:35], axis=1) == 1))
+
+    def testBatch(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        edge_detector = ed.CannyEdgeDetector()
+
+        output_image = edge_detector.detect(image)
+
+        self.assertTrue(np.array_equal(output_image._image, edge_detector.detect_parallel(image, 4)._image))
+        self.assertTrue(np.array_equal(output_image._image, edge_detector.detect_batch([image, image.crop(0, 0, 100, 100), image])[2]._image))
+
+    def testInvalidThreshold(self):
+        with self.assertRaises(ValueError):
+            ed.CannyEdgeDetector(low=0.3, high=0.2)
+
 class TestPrewittEdgeDetector_detect(unittest.TestCase):
     """Tests PrewittEdgeDetector.detect
     """
@@ -107,3 +532,15 @@ class TestPrewittEdgeDetector_detect(unittest.TestCase):
         output_image = edge_detector.detect(image)
 
         output_image.save(IMG_DIR + '/TestPrewittEdgeDetector_detect_testNormal.bmp')
+
+    def testReference(self):
+        image = open_reference_image()
+        edge_detector = ed.PrewittEdgeDetector()
+
+        output_image, direction_image = edge_detector.detect(image, direction=True)
+        reference_image, reference_direction_image = edge_detector.detect(image, reference=True, direction=True)
+
+        self.assertTrue(np.array_equal(reference_image._image, output_image._image))
+        self.assertTrue(np.array_equal(reference_direction_image._image, direction_image._image))
+        self.assertEqual(np.uint8, direction_image._image.dtype)
+        self.assertTrue(np.all(direction_image._image < 8))
@@ -1,5 +1,6 @@
 import unittest
 import os
+import numpy as np
 import ImageProcessing as ip
 
 IMG_DIR = '../img'
@@ -9,6 +10,8 @@ COLOR_IMAGE_WIDTH = 256
 GRAYSCALE_IMAGE_PATH = '../../SIDBA/Mono/LENNA.bmp'
 GRAYSCALE_IMAGE_HEIGHT = 256
 GRAYSCALE_IMAGE_WIDTH = 256
+GRAYSCALE_IMAGE_DIR = '../../SIDBA/Mono'
+TEXT_IMAGE_PATH = '../../SIDBA/Mono/Text.bmp'
 
 class TestImage_init(unittest.TestCase):
     """Tests Image.__init__
@@ -45,6 +48,25 @@ class TestImage_init(unittest.TestCase):
         self.assertEqual(WIDTH, image._width)
         # image.save(IMG_DIR + '/TestImage_init_testWhiteImage.bmp')
 
+    def testLazy(self):
+        image = ip.Image(COLOR_IMAGE_PATH, lazy=True)
+
+        self.assertIsNone(image._pixels)
+        self.assertEqual(COLOR_IMAGE_HEIGHT, image.height)
+        self.assertEqual(COLOR_IMAGE_WIDTH, image.width)
+
+    def testWhiteImageDtype(self):
+        image = ip.Image(height=20, width=30, grayscale=True, dtype=np.uint16)
+
+        self.assertEqual(np.uint16, image.dtype)
+        self.assertTrue(np.all(image._image == 65535))
+
+    def testSlots(self):
+        image = ip.Image()
+
+        with self.assertRaises(AttributeError):
+            image.name = 'image'
+
 class TestImage_getitem_setitem(unittest.TestCase):
     """Tests Image.__getitem__, __setitem__
     """
@@ -83,6 +105,34 @@ class TestImage_height(unittest.TestCase):
 
         self.assertEqual(256, image.height)
 
+class TestImage_astype(unittest.TestCase):
+    """Tests Image.astype
+    """
+
+    def testUint16(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = image.astype(np.uint16)
+
+        self.assertEqual(np.uint16, output_image.dtype)
+        self.assertEqual(int(image[0, 0]) * 257, output_image[0, 0])
+        self.assertTrue(np.array_equal(image._image, output_image.astype(np.uint8)._image))
+
+    def testFloat32(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = image.astype(np.float32)
+
+        self.assertEqual(np.float32, output_image.dtype)
+        self.assertLessEqual(output_image._image.max(), 1.0)
+        self.assertTrue(np.array_equal(image._image, output_image.astype(np.uint8)._image))
+
+    def testUnsupported(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        with self.assertRaises(ValueError):
+            image.astype(np.float64)
+
 class TestImage_open(unittest.TestCase):
     """Tests Image.open
     """
@@ -105,6 +155,133 @@ class TestImage_open(unittest.TestCase):
         self.assertEqual(GRAYSCALE_IMAGE_HEIGHT, image._height)
         self.assertEqual(GRAYSCALE_IMAGE_WIDTH, image._width)
 
+    def testBmpMapped(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH)
+        expected = np.array(ip.Image(GRAYSCALE_IMAGE_PATH)._image)
+
+        image[0, 0] = 255 - image[0, 0]
+
+        self.assertFalse(image._image.flags.owndata)
+        self.assertTrue(np.array_equal(expected, ip.Image(GRAYSCALE_IMAGE_PATH)._image))
+
+    def testBmpClosesFile(self):
+        if not os.path.exists('/proc/self/fd'):
+            self.skipTest('needs /proc/self/fd')
+        count = len(os.listdir('/proc/self/fd'))
+
+        images = [ip.Image(GRAYSCALE_IMAGE_PATH) for _ in range(300)]
+
+        self.assertEqual(count, len(os.listdir('/proc/self/fd')))
+        self.assertEqual(300, len(images))
+
+    def testBmpSaveToSamePath(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+        path = IMG_DIR + '/TestImage_open_testBmpSaveToSamePath.bmp'
+        ip.Image(GRAYSCALE_IMAGE_PATH).save(path)
+        image = ip.Image(path)
+
+        image.threshold(100, inplace=True).save(path)
+
+        self.assertTrue(np.array_equal(image._image, ip.Image(path)._image))
+
+    def testColorImageToGrayscale(self):
+        from PIL import Image as im
+        image = ip.Image(COLOR_IMAGE_PATH, grayscale=True)
+
+        self.assertTrue(np.array_equal(np.array(im.open(COLOR_IMAGE_PATH).convert('L')), image._image))
+
+class TestImage_memmap(unittest.TestCase):
+    """Tests Image.memmap, Image.open with mmap
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        image = ip.Image.memmap(IMG_DIR + '/TestImage_memmap_testNormal.npy', 30, 20)
+        image[:, :] = 7
+        image[:, :].flush()
+
+        mapped_image = ip.Image(IMG_DIR + '/TestImage_memmap_testNormal.npy', mmap=True)
+
+        self.assertIsInstance(mapped_image._image, np.memmap)
+        self.assertEqual(30, mapped_image.height)
+        self.assertEqual(20, mapped_image.width)
+        self.assertTrue(np.all(mapped_image._image == 7))
+
+    def testBmp(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, mmap=True)
+
+        base = image._image
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        self.assertTrue(np.array_equal(ip.Image(GRAYSCALE_IMAGE_PATH)._image, image._image))
+
+class TestImage_strips(unittest.TestCase):
+    """Tests Image.strips
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        strips = list(image.strips(100, halo=1))
+
+        self.assertEqual([(0, 100), (100, 200), (200, 256)], [(top, bottom) for top, bottom, strip in strips])
+        self.assertEqual([101, 102, 57], [strip.height for top, bottom, strip in strips])
+        self.assertTrue(np.shares_memory(image._image, strips[1][2]._image))
+        self.assertTrue(np.array_equal(image._image[99:201], strips[1][2]._image))
+
+class TestImage_open_lazy(unittest.TestCase):
+    """Tests Image.open with lazy
+    """
+
+    def testGetitem(self):
+        image = ip.Image()
+
+        image.open(GRAYSCALE_IMAGE_PATH, grayscale=True, lazy=True)
+
+        self.assertIsNone(image._pixels)
+        self.assertEqual(ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)[10, 20], image[10, 20])
+        self.assertIsNotNone(image._pixels)
+        self.assertIsNone(image._source)
+
+    def testThreshold(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True, lazy=True)
+
+        output_image = image.threshold(100)
+
+        self.assertTrue(np.array_equal(ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).threshold(100)._image, output_image._image))
+
+    def testReopen(self):
+        image = ip.Image.from_array(np.zeros((4, 4), dtype=np.uint8))
+        image.histogram()
+        image.integral()
+        image.pyramid_level(1)
+        image.crop(0, 0, 2, 2)
+
+        image.open(GRAYSCALE_IMAGE_PATH, grayscale=True, lazy=True)
+
+        expected_image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        self.assertTrue(np.array_equal(expected_image.histogram(), image.histogram()))
+        self.assertTrue(np.array_equal(expected_image.integral(), image.integral()))
+        self.assertEqual((128, 128), image.pyramid_level(1)._image.shape)
+        self.assertIsNone(image._views)
+
+    def testNpy(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+        ip.Image(COLOR_IMAGE_PATH).save(IMG_DIR + '/TestImage_open_lazy_testNpy.npy')
+
+        image = ip.Image(IMG_DIR + '/TestImage_open_lazy_testNpy.npy', mmap=True, lazy=True)
+
+        self.assertIsNone(image._pixels)
+        self.assertEqual(COLOR_IMAGE_HEIGHT, image.height)
+        self.assertEqual(COLOR_IMAGE_WIDTH, image.width)
+        self.assertIsInstance(image._image, np.memmap)
+
 class TestImage_save(unittest.TestCase):
     """Tests Image.save
     """
@@ -118,6 +295,15 @@ class TestImage_save(unittest.TestCase):
 
         image.save(IMG_DIR + '/TestImage_save_testNormal.bmp')
 
+    def testRgbaBmp(self):
+        array = np.random.default_rng(0).integers(0, 256, (8, 8, 4)).astype(np.uint8)
+        ip.Image.from_array(array).save(IMG_DIR + '/TestImage_save_testRgbaBmp.png')
+        image = ip.Image(IMG_DIR + '/TestImage_save_testRgbaBmp.png')
+
+        image.save(IMG_DIR + '/TestImage_save_testRgbaBmp.bmp')
+
+        self.assertTrue(np.array_equal(array[:, :, :3], ip.Image(IMG_DIR + '/TestImage_save_testRgbaBmp.bmp')._image[:, :, :3]))
+
 class TestImage_copy(unittest.TestCase):
     """Tests Image.copy
     """
@@ -140,6 +326,108 @@ class TestImage_copy(unittest.TestCase):
         self.assertEqual(image._height, copy._height)
         self.assertEqual(image._width, copy._width)
 
+    def testCopyOnWrite(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        value = image[0, 0]
+
+        copy = image.copy(copy_on_write=True)
+
+        self.assertIs(image._image, copy._image)
+        copy[0, 0] = 255 - value
+        self.assertIsNot(image._image, copy._image)
+        self.assertEqual(value, image[0, 0])
+        self.assertEqual(255 - value, copy[0, 0])
+
+    def testCopyOnWriteSource(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        value = image[0, 0]
+        copy = image.copy(copy_on_write=True)
+        second_copy = image.copy(copy_on_write=True)
+
+        image[0, 0] = 255 - value
+        image.threshold(100, inplace=True)
+
+        self.assertEqual(value, copy[0, 0])
+        self.assertIs(copy._image, second_copy._image)
+        second_copy[0, 0] = 0
+        self.assertEqual(value, copy[0, 0])
+
+    def testCopyOnWriteAfterCrop(self):
+        image = ip.Image.from_array(np.zeros((4, 4), dtype=np.uint8))
+        view = image.crop(0, 0, 2, 2)
+
+        copy = image.copy(copy_on_write=True)
+        view_copy = view.copy(copy_on_write=True)
+        view[0, 0] = 55
+
+        self.assertEqual(55, image[0, 0])
+        self.assertEqual(0, copy[0, 0])
+        self.assertEqual(0, view_copy[0, 0])
+
+    def testCopyOnWriteAfterCropReleased(self):
+        image = ip.Image.from_array(np.zeros((4, 4), dtype=np.uint8))
+        image.crop(0, 0, 2, 2)
+
+        copy = image.copy(copy_on_write=True)
+
+        self.assertIs(image._image, copy._image)
+
+class TestImage_crop(unittest.TestCase):
+    """Tests Image.crop
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        view = image.crop(10, 20, 30, 40)
+
+        self.assertEqual(30, view.height)
+        self.assertEqual(40, view.width)
+        self.assertEqual(image[10, 20], view[0, 0])
+        view[0, 0] = 255 - image[10, 20]
+        self.assertEqual(view[0, 0], image[10, 20])
+
+    def testKeepsCaches(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        histogram = image.histogram()
+        level_image = image.pyramid_level(1)
+
+        image.crop(10, 20, 30, 40)
+
+        self.assertIs(histogram, image.histogram())
+        self.assertIs(level_image._image, image.pyramid_level(1)._image)
+
+    def testCropOfView(self):
+        image = ip.Image.from_array(np.zeros((4, 4), dtype=np.uint8))
+
+        view = image.crop(1, 1, 3, 3).crop(1, 1, 2, 2)
+        view[0, 0] = 9
+
+        self.assertIs(image, view._parent)
+        self.assertEqual(9, image[2, 2])
+
+class TestImage_empty_like_full_like(unittest.TestCase):
+    """Tests Image.empty_like, Image.full_like
+    """
+
+    def testEmptyLike(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+
+        output_image = ip.Image.empty_like(image)
+
+        self.assertEqual(image._image.shape, output_image._image.shape)
+        self.assertEqual(image._image.dtype, output_image._image.dtype)
+        self.assertFalse(np.shares_memory(image._image, output_image._image))
+
+    def testFullLike(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = ip.Image.full_like(image, 7, dtype=np.float32)
+
+        self.assertEqual(image._image.shape, output_image._image.shape)
+        self.assertEqual(np.float32, output_image._image.dtype)
+        self.assertTrue(np.all(output_image._image == 7))
+
 class TestImage_threshold(unittest.TestCase):
     """Tests Image.threshold
     """
@@ -154,3 +442,590 @@ class TestImage_threshold(unittest.TestCase):
         output_image = image.threshold(100)
 
         output_image.save(IMG_DIR + '/TestImage_threshold_testNormal.bmp')
+
+    def testValues(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = image.threshold(100, high=200, low=10)
+
+        self.assertNotEqual(id(image._image), id(output_image._image))
+        self.assertTrue(np.array_equal(np.where(image._image <= 100, 10, 200), output_image._image))
+
+    def testInplace(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        expected = np.where(image._image <= 100, 0, 255)
+
+        output_image = image.threshold(100, inplace=True)
+
+        self.assertIs(image, output_image)
+        self.assertTrue(np.array_equal(expected, image._image))
+
+    def testOut(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        out = image.copy()
+        buffer = out._image
+
+        output_image = image.threshold(100, out=out)
+
+        self.assertIs(out, output_image)
+        self.assertIs(buffer, out._image)
+        self.assertTrue(np.array_equal(np.where(image._image <= 100, 0, 255), out._image))
+
+    def testOutShapeMismatch(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        out = ip.Image(height=10, width=10, grayscale=True)
+
+        with self.assertRaises(ValueError):
+            image.threshold(100, out=out)
+
+    def testUint16(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).astype(np.uint16)
+
+        output_image = image.threshold(100 * 257)
+
+        self.assertEqual(np.uint16, output_image.dtype)
+        self.assertTrue(np.array_equal(np.where(image._image <= 100 * 257, 0, 65535), output_image._image))
+
+    def testBinary(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = image.threshold(100, high=200, low=10, binary=True)
+
+        self.assertIsInstance(output_image, ip.BinaryImage)
+        self.assertEqual((GRAYSCALE_IMAGE_HEIGHT, GRAYSCALE_IMAGE_WIDTH // 8), output_image.bits.shape)
+        self.assertTrue(np.array_equal(image.threshold(100, high=200, low=10)._image, output_image.unpack()))
+
+    def testBinaryOut(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        out = ip.BinaryImage(GRAYSCALE_IMAGE_HEIGHT, GRAYSCALE_IMAGE_WIDTH)
+        buffer = out.bits
+
+        output_image = image.threshold('otsu', binary=True, out=out)
+
+        self.assertIs(out, output_image)
+        self.assertIs(buffer, out.bits)
+        self.assertTrue(np.array_equal(image.threshold('otsu')._image, out.unpack()))
+        with self.assertRaises(ValueError):
+            image.threshold(100, binary=True, out=ip.BinaryImage(10, 10))
+        with self.assertRaises(ValueError):
+            image.threshold(100, binary=True, inplace=True)
+        with self.assertRaises(ValueError):
+            ip.Image(COLOR_IMAGE_PATH).threshold(100, binary=True)
+
+class TestImage_histogram(unittest.TestCase):
+    """Tests Image.histogram
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        histogram = image.histogram()
+
+        self.assertEqual(256, len(histogram))
+        self.assertEqual(GRAYSCALE_IMAGE_HEIGHT * GRAYSCALE_IMAGE_WIDTH, histogram.sum())
+        self.assertEqual(np.count_nonzero(image._image == 100), histogram[100])
+
+    def testInvalidate(self):
+        image = ip.Image.from_array(np.zeros((2, 2), dtype=np.uint8))
+        self.assertEqual(4, image.histogram()[0])
+
+        image[0, 0] = 7
+        self.assertEqual(3, image.histogram()[0])
+        self.assertEqual(1, image.histogram()[7])
+
+        image.threshold(5, inplace=True)
+        self.assertEqual(1, image.histogram()[255])
+
+    def testInvalidateByView(self):
+        image = ip.Image.from_array(np.zeros((4, 4), dtype=np.uint8))
+        view = image.crop(0, 0, 2, 2)
+        second_view = image.crop(1, 1, 2, 2)
+        self.assertEqual(16, image.histogram()[0])
+        self.assertEqual(4, second_view.histogram()[0])
+
+        view[1, 1] = 7
+
+        self.assertEqual(1, image.histogram()[7])
+        self.assertEqual(1, second_view.histogram()[7])
+        image[0, 0] = 7
+        self.assertEqual(2, view.histogram()[7])
+
+    def testUint16(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).astype(np.uint16)
+
+        self.assertEqual(65536, len(image.histogram()))
+
+    def testFloat(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).astype(np.float32)
+
+        with self.assertRaises(ValueError):
+            image.histogram()
+
+class TestImage_auto_threshold(unittest.TestCase):
+    """Tests Image.auto_threshold
+    """
+
+    def testOtsu(self):
+        array = np.full((10, 10), 40, dtype=np.uint8)
+        array[:, 6:] = 200
+        image = ip.Image.from_array(array)
+
+        threshold = image.auto_threshold()
+
+        self.assertTrue(40 <= threshold < 200)
+        self.assertTrue(np.array_equal(array > threshold, image.threshold('otsu')._image == 255))
+
+    def testMeanPercentile(self):
+        image = ip.Image.from_array(np.arange(100, dtype=np.uint8).reshape(10, 10))
+
+        self.assertEqual(49, image.auto_threshold('mean'))
+        self.assertEqual(49, image.auto_threshold('percentile'))
+        self.assertEqual(89, image.auto_threshold('percentile', percentile=90))
+
+    def testInvalidMethod(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        with self.assertRaises(ValueError):
+            image.auto_threshold('unknown')
+
+    def testBatch(self):
+        images = [ip.Image(GRAYSCALE_IMAGE_DIR + '/' + name, grayscale=True) for name in ('Airplane.bmp', 'LENNA.bmp')]
+
+        output_images = ip.Image.threshold_batch(images, 'otsu')
+
+        for image, output_image in zip(images, output_images):
+            self.assertTrue(np.array_equal(image.threshold('otsu')._image, output_image._image))
+
+class TestPointOperations_lut(unittest.TestCase):
+    """Tests PointOperations.lut
+    """
+
+    def testComposition(self):
+        for dtype in (np.uint8, np.uint16):
+            operations = ip.PointOperations().add_gamma(2.2).add_stretch(10, 200).add_invert().add_threshold(100)
+
+            lut = operations.lut(dtype)
+
+            expected = ip.gamma_lut(dtype, 2.2)
+            expected = ip.stretch_lut(dtype, 10, 200)[expected]
+            expected = ip.invert_lut(dtype)[expected]
+            expected = ip.threshold_lut(dtype, 100)[expected]
+            self.assertEqual(dtype, lut.dtype)
+            self.assertTrue(np.array_equal(expected, lut))
+
+    def testValues(self):
+        self.assertTrue(np.array_equal(255 - np.arange(256), ip.invert_lut(np.uint8)))
+        self.assertEqual((0, 0, 128, 255, 255), tuple(ip.stretch_lut(np.uint8, 10, 20)[[0, 10, 15, 20, 30]]))
+        self.assertEqual((0, 128, 255), tuple(ip.gamma_lut(np.uint8, 1.0)[[0, 128, 255]]))
+        self.assertEqual(np.uint8(np.rint(np.sqrt(128 * 255))), ip.gamma_lut(np.uint8, 2.0)[128])
+
+    def testInvalid(self):
+        with self.assertRaises(ValueError):
+            ip.PointOperations().add_gamma(0)
+        with self.assertRaises(ValueError):
+            ip.PointOperations().add_stretch(20, 10)
+
+class TestImage_point(unittest.TestCase):
+    """Tests Image.point
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        operations = ip.PointOperations().add_gamma(0.5).add_stretch(30, 220).add_invert()
+
+        output_image = image.point(operations)
+
+        expected_image = image.gamma(0.5).stretch(30, 220).invert()
+        self.assertTrue(np.array_equal(expected_image._image, output_image._image))
+        output_image.save(IMG_DIR + '/TestImage_point_testNormal.bmp')
+
+    def testInplace(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+        expected = 255 - image._image
+
+        output_image = image.point(ip.PointOperations().add_invert(), inplace=True)
+
+        self.assertIs(image, output_image)
+        self.assertTrue(np.array_equal(expected, image._image))
+
+    def testFloat32(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).astype(np.float32)
+
+        output_image = image.point(ip.PointOperations().add_invert().add_threshold(0.5))
+
+        self.assertEqual(np.float32, output_image.dtype)
+        self.assertTrue(np.array_equal(np.where(1.0 - image._image <= 0.5, 0.0, 1.0), output_image._image))
+
+class TestImage_stretch(unittest.TestCase):
+    """Tests Image.stretch
+    """
+
+    def testAuto(self):
+        image = ip.Image.from_array(np.array([[10, 11], [12, 13]], dtype=np.uint8))
+
+        output_image = image.stretch()
+
+        self.assertTrue(np.array_equal([[0, 85], [170, 255]], output_image._image))
+
+    def testConstant(self):
+        image = ip.Image.from_array(np.full((2, 2), 7, dtype=np.uint8))
+
+        output_image = image.stretch()
+
+        self.assertTrue(np.array_equal(image._image, output_image._image))
+
+class TestImage_pyramid_level(unittest.TestCase):
+    """Tests Image.pyramid_level
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        values = image._image.astype(np.float64)
+
+        level1_image = image.pyramid_level(1)
+        level2_image = image.pyramid_level(2)
+
+        self.assertIs(image, image.pyramid_level(0))
+        self.assertEqual((128, 128), level1_image._image.shape)
+        self.assertEqual((64, 64), level2_image._image.shape)
+        self.assertEqual((values[:2, :2].sum() + 2) // 4, level1_image[0, 0])
+        self.assertTrue(np.abs(level2_image._image - values.reshape(64, 4, 64, 4).mean(axis=(1, 3))).max() <= 1)
+
+    def testOddColor(self):
+        image = ip.Image.from_array(ip.Image(COLOR_IMAGE_PATH)._image[:101, :51])
+
+        level_image = image.pyramid_level(1)
+
+        self.assertEqual((50, 25, 3), level_image._image.shape)
+        self.assertTrue(np.array_equal((image._image[98:100, 48:50].astype(int).sum(axis=(0, 1)) + 2) // 4, level_image[49, 24]))
+
+    def testCache(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        level_image = image.pyramid_level(2)
+
+        self.assertIs(level_image._image, image.pyramid_level(2)._image)
+        level_image[0, 0] = 0
+        self.assertIsNot(level_image._image, image.pyramid_level(2)._image)
+
+        image[0:4, 0:4] = 0
+        self.assertEqual(0, image.pyramid_level(2)[0, 0])
+
+    def testInvalidateByView(self):
+        image = ip.Image.from_array(np.zeros((4, 4), dtype=np.uint8))
+        view = image.crop(0, 0, 2, 2)
+        self.assertEqual(0, image.pyramid_level(1)[0, 0])
+
+        view[0:2, 0:2] = 100
+
+        self.assertEqual(100, image.pyramid_level(1)[0, 0])
+
+    def testInvalidLevel(self):
+        image = ip.Image.from_array(np.zeros((4, 9), np.uint8))
+
+        with self.assertRaises(ValueError):
+            image.pyramid_level(-1)
+        with self.assertRaises(ValueError):
+            image.pyramid_level(3)
+
+class TestImage_integral(unittest.TestCase):
+    """Tests Image.integral
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        table = image.integral()
+        squared_table = image.integral(squared=True)
+
+        self.assertEqual((GRAYSCALE_IMAGE_HEIGHT + 1, GRAYSCALE_IMAGE_WIDTH + 1), table.shape)
+        self.assertEqual(image._image[10:20, 30:50].sum(), table[20, 50] - table[10, 50] - table[20, 30] + table[10, 30])
+        self.assertEqual(np.square(image._image.astype(np.int64)).sum(), squared_table[-1, -1])
+        self.assertIs(table, image.integral())
+
+    def testInvalidate(self):
+        image = ip.Image.from_array(np.zeros((2, 2), dtype=np.uint8))
+        self.assertEqual(0, image.integral()[-1, -1])
+
+        image[1, 1] = 3
+
+        self.assertEqual(3, image.integral()[-1, -1])
+
+    def testLazyCache(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True, lazy=True)
+        self.assertIsNone(image._integrals)
+        self.assertIsNone(image._pyramid)
+
+        table = image.integral()
+        image.pyramid_level(1)
+
+        self.assertIs(table, image.integral())
+        self.assertEqual(1, len(image._pyramid))
+        image[0, 0] = 0
+        self.assertIsNone(image._integrals)
+        self.assertIsNone(image._pyramid)
+
+    def testInvalidateByView(self):
+        image = ip.Image.from_array(np.zeros((4, 4), dtype=np.uint8))
+        view = image.crop(2, 2, 2, 2)
+        self.assertEqual(0, image.integral()[-1, -1])
+
+        view[0, 0] = 3
+
+        self.assertEqual(3, image.integral()[-1, -1])
+
+class TestImage_box_mean_box_std(unittest.TestCase):
+    """Tests Image.box_mean and Image.box_std
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        values = image._image.astype(np.float64)
+
+        mean_image = image.box_mean(5)
+        std_image = image.box_std((3, 7))
+
+        for y, x in ((0, 0), (100, 50), (255, 3), (128, 255)):
+            window = values[max(0, y - 2):y + 3, max(0, x - 2):x + 3]
+            self.assertEqual(np.rint(window.mean()), mean_image[y, x])
+            window = values[max(0, y - 1):y + 2, max(0, x - 3):x + 4]
+            self.assertEqual(np.rint(window.std()), std_image[y, x])
+
+    def testColor(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+
+        mean_image = image.box_mean(3)
+
+        self.assertEqual(image._image.shape, mean_image._image.shape)
+        self.assertEqual(np.rint(image._image[9:12, 19:22, 1].mean()), mean_image[10, 20][1])
+
+    def testInvalidSize(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        with self.assertRaises(ValueError):
+            image.box_mean(4)
+
+class TestImage_adaptive_threshold(unittest.TestCase):
+    """Tests Image.adaptive_threshold
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        image = ip.Image(TEXT_IMAGE_PATH, grayscale=True)
+
+        output_image = image.adaptive_threshold(31, 'sauvola')
+
+        self.assertEqual({0, 255}, set(np.unique(output_image._image)))
+        output_image.save(IMG_DIR + '/TestImage_adaptive_threshold_testNormal.bmp')
+
+    def testMean(self):
+        image = ip.Image(TEXT_IMAGE_PATH, grayscale=True)
+
+        output_image = image.adaptive_threshold(15, offset=5, high=200, low=10)
+
+        expected = np.where(image._image <= image.box_mean(15)._image.astype(np.float64) - 5, 10, 200)
+        self.assertTrue(np.mean(expected == output_image._image) > 0.99)
+
+    def testUnevenLighting(self):
+        array = np.tile(np.linspace(20, 220, 64), (64, 1)).astype(np.uint8)
+        array[::8, :] //= 2
+        image = ip.Image.from_array(array)
+
+        output_image = image.adaptive_threshold(9, offset=2)
+
+        self.assertTrue(np.all(output_image._image[::8, :] == 0))
+        self.assertTrue(np.all(output_image._image[1::8, 4:-4] == 255))
+
+    def testInvalidMethod(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        with self.assertRaises(ValueError):
+            image.adaptive_threshold(3, 'unknown')
+
+class TestImage_threshold_batch(unittest.TestCase):
+    """Tests Image.threshold_batch
+    """
+
+    def testMixedSizes(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        images = [image, ip.Image.from_array(image._image[:100, :80]), ip.Image(COLOR_IMAGE_PATH), image.copy()]
+
+        output_images = ip.Image.threshold_batch(images, 100)
+
+        for image, output_image in zip(images, output_images):
+            self.assertTrue(np.array_equal(image.threshold(100)._image, output_image._image))
+        self.assertIs(output_images[0]._image.base, output_images[3]._image.base)
+
+    def testDirectory(self):
+        output_images = ip.Image.threshold_batch(GRAYSCALE_IMAGE_DIR, 100)
+
+        self.assertEqual(len(os.listdir(GRAYSCALE_IMAGE_DIR)), len(output_images))
+        self.assertTrue(np.array_equal(ip.Image(GRAYSCALE_IMAGE_DIR + '/Airplane.bmp', grayscale=True).threshold(100)._image,
+                                       output_images[0]._image))
+
+    def testBinary(self):
+        output_images = ip.Image.threshold_batch(GRAYSCALE_IMAGE_DIR, 'mean', binary=True)
+
+        image = ip.Image(GRAYSCALE_IMAGE_DIR + '/Airplane.bmp', grayscale=True)
+        self.assertTrue(np.array_equal(image.threshold('mean')._image, output_images[0].unpack()))
+
+class TestImage_open_directory(unittest.TestCase):
+    """Tests Image.open_directory
+    """
+
+    def testNormal(self):
+        images = ip.Image.open_directory(GRAYSCALE_IMAGE_DIR, grayscale=True)
+
+        self.assertEqual(len(os.listdir(GRAYSCALE_IMAGE_DIR)), len(images))
+        self.assertEqual(GRAYSCALE_IMAGE_HEIGHT, images[0].height)
+
+class TestLuminance(unittest.TestCase):
+    """Tests luminance
+    """
+
+    def testUint8(self):
+        image = ip.Image(COLOR_IMAGE_PATH)
+
+        array = ip.luminance(image._image)
+
+        self.assertTrue(np.array_equal(ip.Image(COLOR_IMAGE_PATH, grayscale=True)._image, array))
+
+    def testUint16(self):
+        image = ip.Image(COLOR_IMAGE_PATH).astype(np.uint16)
+
+        array = ip.luminance(image._image)
+
+        self.assertEqual(np.uint16, array.dtype)
+        self.assertLessEqual(np.abs(ip.luminance(ip.Image(COLOR_IMAGE_PATH)._image) * 257.0 - array).max(), 257)
+
+class TestImage_from_array(unittest.TestCase):
+    """Tests Image.from_array
+    """
+
+    def testNormal(self):
+        array = np.zeros((20, 30), np.uint8)
+
+        image = ip.Image.from_array(array)
+
+        self.assertIs(array, image._image)
+        self.assertEqual(20, image._height)
+        self.assertEqual(30, image._width)
+
+class TestBinaryImage_from_mask(unittest.TestCase):
+    """Tests BinaryImage.from_mask, BinaryImage.from_bits
+    """
+
+    def testOddWidth(self):
+        mask = np.random.default_rng(0).random((13, 21)) < 0.5
+
+        image = ip.BinaryImage.from_mask(mask, high=9, low=3)
+
+        self.assertEqual(13, image.height)
+        self.assertEqual(21, image.width)
+        self.assertEqual((13, 3), image.bits.shape)
+        self.assertTrue(np.array_equal(np.where(mask, 9, 3), image.unpack()))
+
+    def testInvalidBits(self):
+        with self.assertRaises(ValueError):
+            ip.BinaryImage.from_bits(np.zeros((4, 2), np.uint8), 17)
+
+class TestBinaryImage_getitem(unittest.TestCase):
+    """Tests BinaryImage.__getitem__
+    """
+
+    def testNormal(self):
+        mask = np.random.default_rng(0).random((13, 21)) < 0.5
+        image = ip.BinaryImage.from_mask(mask)
+        expected = np.where(mask, 255, 0)
+
+        self.assertEqual(expected[3, 17], image[3, 17])
+        self.assertTrue(np.array_equal(expected[5], image[5]))
+        self.assertTrue(np.array_equal(expected[:, 20], image[:, 20]))
+        self.assertTrue(np.array_equal(expected[2:9, 4:19], image[2:9, 4:19]))
+
+class TestBinaryImage_count(unittest.TestCase):
+    """Tests BinaryImage.count
+    """
+
+    def testNormal(self):
+        mask = np.random.default_rng(0).random((13, 21)) < 0.5
+
+        image = ip.BinaryImage.from_mask(mask)
+
+        self.assertEqual(np.count_nonzero(mask), image.count())
+        self.assertEqual(0, ip.BinaryImage(5, 7).count())
+
+class TestBinaryImage_operators(unittest.TestCase):
+    """Tests BinaryImage.__and__, __or__, __xor__, __invert__
+    """
+
+    def testNormal(self):
+        rng = np.random.default_rng(0)
+        mask1 = rng.random((13, 21)) < 0.5
+        mask2 = rng.random((13, 21)) < 0.5
+        image1 = ip.BinaryImage.from_mask(mask1)
+        image2 = ip.BinaryImage.from_mask(mask2)
+
+        self.assertTrue(np.array_equal(np.packbits(mask1 & mask2, axis=1), (image1 & image2).bits))
+        self.assertTrue(np.array_equal(np.packbits(mask1 | mask2, axis=1), (image1 | image2).bits))
+        self.assertTrue(np.array_equal(np.packbits(mask1 ^ mask2, axis=1), (image1 ^ image2).bits))
+        self.assertTrue(np.array_equal(np.packbits(~mask1, axis=1), (~image1).bits))
+        self.assertEqual(np.count_nonzero(~mask1), (~image1).count())
+
+    def testShapeMismatch(self):
+        with self.assertRaises(ValueError):
+            ip.BinaryImage(4, 8) & ip.BinaryImage(4, 9)
+
+class TestBinaryImage_unpack(unittest.TestCase):
+    """Tests BinaryImage.unpack, BinaryImage.to_image
+    """
+
+    def testDtype(self):
+        mask = np.random.default_rng(0).random((13, 21)) < 0.5
+        for dtype in ip.DTYPES:
+            image = ip.BinaryImage.from_mask(mask, dtype=dtype)
+
+            array = image.unpack()
+
+            self.assertEqual(dtype, array.dtype)
+            self.assertTrue(np.array_equal(np.where(mask, ip.max_pixel_value(dtype), 0), array))
+
+    def testToImage(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = image.threshold(100, binary=True).to_image()
+
+        self.assertIsInstance(output_image, ip.Image)
+        self.assertTrue(np.array_equal(image.threshold(100)._image, output_image._image))
+
+class TestBinaryImage_save_open(unittest.TestCase):
+    """Tests BinaryImage.save, BinaryImage.open
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        from PIL import Image as im
+        mask = np.random.default_rng(0).random((13, 21)) < 0.5
+        image = ip.BinaryImage.from_mask(mask)
+        for extension in ['.bmp', '.png']:
+            path = IMG_DIR + '/TestBinaryImage_save_open_testNormal' + extension
+
+            image.save(path)
+
+            self.assertEqual('1', im.open(path).mode)
+            self.assertTrue(np.array_equal(mask, np.array(im.open(path))))
+            self.assertTrue(np.array_equal(image.bits, ip.BinaryImage(path=path).bits))
+
+    def testGrayscaleImage(self):
+        image = ip.BinaryImage(path=GRAYSCALE_IMAGE_PATH)
+
+        self.assertTrue(np.array_equal(ip.Image(GRAYSCALE_IMAGE_PATH).threshold(127)._image, image.unpack()))
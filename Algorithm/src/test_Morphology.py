@@ -0,0 +1,162 @@
+import unittest
+import os
+import numpy as np
+import ImageProcessing as ip
+import Morphology as mo
+
+IMG_DIR = '../img'
+GRAYSCALE_IMAGE_PATH = '../../SIDBA/Mono/LENNA.bmp'
+COLOR_IMAGE_PATH = '../../SIDBA/Color/Lenna.bmp'
+TEXT_IMAGE_PATH = '../../SIDBA/Mono/Text.bmp'
+
+def naive(array, mask, erosion):
+    """Erodes or dilates the image data by scanning all the pixels of the structuring element.
+    """
+    radius = mask.shape[0] // 2
+    height, width = array.shape[:2]
+    identity = mo._identity(array.dtype, erosion)
+    padded = np.full((height + 2 * radius, width + 2 * radius) + array.shape[2:], identity, array.dtype)
+    padded[radius:radius + height, radius:radius + width] = array
+    output = np.full_like(array, identity)
+    function = np.minimum if erosion else np.maximum
+    for y, x in zip(*np.nonzero(mask)):
+        function(output, padded[y:y + height, x:x + width], out=output)
+
+    return output
+
+ELEMENTS = [mo.Rectangle(1), mo.Rectangle(3), mo.Rectangle(5, 9), mo.Rectangle(31, 17),
+            mo.Diamond(3), mo.Diamond(5), mo.Diamond(7), mo.Diamond(13),
+            mo.Octagon(3), mo.Octagon(9), mo.Octagon(21)]
+
+class TestStructuringElement_mask(unittest.TestCase):
+    """Tests StructuringElement.mask
+    """
+
+    def testRectangle(self):
+        mask = mo.Rectangle(3, 5).mask()
+
+        self.assertEqual((5, 5), mask.shape)
+        self.assertTrue(np.array_equal(np.pad(np.ones((3, 5), bool), ((1, 1), (0, 0))), mask))
+
+    def testDiamond(self):
+        y, x = np.mgrid[-4:5, -4:5]
+
+        mask = mo.Diamond(9).mask()
+
+        self.assertTrue(np.array_equal(np.abs(y) + np.abs(x) <= 4, mask))
+
+    def testOctagon(self):
+        mask = mo.Octagon(15).mask()
+
+        self.assertTrue(np.array_equal(mask, mask.T))
+        self.assertTrue(np.array_equal(mask, mask[::-1]))
+        self.assertTrue(mask[7].all())
+        self.assertFalse(mask[0, 0])
+
+    def testInvalidSize(self):
+        for size in [0, 4, -3]:
+            with self.assertRaises(ValueError):
+                mo.Octagon(size)
+        with self.assertRaises(ValueError):
+            mo.Rectangle(3, 2)
+
+class TestStructuringElement_erode_dilate(unittest.TestCase):
+    """Tests StructuringElement.erode, StructuringElement.dilate
+    """
+
+    def testGrayscaleImage(self):
+        array = np.random.default_rng(0).integers(0, 256, (37, 53)).astype(np.uint8)
+        image = ip.Image.from_array(array)
+        for element in ELEMENTS:
+            mask = element.mask()
+
+            self.assertTrue(np.array_equal(naive(array, mask, True), element.erode(image)._image))
+            self.assertTrue(np.array_equal(naive(array, mask, False), element.dilate(image)._image))
+
+    def testColorImage(self):
+        array = ip.Image(COLOR_IMAGE_PATH)._image[:40, :30]
+        image = ip.Image.from_array(array)
+        for element in [mo.Rectangle(5), mo.Diamond(5)]:
+            mask = element.mask()
+
+            self.assertTrue(np.array_equal(naive(array, mask, True), element.erode(image)._image))
+
+    def testDtype(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        element = mo.Octagon(9)
+        for dtype in ip.DTYPES:
+            output_image = element.dilate(image.astype(dtype))
+
+            self.assertEqual(dtype, output_image.dtype)
+            self.assertTrue(np.array_equal(element.dilate(image)._image, output_image.astype(np.uint8)._image))
+
+    def testVanHerk(self):
+        array = np.random.default_rng(0).integers(0, 256, (80, 20)).astype(np.uint8)
+        for size in [mo.VAN_HERK_MIN_SIZE, mo.VAN_HERK_MIN_SIZE + 2, 101]:
+            self.assertTrue(np.array_equal(mo._columns_shifted(array, size, np.minimum), mo._columns_van_herk(array, size, np.minimum, 255)))
+            self.assertTrue(np.array_equal(mo._columns_shifted(array, size, np.maximum), mo._columns_van_herk(array, size, np.maximum, 0)))
+
+    def testCopy(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = mo.Rectangle(1).erode(image)
+
+        self.assertFalse(np.shares_memory(image._image, output_image._image))
+        self.assertTrue(np.array_equal(image._image, output_image._image))
+
+class TestStructuringElement_binary(unittest.TestCase):
+    """Tests StructuringElement.erode, dilate, open and close with BinaryImage
+    """
+
+    def testNormal(self):
+        mask = (np.random.default_rng(0).random((29, 150)) < 0.6).astype(np.uint8)
+        image = ip.BinaryImage.from_mask(mask, high=200, low=10)
+        for element in ELEMENTS:
+            element_mask = element.mask()
+
+            eroded_image = element.erode(image)
+            dilated_image = element.dilate(image)
+
+            self.assertIsInstance(eroded_image, ip.BinaryImage)
+            self.assertTrue(np.array_equal(naive(mask, element_mask, True) == 1, eroded_image.unpack() == 200))
+            self.assertTrue(np.array_equal(naive(mask, element_mask, False) == 1, dilated_image.unpack() == 200))
+            self.assertTrue(np.array_equal(np.packbits(naive(mask, element_mask, False), axis=1), dilated_image.bits))
+
+    def testSameAsGrayscale(self):
+        image = ip.Image(TEXT_IMAGE_PATH, grayscale=True)
+        element = mo.Octagon(5)
+
+        output_image = element.close(image.threshold('otsu', binary=True))
+
+        self.assertTrue(np.array_equal(element.close(image.threshold('otsu'))._image, output_image.unpack()))
+
+class TestStructuringElement_open_close(unittest.TestCase):
+    """Tests StructuringElement.open, StructuringElement.close
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        array = np.zeros((30, 30), np.uint8)
+        array[5:20, 5:20] = 255
+        array[25, 25] = 255
+        array[12, 12] = 0
+        image = ip.Image.from_array(array)
+        expected = np.zeros((30, 30), np.uint8)
+        expected[5:20, 5:20] = 255
+
+        self.assertTrue(np.array_equal(expected, mo.Rectangle(3).close(mo.Rectangle(3).open(image))._image))
+
+    def testTextImage(self):
+        image = ip.Image(TEXT_IMAGE_PATH, grayscale=True).threshold('otsu')
+        element = mo.Diamond(3)
+
+        opened_image = element.open(image)
+        closed_image = element.close(image)
+
+        self.assertTrue(np.all(opened_image._image <= image._image))
+        self.assertTrue(np.all(image._image <= closed_image._image))
+        self.assertTrue(np.array_equal(opened_image._image, element.open(opened_image)._image))
+        closed_image.save(IMG_DIR + '/TestStructuringElement_open_close_testTextImage.bmp')
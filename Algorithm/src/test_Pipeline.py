@@ -0,0 +1,120 @@
+import unittest
+import os
+import numpy as np
+import ImageProcessing as ip
+import EdgeDetectors as ed
+import Pipeline as pl
+
+IMG_DIR = '../img'
+GRAYSCALE_IMAGE_PATH = '../../SIDBA/Mono/LENNA.bmp'
+
+class TestPipeline_detect(unittest.TestCase):
+    """Tests Pipeline.detect
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        pipeline = pl.Pipeline().add_detector(ed.SobelEdgeDetector()).add_threshold(100)
+
+        output_image = pipeline.detect(image)
+
+        self.assertTrue(np.array_equal(ed.SobelEdgeDetector().detect(image).threshold(100)._image, output_image._image))
+        output_image.save(IMG_DIR + '/TestPipeline_detect_testNormal.bmp')
+
+    def testStages(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        pipeline = (pl.Pipeline().add_threshold(200, high=180, low=20).add_threshold(100, low=40)
+                    .add_detector(ed.PrewittEdgeDetector()).add_threshold(50, high=200, low=10).add_threshold(100)
+                    .add_detector(ed.RobertsEdgeDetector()))
+
+        output_image = pipeline.detect(image)
+
+        expected_image = image.threshold(200, high=180, low=20).threshold(100, low=40)
+        expected_image = ed.PrewittEdgeDetector().detect(expected_image).threshold(50, high=200, low=10).threshold(100)
+        expected_image = ed.RobertsEdgeDetector().detect(expected_image)
+        self.assertTrue(np.array_equal(expected_image._image, output_image._image))
+
+    def testFloat32(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).astype(np.float32)
+        pipeline = pl.Pipeline().add_detector(ed.SobelEdgeDetector()).add_threshold(0.5)
+
+        output_image = pipeline.detect(image)
+
+        self.assertTrue(np.array_equal(ed.SobelEdgeDetector().detect(image).threshold(0.5)._image, output_image._image))
+
+    def testPoint(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        pipeline = (pl.Pipeline().add_point(ip.PointOperations().add_gamma(0.8)).add_detector(ed.SobelEdgeDetector())
+                    .add_point(ip.PointOperations().add_stretch(20, 200)).add_threshold(100).add_point(ip.PointOperations().add_invert()))
+
+        output_image = pipeline.detect(image)
+
+        expected_image = ed.SobelEdgeDetector().detect(image.gamma(0.8)).stretch(20, 200).threshold(100).invert()
+        self.assertTrue(np.array_equal(expected_image._image, output_image._image))
+
+    def testNoStage(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        output_image = pl.Pipeline().detect(image)
+
+        self.assertTrue(np.array_equal(image._image, output_image._image))
+        self.assertFalse(np.shares_memory(image._image, output_image._image))
+
+    def testDetectOnly(self):
+        class InvertingEdgeDetector(ed.EdgeDetector):
+            def detect(self, image):
+                return ip.Image.from_array(255 - image._image)
+
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        pipeline = pl.Pipeline().add_detector(InvertingEdgeDetector()).add_threshold(100)
+
+        output_image = pipeline.detect(image)
+
+        self.assertTrue(np.array_equal(ip.Image.from_array(255 - image._image).threshold(100)._image, output_image._image))
+        self.assertTrue(np.array_equal(output_image._image, pipeline.detect_parallel(image, 3)._image))
+
+class TestPipeline_detect_batch(unittest.TestCase):
+    """Tests Pipeline.detect_batch
+    """
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        images = [image, image.crop(0, 0, 100, 80)]
+        pipeline = pl.Pipeline().add_detector(ed.SobelEdgeDetector()).add_threshold(100)
+
+        output_images = pipeline.detect_batch(images)
+
+        self.assertEqual(len(images), len(output_images))
+        for image, output_image in zip(images, output_images):
+            self.assertTrue(np.array_equal(pipeline.detect(image)._image, output_image._image))
+
+class TestPipeline_detect_tiled(unittest.TestCase):
+    """Tests Pipeline.detect_tiled
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        pipeline = pl.Pipeline().add_detector(ed.SobelEdgeDetector()).add_threshold(100).add_detector(ed.DifferenceEdgeDetector())
+
+        output_image = pipeline.detect_tiled(image, IMG_DIR + '/TestPipeline_detect_tiled_testNormal.npy', 30)
+
+        self.assertEqual(2, pipeline.HALO)
+        self.assertTrue(np.array_equal(pipeline.detect(image)._image, output_image._image))
+
+    def testWholeImage(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+        pipeline = pl.Pipeline().add_detector(ed.CannyEdgeDetector())
+
+        output_image = pipeline.detect_tiled(image, IMG_DIR + '/TestPipeline_detect_tiled_testWholeImage.npy', 16)
+
+        self.assertTrue(pipeline.WHOLE_IMAGE)
+        self.assertTrue(np.array_equal(pipeline.detect(image)._image, output_image._image))
+        self.assertTrue(np.array_equal(pipeline.detect(image)._image, pipeline.detect_parallel(image, 8)._image))
@@ -0,0 +1,73 @@
+import unittest
+import json
+import os
+import tracemalloc
+import ImageProcessing as ip
+import EdgeDetectors as ed
+import Profiler as pr
+
+IMG_DIR = '../img'
+GRAYSCALE_IMAGE_PATH = '../../SIDBA/Mono/LENNA.bmp'
+GRAYSCALE_IMAGE_HEIGHT = 256
+GRAYSCALE_IMAGE_WIDTH = 256
+
+class TestProfiler(unittest.TestCase):
+    """Tests Profiler
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        with pr.Profiler() as profiler:
+            image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+            ed.SobelEdgeDetector().detect(image).threshold(100).save(IMG_DIR + '/TestProfiler_testNormal.bmp')
+            ed.PrewittEdgeDetector().detect(image)
+            image.copy()
+            image.copy()
+
+        stages = profiler.stages
+        self.assertEqual({'Image.open', 'Image.copy', 'Image.threshold', 'Image.save', 'SobelEdgeDetector.detect', 'PrewittEdgeDetector.detect'}, set(stages))
+        self.assertEqual(2, stages['Image.copy']['calls'])
+        self.assertEqual(2 * GRAYSCALE_IMAGE_HEIGHT * GRAYSCALE_IMAGE_WIDTH, stages['Image.copy']['pixels'])
+        self.assertEqual(GRAYSCALE_IMAGE_HEIGHT * GRAYSCALE_IMAGE_WIDTH, stages['SobelEdgeDetector.detect']['output_bytes'])
+        self.assertEqual(0, stages['SobelEdgeDetector.detect']['peak_bytes'])
+        self.assertLess(0.0, stages['Image.open']['seconds'])
+        self.assertEqual(stages, json.loads(profiler.to_json()))
+
+    def testMemory(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        with pr.Profiler(memory=True) as profiler:
+            ed.SobelEdgeDetector().detect_parallel(image, 1)
+
+        stages = profiler.stages
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertLess(4 * GRAYSCALE_IMAGE_HEIGHT * GRAYSCALE_IMAGE_WIDTH, stages['SobelEdgeDetector.detect']['peak_bytes'])
+        self.assertLessEqual(stages['SobelEdgeDetector.detect']['peak_bytes'], stages['SobelEdgeDetector.detect_parallel']['peak_bytes'])
+
+    def testDisabled(self):
+        with pr.Profiler() as profiler:
+            pass
+        ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+
+        self.assertIsNone(pr._active)
+        self.assertEqual({}, profiler.stages)
+
+    def testLazy(self):
+        image = ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True, lazy=True)
+
+        with pr.Profiler() as profiler:
+            image.threshold(100)
+
+        self.assertEqual(1, profiler.stages['Image.open']['calls'])
+
+    def testNested(self):
+        with pr.Profiler() as outer:
+            with pr.Profiler() as inner:
+                ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True)
+            ip.Image(GRAYSCALE_IMAGE_PATH, grayscale=True).copy()
+
+        self.assertEqual({'Image.open'}, set(inner.stages))
+        self.assertEqual({'Image.open', 'Image.copy'}, set(outer.stages))
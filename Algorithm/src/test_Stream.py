@@ -0,0 +1,98 @@
+import unittest
+import os
+import numpy as np
+from PIL import Image as im
+import ImageProcessing as ip
+import EdgeDetectors as ed
+import Stream as st
+
+IMG_DIR = '../img'
+GRAYSCALE_IMAGE_DIR = '../../SIDBA/Mono'
+FRAME_NAMES = ['Airplane.bmp', 'BOAT.bmp', 'LENNA.bmp']
+TIFF_PATH = IMG_DIR + '/TestStream_frames.tif'
+
+def open_frames():
+    """Opens the frames used by the tests.
+    """
+    return [ip.Image(GRAYSCALE_IMAGE_DIR + '/' + name, grayscale=True) for name in FRAME_NAMES]
+
+class TestStream_read_frames(unittest.TestCase):
+    """Tests Stream.read_frames
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testMultiFrame(self):
+        frames = [im.fromarray(frame._image) for frame in open_frames()]
+        frames[0].save(TIFF_PATH, save_all=True, append_images=frames[1:])
+
+        read_frames = list(st.read_frames(TIFF_PATH))
+
+        self.assertEqual(len(frames), len(read_frames))
+        for frame, read_frame in zip(open_frames(), read_frames):
+            self.assertTrue(np.array_equal(frame._image, read_frame._image))
+
+    def testDirectory(self):
+        directory = IMG_DIR + '/TestStream_read_frames_testDirectory'
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+        for index, frame in zip([2, 10, 1], open_frames()):
+            frame.save('{}/frame{}.bmp'.format(directory, index))
+
+        read_frames = list(st.read_frames(directory, grayscale=True))
+
+        frames = open_frames()
+        self.assertTrue(np.array_equal(frames[2]._image, read_frames[0]._image))
+        self.assertTrue(np.array_equal(frames[0]._image, read_frames[1]._image))
+        self.assertTrue(np.array_equal(frames[1]._image, read_frames[2]._image))
+
+class TestStream_prefetch(unittest.TestCase):
+    """Tests Stream.prefetch
+    """
+
+    def testNormal(self):
+        self.assertEqual(list(range(100)), list(st.prefetch(iter(range(100)), depth=3)))
+
+    def testException(self):
+        def produce():
+            yield 1
+            raise IOError('broken frame')
+
+        with self.assertRaises(IOError):
+            list(st.prefetch(produce()))
+
+    def testStop(self):
+        produced = []
+
+        def produce():
+            for i in range(1000):
+                produced.append(i)
+                yield i
+
+        for item in st.prefetch(produce(), depth=2):
+            if item == 5:
+                break
+
+        self.assertLess(len(produced), 20)
+
+class TestStream_process_frames(unittest.TestCase):
+    """Tests Stream.process_frames
+    """
+
+    def setUp(self):
+        if not os.path.exists(IMG_DIR):
+            os.mkdir(IMG_DIR)
+
+    def testNormal(self):
+        output_dir = IMG_DIR + '/TestStream_process_frames_testNormal'
+        paths = [GRAYSCALE_IMAGE_DIR + '/' + name for name in FRAME_NAMES]
+        edge_detector = ed.SobelEdgeDetector()
+
+        output_frames = list(st.process_frames(paths, edge_detector, threshold=100, output_dir=output_dir))
+
+        for index, (frame, output_frame) in enumerate(zip(open_frames(), output_frames)):
+            expected = edge_detector.detect(frame).threshold(100)._image
+            self.assertTrue(np.array_equal(expected, output_frame._image))
+            self.assertTrue(np.array_equal(expected, ip.Image('{}/frame{:06d}.bmp'.format(output_dir, index))._image))